@@ -0,0 +1,56 @@
+""" compares the json backends on getCurrentState payloads
+
+usage: python benchmarks/json_benchmark.py [recorded_state.json ...]
+
+without arguments the test payload is used, once as it is and once with
+500 devices. A recorded payload can be written with
+homematicip_cli.py --dump-configuration
+"""
+import copy
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from homematicip.base import json_codec
+from tests.json_data.home import get_current_state
+from tests.json_data.plugable_switch_measuring import fake_device_id
+
+
+def create_large_state(count):
+    state = get_current_state()
+    device = state["devices"][fake_device_id]
+    for i in range(count):
+        d = copy.deepcopy(device)
+        d["id"] = "{}{:04d}".format(fake_device_id[:-4], i)
+        for channel in d["functionalChannels"].values():
+            channel["deviceId"] = d["id"]
+        state["devices"][d["id"]] = d
+    return state
+
+
+def get_payloads():
+    if len(sys.argv) > 1:
+        for path in sys.argv[1:]:
+            with open(path, "rb") as f:
+                yield os.path.basename(path), f.read()
+    else:
+        yield "test state", json.dumps(get_current_state()).encode()
+        yield "500 devices", json.dumps(create_large_state(500)).encode()
+
+
+def main():
+    backends = json_codec.get_available_backends()
+    for name, payload in get_payloads():
+        print("{} ({} bytes)".format(name, len(payload)))
+        for backend in backends:
+            json_codec.set_backend(backend)
+            number, total = timeit.Timer(lambda: json_codec.loads(payload)).autorange()
+            print("  {:<8}{:>12.1f} us".format(backend, total / number * 1e6))
+    json_codec.set_backend()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+""" measures the memory used by the model objects
+
+usage: python benchmarks/memory_benchmark.py [count]
+
+bytes per object on Python 3.11:
+    PlugableSwitchMeasuring with its 2 functional channels    1272
+    HeatingCoolingProfile with 7 days/21 periods              3293
+    TimeProfile with 4 periods                                 734
+"""
+import calendar
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from homematicip.device import PlugableSwitchMeasuring
+from homematicip.group import HeatingCoolingProfile, TimeProfile
+from tests.json_data.plugable_switch_measuring import plugable_switch_measuring
+
+
+class FakeConnection:
+    """ answers the profile requests without a network connection """
+
+    def _restCall(self, path, body=None):
+        if path == "group/heating/getProfile":
+            period = {"starttime": "06:00", "endtime": "22:00", "value": 21.0}
+            return {"homeId": "home", "type": "MANUAL",
+                    "profileDays": {calendar.day_name[i].upper():
+                                    {"baseValue": 17.0, "periods": [period] * 3}
+                                    for i in range(7)}}
+        return {"homeId": "home", "type": "PROFILE", "id": "profile",
+                "periods": [{"weekdays": ["MONDAY"], "hour": 6, "minute": 30,
+                             "astroOffset": 0, "astroLimitationType": "NO_LIMITATION",
+                             "switchTimeMode": "REGULAR_SWITCH_TIME",
+                             "dimLevel": 1.0, "rampTime": 0}] * 4}
+
+
+def create_device(connection):
+    device = PlugableSwitchMeasuring(connection)
+    device.from_json(plugable_switch_measuring)
+    return device
+
+
+def create_heating_profile(connection):
+    profile = HeatingCoolingProfile(connection)
+    profile.from_json({"profileId": "id", "groupId": "group", "index": "PROFILE_1",
+                       "name": "", "visible": True, "enabled": True})
+    profile.get_details()
+    return profile
+
+
+def create_time_profile(connection):
+    profile = TimeProfile(connection)
+    profile.groupId = "group"
+    profile.get_details()
+    return profile
+
+
+def measure(factory, count):
+    """ returns the bytes allocated per object """
+    connection = FakeConnection()
+    tracemalloc.start()
+    objects = [factory(connection) for i in range(count)]
+    for obj in objects:
+        # snapshots are taken for every update, e.g. for change detection
+        obj._snapshot()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    for name, factory in (("PlugableSwitchMeasuring", create_device),
+                          ("HeatingCoolingProfile with 7 days/21 periods", create_heating_profile),
+                          ("TimeProfile with 4 periods", create_time_profile)):
+        print("{:<48}{:>10.0f} bytes".format(name, measure(factory, count)))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 #by Michael Foord http://www.voidspace.org.uk/python/weblog/arch_d7_2007_02_03.shtml#e616
+from inspect import isawaitable
+
 
 class EventHook():
     def __init__(self):
@@ -12,6 +14,17 @@ class EventHook():
         self.__handlers.remove(handler)
         return self
 
+    def __len__(self):
+        return len(self.__handlers)
+
     def fire(self, *args, **keywargs):
+        """ calls the handlers
+        :return a list with the awaitables returned by handlers which are
+            coroutine functions. The AsyncEventDispatcher awaits them
+        """
+        pending = []
         for handler in self.__handlers:
-            handler(*args, **keywargs)
\ No newline at end of file
+            result = handler(*args, **keywargs)
+            if isawaitable(result):
+                pending.append(result)
+        return pending
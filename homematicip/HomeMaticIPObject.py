@@ -1,26 +1,80 @@
 import logging
+from inspect import isawaitable
+
+from homematicip.base.fields import compile_initializer, compile_parser
 
 LOGGER = logging.getLogger(__name__)
 
+# class -> the names of its public slots
+_slotNames = {}
+
+
+def _public_slots(cls):
+    names = _slotNames.get(cls)
+    if names is None:
+        names = []
+        for c in reversed(cls.__mro__):
+            for name in c.__dict__.get("__slots__", ()):
+                if not name.startswith("_"):
+                    names.append(name)
+        _slotNames[cls] = names
+    return names
+
 
 class HomeMaticIPObject:
     """This class represents a generic homematic ip object to make
-    basic requests to the access point"""
+    basic requests to the access point.
+
+    The base class uses __slots__. Subclasses which declare __slots__ as
+    well don't get an instance __dict__, which is used for the objects
+    existing in large numbers like the devices, groups and the periods of the
+    heating profiles. They set their defaults with _init_fields"""
+
+    __slots__ = ("_connection", "_on_update", "_fingerprint")
+
+    # the Field and Channel objects which the class adds to its base classes.
+    # see homematicip.base.fields
+    _fields = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._parse_fields = compile_parser(cls)
+        cls._init_fields = compile_initializer(cls)
 
     def __init__(self, connection):
         self._connection = connection
-        # List with update handlers.
-        self._on_update = []
+        # List with update handlers. Created by the first on_update call
+        self._on_update = None
+        # the json_codec.fingerprint of the last applied push event. Identical
+        # events are skipped
+        self._fingerprint = None
 
-    def on_update(self, handler):
+    def on_update(self, handler, changes=False):
         """Adds an event handler to the update method. Fires when a device
-        is updated."""
-        self._on_update.append(handler)
+        is updated.
+        :param changes if True the handler also gets the keyword argument
+            changes, a dict {attribute: (old value, new value)} with the
+            attributes which were changed by the update"""
+        if self._on_update is None:
+            self._on_update = []
+        self._on_update.append((handler, changes))
 
     def fire_update_event(self, *args, **kwargs):
-        """Trigger the method tied to _on_update"""
-        for _handler in self._on_update:
-            _handler(*args, **kwargs)
+        """Trigger the method tied to _on_update
+        :return a list with the awaitables returned by handlers which are
+            coroutine functions"""
+        pending = []
+        if not self._on_update:
+            return pending
+        changes = kwargs.pop("changes", None)
+        for _handler, _changes in self._on_update:
+            if _changes:
+                result = _handler(*args, changes=changes, **kwargs)
+            else:
+                result = _handler(*args, **kwargs)
+            if isawaitable(result):
+                pending.append(result)
+        return pending
 
     def _restCall(self, path, body=None):
         return self._connection._restCall(path, body)
@@ -28,5 +82,24 @@ class HomeMaticIPObject:
     def from_json(self, js):
         LOGGER.debug("from_json call HomeMaticIpObject")
 
+    def _snapshot(self):
+        """ returns a shallow copy of the public attributes. Used to detect
+        if from_json has changed the object """
+        snapshot = {k: getattr(self, k) for k in _public_slots(type(self))}
+        if hasattr(self, "__dict__"):
+            snapshot.update((k, v) for k, v in vars(self).items() if not k.startswith('_'))
+        return snapshot
+
+    def _diff(self, snapshot):
+        """ returns the attributes which were changed since the snapshot
+        :return a dict {attribute: (old value, new value)}
+        """
+        changes = {}
+        for k, v in self._snapshot().items():
+            old = snapshot.get(k)
+            if old != v:
+                changes[k] = (old, v)
+        return changes
+
     def __str__(self):
         return 'id({})'.format(self.id)
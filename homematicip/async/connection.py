@@ -1,14 +1,14 @@
-import json
 import logging
 from asyncio.futures import CancelledError
-from json.decoder import JSONDecodeError
 
 import aiohttp
 import async_timeout
 import asyncio
 
+from homematicip.base import json_codec
 from homematicip.base.base_connection import BaseConnection, HmipWrongHttpStatusError, \
     ATTR_AUTH_TOKEN, ATTR_CLIENT_AUTH, HmipConnectionError
+from homematicip.base.json_codec import JSONDecodeError
 
 logger = logging.getLogger(__name__)
 
@@ -30,12 +30,23 @@ class AsyncConnection(BaseConnection):
     async def init(self, accesspoint_id, lookup=True, **kwargs):
         self.set_token_and_characteristics(accesspoint_id)
 
-        if lookup:
-            result = await self.api_call("https://lookup.homematic.com:48335/getHost",
-                                         json.dumps(self.clientCharacteristics), full_url=True)
-
-            self._urlREST = result["urlREST"]
-            self._urlWebSocket = result["urlWebSocket"]
+        if lookup and self._load_cached_hosts():
+            logger.debug("using the cached hosts %s %s", self._urlREST, self._urlWebSocket)
+        elif lookup:
+            for delay in self.lookup_retry_policy.delays():
+                await asyncio.sleep(delay)
+                try:
+                    result = await self.api_call("https://lookup.homematic.com:48335/getHost",
+                                                 json_codec.dumps(self.clientCharacteristics),
+                                                 full_url=True)
+                    self._urlREST = result["urlREST"]
+                    self._urlWebSocket = result["urlWebSocket"]
+                    self._store_cached_hosts()
+                    break
+                except (HmipConnectionError, KeyError, TypeError) as err:
+                    logger.warning("lookup of the access point failed: %s", err)
+            else:
+                raise HmipConnectionError("Could not look up the access point")
         else:
             self._urlREST = "https://ps1.homematic.com:6969"
             self._urlWebSocket = "wss://ps1.homematic.com:8888"
@@ -54,6 +65,8 @@ class AsyncConnection(BaseConnection):
         response is not correct."""
         result = None
         if not full_url:
+            if self.rate_limiter is not None and self.rate_limiter.is_limited(path):
+                await self.rate_limiter.acquire_async()
             path = self.full_url(path)
         for i in range(self._restCallRequestCounter):
             try:
@@ -62,7 +75,7 @@ class AsyncConnection(BaseConnection):
                     result = await self._websession.post(path, data=body, headers=self.headers)
                     if result.status == 200:
                         if result.content_type == 'application/json':
-                            ret = await result.json()
+                            ret = json_codec.loads(await result.read())
                         else:
                             ret = True
                         return ret
@@ -77,11 +90,17 @@ class AsyncConnection(BaseConnection):
             finally:
                 if result is not None:
                     await result.release()
+        self._invalidate_cached_hosts()
         raise HmipConnectionError("Failed to connect to HomeMaticIp server")
 
-    def listen_for_websocket_data(self, incoming_parser):
+    def listen_for_websocket_data(self, incoming_parser, backpressure=None):
+        """
+        :param incoming_parser f(ws, message) gets called for every message
+        :param backpressure optional coroutine function which gets awaited
+            after each message before the next one is read
+        """
         self._socket_task = self._loop.create_task(
-            self._listen_for_incoming_websocket_data(incoming_parser))
+            self._listen_for_incoming_websocket_data(incoming_parser, backpressure))
 
     async def _connect_to_websocket(self):
         with async_timeout.timeout(self._restCallTimout, loop=self._loop):
@@ -95,7 +114,7 @@ class AsyncConnection(BaseConnection):
     def close_websocket_connection(self):
         self._socket_task.cancel()
 
-    async def _listen_for_incoming_websocket_data(self, incoming_parser):
+    async def _listen_for_incoming_websocket_data(self, incoming_parser, backpressure=None):
         """Creates a websocket connection, listens for incoming data and
         uses the incoming parser to parse the incoming data.
         """
@@ -129,6 +148,8 @@ class AsyncConnection(BaseConnection):
                             if msg.tp == aiohttp.WSMsgType.BINARY:
                                 message = str(msg.data, 'utf-8')
                                 incoming_parser(None, message)
+                                if backpressure is not None:
+                                    await backpressure()
                             elif msg.tp in [aiohttp.WSMsgType.CLOSE,
                                             aiohttp.WSMsgType.CLOSED,
                                             aiohttp.WSMsgType.ERROR]:
@@ -13,6 +13,7 @@ _LOGGER = logging.getLogger(__name__)
 
 class AsyncDevice(Device):
     """ Async implementation of a genereric homematic ip device """
+    __slots__ = ()
 
     def set_label(self, label):
         pass
@@ -32,6 +33,7 @@ class AsyncDevice(Device):
 
 class AsyncPlugableSwitch(PlugableSwitch, AsyncDevice):
     """ Async implementation of HMIP-PS (Pluggable Switch) """
+    __slots__ = ()
 
     async def turn_on(self):
         url, data = super().turn_on()
@@ -43,10 +45,12 @@ class AsyncPlugableSwitch(PlugableSwitch, AsyncDevice):
 
 
 class AsyncSabotageDevice(SabotageDevice, AsyncDevice):
-    pass
+    __slots__ = ()
 
 
 class AsyncOperationLockableDevice(OperationLockableDevice, AsyncDevice):
+    __slots__ = ()
+
     async def set_operation_lock(self, operationLock=True):
         return await self._connection.api_call(
             *super().set_operation_lock(operationLock=operationLock))
@@ -54,29 +58,30 @@ class AsyncOperationLockableDevice(OperationLockableDevice, AsyncDevice):
 
 class AsyncPlugableSwitchMeasuring(PlugableSwitchMeasuring, AsyncPlugableSwitch):
     """ HMIP-PSM (Pluggable Switch and Meter) """
-    pass
+    __slots__ = ()
 
 
 class AsyncShutterContact(ShutterContact, AsyncSabotageDevice):
     """ HMIP-SWDO (Door / Window Contact - optical) /
     HMIP-SWDO-I (Door / Window Contact Invisible - optical)"""
-
-    pass
+    __slots__ = ()
 
 
 class AsyncHeatingThermostat(HeatingThermostat, AsyncOperationLockableDevice):
     """ HMIP-eTRV (Radiator Thermostat) """
-    pass
+    __slots__ = ()
 
 
 class AsyncTemperatureHumiditySensorWithoutDisplay(TemperatureHumiditySensorWithoutDisplay,
                                                    AsyncDevice):
     """ HMIP-STH (Temperature and Humidity Sensor without display - indoor) """
-    pass
+    __slots__ = ()
 
 
 class AsyncTemperatureHumiditySensorDisplay(TemperatureHumiditySensorDisplay, AsyncDevice):
     """ HMIP-STHD (Temperature and Humidity Sensor with display - indoor) """
+    __slots__ = ()
+
     # todo: need override these otherwise cannot use them as method parameters. Fix this.
     DISPLAY_ACTUAL = "ACTUAL"
     DISPLAY_SETPOINT = "SETPOINT"
@@ -90,44 +95,47 @@ class AsyncWallMountedThermostatPro(WallMountedThermostatPro, AsyncTemperatureHu
                                     AsyncOperationLockableDevice):
     """ HMIP-WTH, HMIP-WTH-2 (Wall Thermostat with Humidity Sensor)
     / HMIP-BWTH (Brand Wall Thermostat with Humidity Sensor)"""
-    pass
+    __slots__ = ()
 
 
 class AsyncSmokeDetector(SmokeDetector, AsyncDevice):
     """ HMIP-SWSD (Smoke Alarm with Q label) """
-    pass
+    __slots__ = ()
 
 
 class AsyncFloorTerminalBlock6(FloorTerminalBlock6, AsyncDevice):
     """ HMIP-FAL230-C6 (Floor Heating Actuator - 6 channels, 230 V) """
-    pass
+    __slots__ = ()
 
 
 class AsyncPushButton(PushButton, AsyncDevice):
     """ HMIP-WRC2 (Wall-mount Remote Control - 2-button) """
+    __slots__ = ()
 
 
 class AsyncAlarmSirenIndoor(AlarmSirenIndoor, AsyncSabotageDevice):
     """ HMIP-ASIR (Alarm Siren) """
+    __slots__ = ()
 
 
 class AsyncMotionDetectorIndoor(MotionDetectorIndoor, AsyncSabotageDevice):
     """ HMIP-SMI (Motion Detector with Brightness Sensor - indoor) """
-    pass
+    __slots__ = ()
 
 
 class AsyncPresenceDetectorIndoor(PresenceDetectorIndoor, AsyncSabotageDevice):
     """ HMIP-SPI (Presence Sensor - indoor) """
-    pass
+    __slots__ = ()
 
 
 class AsyncKeyRemoteControlAlarm(KeyRemoteControlAlarm, AsyncDevice):
     """ HMIP-KRCA (Key Ring Remote Control - alarm) """
-    pass
+    __slots__ = ()
 
 
 class AsyncFullFlushShutter(FullFlushShutter, AsyncDevice):
     """ HMIP-FROLL (Shutter Actuator - flush-mount) / HMIP-BROLL (Shutter Actuator - Brand-mount) """
+    __slots__ = ()
 
     async def set_shutter_level(self, level):
         return await self._connection.api_call(*super().set_shutter_level(level))
@@ -138,6 +146,7 @@ class AsyncFullFlushShutter(FullFlushShutter, AsyncDevice):
 
 class AsyncPluggableDimmer(PluggableDimmer, AsyncDevice):
     """HmIP-PDT Pluggable Dimmer"""
+    __slots__ = ()
 
     async def set_dim_level(self, dimLevel=0.0):
         return await self._connection.api_call(*super().set_dim_level(dimLevel=dimLevel))
@@ -0,0 +1,29 @@
+import logging
+
+from homematicip.base.event_coalescer import BaseEventCoalescer
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncEventCoalescer(BaseEventCoalescer):
+    """ delivers the coalesced events of an AsyncHome in the event loop """
+
+    def __init__(self, loop, window=0.5, event_types=("DEVICE_CHANGED", "GROUP_CHANGED")):
+        super().__init__(window, event_types)
+        self._loop = loop
+        self._handle = None
+
+    def _schedule(self):
+        self._handle = self._loop.call_later(self.window, self._on_timer)
+
+    def _cancel(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _on_timer(self):
+        self._handle = None
+        try:
+            self.flush()
+        except Exception as err:
+            LOGGER.exception(err)
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+
+from homematicip.base.event_dispatcher import BaseEventDispatcher, OVERFLOW_BLOCK
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncEventDispatcher(BaseEventDispatcher):
+    """ runs the event handlers of an AsyncHome in worker tasks. Handlers
+    can be coroutine functions, the tasks of the home return their
+    coroutines and the workers await them.
+
+    submit is called from the websocket listener and can't wait. If the
+    queue is full with OVERFLOW_BLOCK or OVERFLOW_COALESCE the task is queued
+    anyway and the listener waits in wait_for_capacity before it reads the
+    next message."""
+
+    def __init__(self, loop, workers=2, max_queue_size=1000, overflow_policy=OVERFLOW_BLOCK):
+        super().__init__(workers, max_queue_size, overflow_policy)
+        self._loop = loop
+        self._tasks = []
+        self._available = asyncio.Event()
+        self._capacity = asyncio.Event()
+        self._capacity.set()
+
+    def start(self):
+        if self._tasks:
+            return
+        self._tasks = [self._loop.create_task(self._work()) for i in range(self.workers)]
+
+    def stop(self, wait=True):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def submit(self, task, key=None):
+        if not self._enqueue(task, key):
+            entry = [key, task]
+            self._queue.append(entry)
+            if key is not None and key not in self._pending:
+                self._pending[key] = entry
+            self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+            self._capacity.clear()
+        self._available.set()
+
+    async def wait_for_capacity(self):
+        await self._capacity.wait()
+
+    async def _work(self):
+        while True:
+            while not self._queue:
+                self._available.clear()
+                await self._available.wait()
+            task = self._dequeue()
+            if len(self._queue) < self.max_queue_size:
+                self._capacity.set()
+            try:
+                result = task()
+            except Exception as err:
+                LOGGER.exception(err)
+                result = None
+            if asyncio.iscoroutine(result):
+                result = [result]
+            elif not isinstance(result, list):
+                result = ()
+            # the coroutines of the handlers, a failing one doesn't keep the
+            # others from running
+            for coroutine in result:
+                try:
+                    await coroutine
+                except asyncio.CancelledError:
+                    raise
+                except Exception as err:
+                    LOGGER.exception(err)
+            self.processed += 1
@@ -1,4 +1,4 @@
-import json
+from homematicip.base import json_codec
 
 from homematicip.group import Group, MetaGroup, SecurityGroup, SwitchingGroup, LinkedSwitchingGroup, \
     ExtendedLinkedSwitchingGroup, ExtendedLinkedShutterGroup, AlarmSwitchingGroup, \
@@ -6,24 +6,28 @@ from homematicip.group import Group, MetaGroup, SecurityGroup, SwitchingGroup, L
     SecurityZoneGroup, HeatingGroup, HeatingDehumidifierGroup, HeatingCoolingDemandGroup, \
     HeatingExternalClockGroup, HeatingCoolingDemandBoilerGroup, HeatingCoolingDemandPumpGroup, \
     SwitchingProfileGroup, OverHeatProtectionRule, SmokeAlarmDetectionRule, \
-    ShutterWindProtectionRule, LockOutProtectionRule
+    ShutterWindProtectionRule, LockOutProtectionRule, HeatingCoolingProfile
 
 
 class AsyncGroup(Group):
+    __slots__ = ()
+
     def set_label(self, label):
         pass
 
 
 class AsyncMetaGroup(MetaGroup, AsyncGroup):
     """ a meta group is a "Room" inside the homematic configuration """
-    pass
+    __slots__ = ()
 
 
 class AsyncSecurityGroup(SecurityGroup, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 class AsyncSwitchingGroup(SwitchingGroup, AsyncGroup):
+    __slots__ = ()
+
     async def turn_on(self):
         url, data = super().turn_on()
         return await self._connection.api_call(url, data)
@@ -42,18 +46,24 @@ class AsyncSwitchingGroup(SwitchingGroup, AsyncGroup):
 
 
 class AsyncLinkedSwitchingGroup(LinkedSwitchingGroup, AsyncSwitchingGroup):
+    __slots__ = ()
+
     async def set_light_group_switches(self, devices):
         url, data = super().set_light_group_switches(devices)
         return await self._connection.api_call(url, data)
 
 
 class AsyncExtendedLinkedSwitchingGroup(ExtendedLinkedSwitchingGroup, AsyncSwitchingGroup):
+    __slots__ = ()
+
     async def set_on_time(self, onTimeSeconds):
         url, data = super().set_on_time(onTimeSeconds)
         return await self._connection.api_call(url, data)
 
 
 class AsyncExtendedLinkedShutterGroup(ExtendedLinkedShutterGroup, AsyncGroup):
+    __slots__ = ()
+
     async def set_shutter_level(self, level):
         url, data = super().set_shutter_level(level)
         return await self._connection.api_call(url, data)
@@ -64,6 +74,8 @@ class AsyncExtendedLinkedShutterGroup(ExtendedLinkedShutterGroup, AsyncGroup):
 
 
 class AsyncAlarmSwitchingGroup(AlarmSwitchingGroup, AsyncGroup):
+    __slots__ = ()
+
     # todo: extract these from the class. this needs to be defined. Can't use it from the base class.
     SIGNAL_OPTICAL_DISABLE_OPTICAL_SIGNAL = "DISABLE_OPTICAL_SIGNAL"
     SIGNAL_OPTICAL_BLINKING_ALTERNATELY_REPEATING = "BLINKING_ALTERNATELY_REPEATING"
@@ -91,30 +103,46 @@ class AsyncAlarmSwitchingGroup(AlarmSwitchingGroup, AsyncGroup):
 # at the moment it doesn't look like this class has any special properties/functions
 # keep it as a placeholder in the meantime
 class AsyncHeatingHumidyLimiterGroup(HeatingHumidyLimiterGroup, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 # at the moment it doesn't look like this class has any special properties/functions
 # keep it as a placeholder in the meantime
 class AsyncHeatingTemperatureLimiterGroup(HeatingTemperatureLimiterGroup, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 class AsyncHeatingChangeoverGroup(HeatingChangeoverGroup, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 # at the moment it doesn't look like this class has any special properties/functions
 # keep it as a placeholder in the meantime
 class AsyncInboxGroup(InboxGroup, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 class AsyncSecurityZoneGroup(SecurityZoneGroup, AsyncGroup):
-    pass
+    __slots__ = ()
+
+
+class AsyncHeatingCoolingProfile(HeatingCoolingProfile):
+    __slots__ = ()
+
+    async def get_details(self, refresh=False):
+        if self.profileDays is not None and not refresh:
+            return
+        self._parse_details(await self._connection.api_call(*self._request_details()))
+
+    async def update_profile(self):
+        return await self._connection.api_call(*super().update_profile())
 
 
 class AsyncHeatingGroup(HeatingGroup, AsyncGroup):
+    __slots__ = ()
+
+    _profileClass = AsyncHeatingCoolingProfile
+
     async def set_point_temperature(self, temperature):
         return await self._connection.api_call(*super().set_point_temperature(temperature))
 
@@ -126,28 +154,30 @@ class AsyncHeatingGroup(HeatingGroup, AsyncGroup):
 
 
 class AsyncHeatingDehumidifierGroup(HeatingDehumidifierGroup, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 class AsyncHeatingCoolingDemandGroup(HeatingCoolingDemandGroup, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 # at the moment it doesn't look like this class has any special properties/functions
 # keep it as a placeholder in the meantime
 class AsyncHeatingExternalClockGroup(HeatingExternalClockGroup, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 class AsyncHeatingCoolingDemandBoilerGroup(HeatingCoolingDemandBoilerGroup, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 class AsyncHeatingCoolingDemandPumpGroup(HeatingCoolingDemandPumpGroup, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 class AsyncSwitchingProfileGroup(SwitchingProfileGroup, AsyncGroup):
+    __slots__ = ()
+
     async def set_group_channels(self):
         return await self._connection.api_call(*super().set_group_channels())
 
@@ -158,23 +188,23 @@ class AsyncSwitchingProfileGroup(SwitchingProfileGroup, AsyncGroup):
     async def create(self, label):
         data = {"label": label}
         result = await self._connection.api_call(
-            "group/switching/profile/createSwitchingProfileGroup", body=json.dumps(data))
+            "group/switching/profile/createSwitchingProfileGroup", body=json_codec.dumps(data))
         if "groupId" in result:
             self.id = result["groupId"]
         return result
 
 
 class AsyncOverHeatProtectionRule(OverHeatProtectionRule, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 class AsyncSmokeAlarmDetectionRule(SmokeAlarmDetectionRule, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 class AsyncShutterWindProtectionRule(ShutterWindProtectionRule, AsyncGroup):
-    pass
+    __slots__ = ()
 
 
 class AsyncLockOutProtectionRule(LockOutProtectionRule, AsyncGroup):
-    pass
+    __slots__ = ()
@@ -1,6 +1,7 @@
-import json
+import asyncio
 import logging
 
+from homematicip.base import json_codec
 from homematicip.async.class_maps import TYPE_CLASS_MAP, TYPE_GROUP_MAP, TYPE_SECURITY_EVENT_MAP
 from homematicip.async.connection import AsyncConnection
 from homematicip.home import Home
@@ -21,27 +22,45 @@ class AsyncHome(Home):
         await self._connection.init(access_point_id, lookup)
 
     async def get_current_state(self):
-        # todo: a download_configuration method has been added. This can simplify this one.
         json_state = await self._connection.api_call(
-            'home/getCurrentState', json.dumps(self._connection.clientCharacteristics))
-        if "errorCode" in json_state:
-            LOGGER.error(
-                "Could not get the current configuration. Error: %s", json_state["errorCode"])
-            return False
+            'home/getCurrentState', json_codec.dumps(self._connection.clientCharacteristics))
+        return self._update_home(json_state)
 
-        js_home = json_state["home"]
-
-        self.from_json(js_home)
-
-        self.devices = self._get_devices(json_state)
-        self.clients = self._get_clients(json_state)
-        self.groups = self._get_groups(json_state)
-
-        return True
+    async def update_current_state(self):
+        json_state = await self._connection.api_call(
+            'home/getCurrentState', json_codec.dumps(self._connection.clientCharacteristics))
+        return self._update_home_incremental(json_state)
+
+    async def execute_batch(self, operations, max_concurrency=8):
+        """ executes many control calls concurrently
+        :param operations a list of callables without arguments which return
+            an awaitable e.g. functools.partial(switch.turn_on)
+        :param max_concurrency the maximum number of concurrent calls
+        :return a list with a dict {"operation", "result", "error"} for every
+            operation in the same order. error is the raised exception or None
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run(operation):
+            async with semaphore:
+                try:
+                    return {"operation": operation, "result": await operation(), "error": None}
+                except Exception as err:
+                    LOGGER.exception(err)
+                    return {"operation": operation, "result": None, "error": err}
+
+        return await asyncio.gather(*[run(operation) for operation in operations])
+
+    async def prefetch_profile_details(self, refresh=False, max_concurrency=8):
+        return await self.execute_batch(self._get_profile_detail_operations(refresh),
+                                        max_concurrency)
 
     def enable_events(self):
         """Starts listening for incoming websocket data."""
-        self._connection.listen_for_websocket_data(self._ws_on_message)
+        backpressure = None
+        if self._eventDispatcher is not None:
+            backpressure = self._eventDispatcher.wait_for_capacity
+        self._connection.listen_for_websocket_data(self._ws_on_message, backpressure)
 
     def on_connection_lost(self, connection_lost_handler):
         self._connection._socket_task.add_done_callback(connection_lost_handler)
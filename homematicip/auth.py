@@ -1,9 +1,10 @@
 # coding=utf-8
-import json
 import uuid
+
 import requests
 
 import homematicip
+from homematicip.base import json_codec
 from homematicip.home import Home
 
 
@@ -15,6 +16,9 @@ class Auth(object):
         self.uuid = str(uuid.uuid4())
         self.headers = {'content-type': 'application/json', 'accept': 'application/json', 'VERSION': '12', 'CLIENTAUTH' : home._connection.clientauth_token }
         self.url_rest = home._connection.urlREST
+        # reuse the pooled session of the connection. The AsyncConnection
+        # has none, the requests module posts without a pool then
+        self.session = getattr(home._connection, "session", requests)
 
 
     def connectionRequest(self, access_point, devicename = "homematicip-python"):
@@ -22,24 +26,24 @@ class Auth(object):
         headers = self.headers
         if self.pin != None:
             headers["PIN"] = self.pin
-        response = requests.post("{}/hmip/auth/connectionRequest".format(self.url_rest), json=data,
+        response = self.session.post("{}/hmip/auth/connectionRequest".format(self.url_rest), json=data,
                                  headers=headers)
         return response
 
     def isRequestAcknowledged(self):
         data = {"deviceId": self.uuid}
-        response = requests.post("{}/hmip/auth/isRequestAcknowledged".format(self.url_rest), json=data,
+        response = self.session.post("{}/hmip/auth/isRequestAcknowledged".format(self.url_rest), json=data,
                                  headers=self.headers)
         return response.status_code == 200
 
     def requestAuthToken(self):
         data = {"deviceId": self.uuid}
-        response = requests.post("{}/hmip/auth/requestAuthToken".format(self.url_rest), json=data,
+        response = self.session.post("{}/hmip/auth/requestAuthToken".format(self.url_rest), json=data,
                                  headers=self.headers)
-        return json.loads(response.text)["authToken"]
+        return json_codec.loads(response.content)["authToken"]
 
     def confirmAuthToken(self, authToken):
         data = {"deviceId": self.uuid, "authToken": authToken}
-        response = requests.post("{}/hmip/auth/confirmAuthToken".format(self.url_rest), json=data,
+        response = self.session.post("{}/hmip/auth/confirmAuthToken".format(self.url_rest), json=data,
                                  headers=self.headers)
-        return json.loads(response.text)["clientId"]
+        return json_codec.loads(response.content)["clientId"]
@@ -1,7 +1,9 @@
 import hashlib
 import locale
 import platform
+import random
 import re
+import time
 
 ATTR_AUTH_TOKEN = 'AUTHTOKEN'
 ATTR_CLIENT_AUTH = 'CLIENTAUTH'
@@ -13,6 +15,43 @@ class HmipWrongHttpStatusError(HmipConnectionError):
     pass
 
 
+class RetryPolicy:
+    """Exponential backoff with jitter for calls which have to be repeated
+    until they succeed, e.g. the lookup of the access point."""
+
+    def __init__(self, max_attempts=8, base_delay=0.5, max_delay=30.0,
+                 deadline=120.0, jitter=0.5):
+        """
+        :param max_attempts the maximum number of attempts
+        :param base_delay the delay in seconds after the first failed attempt.
+            It doubles with every further attempt
+        :param max_delay the upper limit for a single delay in seconds
+        :param deadline no further attempt is started after this many seconds
+        :param jitter the fraction (0..1) by which a delay is randomly shortened
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.jitter = jitter
+
+    def delays(self):
+        """Yields the time to wait before each attempt. The first attempt
+        starts immediately. The generator stops when the attempts or the
+        deadline are exhausted."""
+        start = time.monotonic()
+        for attempt in range(self.max_attempts):
+            if attempt == 0:
+                yield 0
+                continue
+            delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+            delay *= 1 - self.jitter * random.random()
+            remaining = self.deadline - (time.monotonic() - start)
+            if remaining <= delay:
+                return
+            yield delay
+
+
 class BaseConnection:
     """Base connection class.
 
@@ -26,6 +65,12 @@ class BaseConnection:
     _restCallTimout = 6
 
     def __init__(self):
+        # used by init to retry the lookup of the access point
+        self.lookup_retry_policy = RetryPolicy()
+        # optional LookupCache for the result of the access point lookup
+        self.lookup_cache = None
+        # optional DutyCycleRateLimiter for the control calls
+        self.rate_limiter = None
         self.headers = {'content-type': 'application/json',
                         'accept': 'application/json',
                         'VERSION': '12',
@@ -77,6 +122,31 @@ class BaseConnection:
         self._auth_token = auth_token
         self.headers[ATTR_AUTH_TOKEN] = auth_token
 
+    def _load_cached_hosts(self):
+        """ sets urlREST and urlWebSocket from the lookup cache
+        :return True if the cache contained the hosts of the access point
+        """
+        if self.lookup_cache is None:
+            return False
+        hosts = self.lookup_cache.get(self._clientCharacteristics["id"])
+        if hosts is None:
+            return False
+        self._urlREST = hosts["urlREST"]
+        self._urlWebSocket = hosts["urlWebSocket"]
+        return True
+
+    def _store_cached_hosts(self):
+        if self.lookup_cache is not None:
+            self.lookup_cache.set(self._clientCharacteristics["id"],
+                                  self._urlREST, self._urlWebSocket)
+
+    def _invalidate_cached_hosts(self):
+        """ removes the hosts of the access point from the lookup cache.
+        Called when the cloud couldn't be reached, as the hosts might have
+        been moved """
+        if self.lookup_cache is not None:
+            self.lookup_cache.invalidate(self._clientCharacteristics["id"])
+
     def init(self, accesspoint_id, lookup=True, **kwargs):
         raise NotImplementedError
 
@@ -0,0 +1,101 @@
+""" exports the values of many objects as columns: one list per attribute and
+class instead of one object per device. The optional numpy and pyarrow
+packages turn the columns into arrays or tables.
+"""
+from collections import OrderedDict
+from operator import attrgetter
+
+from homematicip.base.fields import get_fields
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+# the columns every class gets
+KEY_ATTRIBUTES = ("id", "label", "lastStatusUpdateMillis")
+
+# the values which are exported if no attributes are given
+MEASUREMENT_ATTRIBUTES = (
+    "actualTemperature", "setPointTemperature", "humidity", "valvePosition", "temperatureOffset",
+    "currentPowerConsumption", "energyCounter", "on", "dimLevel", "shutterLevel", "illumination",
+    "motionDetected", "presenceDetected", "windowState", "lowBat", "unreach", "rssiDeviceValue",
+    "rssiPeerValue",
+)
+
+FORMATS = (None, "numpy", "arrow")
+
+# (class, attributes) -> (columns, getter)
+_getters = {}
+
+
+def _get_getter(cls, attributes):
+    key = (cls, attributes)
+    entry = _getters.get(key)
+    if entry is None:
+        declared = set()
+        for fields in get_fields(cls).values():
+            declared.update(fields)
+        columns = KEY_ATTRIBUTES + tuple(a for a in attributes
+                                         if a in declared and a not in KEY_ATTRIBUTES)
+        entry = (columns, attrgetter(*columns))
+        _getters[key] = entry
+    return entry
+
+
+def get_columns(objects, attributes=None):
+    """ returns the values of the objects grouped by their class
+    :param objects the Device or Group objects
+    :param attributes the attributes to export. Attributes which a class
+        doesn't parse are skipped for this class. Defaults to MEASUREMENT_ATTRIBUTES
+    :return an OrderedDict class name -> OrderedDict attribute -> list of values
+    """
+    attributes = MEASUREMENT_ATTRIBUTES if attributes is None else tuple(attributes)
+    byClass = OrderedDict()
+    for obj in objects:
+        byClass.setdefault(type(obj), []).append(obj)
+
+    result = OrderedDict()
+    for cls, objs in byClass.items():
+        columns, getter = _get_getter(cls, attributes)
+        rows = [getter(obj) for obj in objs]
+        result[cls.__name__] = OrderedDict(
+            (name, list(values)) for name, values in zip(columns, zip(*rows)))
+    return result
+
+
+def _to_numpy_array(values):
+    types = set(map(type, values))
+    if types == {bool}:
+        return numpy.array(values, dtype=bool)
+    if types == {int}:
+        return numpy.array(values, dtype=numpy.int64)
+    if types and types <= {int, float, type(None)} and types != {type(None)}:
+        # missing numbers become nan
+        return numpy.array([numpy.nan if v is None else v for v in values], dtype=numpy.float64)
+    return numpy.array(values, dtype=object)
+
+
+def convert_columns(columns, format=None):
+    """ converts the result of get_columns
+    :param format None keeps the lists, "numpy" creates numpy arrays and
+        "arrow" a pyarrow Table for every class
+    """
+    if format not in FORMATS:
+        raise ValueError("unknown format {}. Use one of {}".format(format, FORMATS))
+    if format is None:
+        return columns
+    if format == "numpy":
+        if numpy is None:
+            raise RuntimeError("the numpy format needs the numpy package")
+        return OrderedDict(
+            (name, OrderedDict((k, _to_numpy_array(v)) for k, v in values.items()))
+            for name, values in columns.items())
+    if pyarrow is None:
+        raise RuntimeError("the arrow format needs the pyarrow package")
+    return OrderedDict((name, pyarrow.table(values)) for name, values in columns.items())
@@ -0,0 +1,122 @@
+import collections
+import logging
+import threading
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BaseEventCoalescer:
+    """ collects change events of the same object for a short time and only
+    passes on the latest one. Devices like PlugableSwitchMeasuring send many
+    DEVICE_CHANGED events within seconds, which would otherwise parse the
+    device and call the handlers for every single one """
+
+    def __init__(self, window=0.5, event_types=("DEVICE_CHANGED", "GROUP_CHANGED")):
+        """
+        :param window the seconds the events are collected after the first
+            event of a batch arrived
+        :param event_types the push event types which get coalesced
+        """
+        self.window = window
+        self.event_types = frozenset(event_types)
+        # (pushEventType, id) -> [latest event, number of received events]
+        self._pending = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self._callback = None
+        self.folded = 0
+
+    def start(self, callback):
+        """
+        :param callback f(events) gets the coalesced events. Every event has
+            an additional "coalesced" value with the number of folded events
+        """
+        self._callback = callback
+
+    def stop(self):
+        """ delivers the pending events and stops the coalescer """
+        self._cancel()
+        self.flush()
+        self._callback = None
+
+    def add(self, event):
+        """ collects the event
+        :return False if the event can't be coalesced and has to be
+            processed directly
+        """
+        pushEventType = event["pushEventType"]
+        if self._callback is None or pushEventType not in self.event_types:
+            return False
+        key = self._get_key(event)
+        if key is None:
+            return False
+        with self._lock:
+            entry = self._pending.get(key)
+            if entry is None:
+                self._pending[key] = [event, 1]
+                schedule = len(self._pending) == 1
+            else:
+                entry[0] = event
+                entry[1] += 1
+                self.folded += 1
+                schedule = False
+        if schedule:
+            self._schedule()
+        return True
+
+    def discard(self, objectId):
+        """ forgets the pending events of an object e.g. after it got removed """
+        with self._lock:
+            for key in [key for key in self._pending if key[1] == objectId]:
+                del self._pending[key]
+
+    def flush(self):
+        """ delivers all pending events """
+        with self._lock:
+            pending = self._pending
+            self._pending = collections.OrderedDict()
+        if not pending or self._callback is None:
+            return
+        events = []
+        for event, count in pending.values():
+            event = dict(event)
+            event["coalesced"] = count - 1
+            events.append(event)
+        self._callback(events)
+
+    @staticmethod
+    def _get_key(event):
+        for name in ("device", "group", "client"):
+            data = event.get(name)
+            if data is not None:
+                return event["pushEventType"], data["id"]
+        return None
+
+    def _schedule(self):
+        raise NotImplementedError
+
+    def _cancel(self):
+        raise NotImplementedError
+
+
+class EventCoalescer(BaseEventCoalescer):
+    """ delivers the coalesced events from a timer thread """
+
+    def __init__(self, window=0.5, event_types=("DEVICE_CHANGED", "GROUP_CHANGED")):
+        super().__init__(window, event_types)
+        self._timer = None
+
+    def _schedule(self):
+        self._timer = threading.Timer(self.window, self._on_timer)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _on_timer(self):
+        try:
+            self.flush()
+        except Exception as err:
+            LOGGER.exception(err)
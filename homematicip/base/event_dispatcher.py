@@ -0,0 +1,174 @@
+import collections
+import logging
+import threading
+from functools import partial
+
+LOGGER = logging.getLogger(__name__)
+
+# the producer waits until there is space in the queue
+OVERFLOW_BLOCK = "BLOCK"
+# the oldest waiting task gets dropped
+OVERFLOW_DROP_OLDEST = "DROP_OLDEST"
+# a waiting task with the same key gets replaced by the new one. If there is
+# none the producer waits like with OVERFLOW_BLOCK. Update events which replace
+# each other keep the changes of both
+OVERFLOW_COALESCE = "COALESCE"
+
+
+class BaseEventDispatcher:
+    """ a bounded queue for the event handler calls of a home. The queue
+    handling is shared by the threaded and the async dispatcher """
+
+    def __init__(self, workers=2, max_queue_size=1000, overflow_policy=OVERFLOW_BLOCK):
+        """
+        :param workers the number of handlers which are running concurrently.
+            With more than one worker the handlers can be called out of order
+        :param max_queue_size the number of waiting handler calls
+        :param overflow_policy OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST or
+            OVERFLOW_COALESCE
+        """
+        if overflow_policy not in (OVERFLOW_BLOCK, OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE):
+            raise ValueError("unknown overflow policy {}".format(overflow_policy))
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.overflow_policy = overflow_policy
+        self._queue = collections.deque()
+        # key -> the queued entry, used by OVERFLOW_COALESCE
+        self._pending = {}
+        self.max_queue_depth = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.processed = 0
+
+    @property
+    def queue_depth(self):
+        return len(self._queue)
+
+    def get_metrics(self):
+        return {"queue_depth": self.queue_depth,
+                "max_queue_depth": self.max_queue_depth,
+                "dropped": self.dropped,
+                "coalesced": self.coalesced,
+                "processed": self.processed}
+
+    def _enqueue(self, task, key):
+        """ adds the task to the queue
+        :return False if the queue is full and the producer has to wait
+        """
+        if len(self._queue) >= self.max_queue_size:
+            if self.overflow_policy == OVERFLOW_COALESCE:
+                entry = self._pending.get(key) if key is not None else None
+                if entry is None:
+                    return False
+                entry[1] = self._fold(entry[1], task)
+                self.coalesced += 1
+                return True
+            if self.overflow_policy != OVERFLOW_DROP_OLDEST:
+                return False
+            oldKey, _ = self._queue.popleft()
+            self._pending.pop(oldKey, None)
+            self.dropped += 1
+        entry = [key, task]
+        self._queue.append(entry)
+        if key is not None:
+            self._pending[key] = entry
+        self.max_queue_depth = max(self.max_queue_depth, len(self._queue))
+        return True
+
+    @staticmethod
+    def _fold(old, new):
+        """ returns the task which replaces the queued task old. If both are
+        fire_update_event calls the changes are merged, the attributes keep
+        the old value of the older and the new value of the newer event
+        """
+        if not (isinstance(old, partial) and isinstance(new, partial) and old.func == new.func
+                and "changes" in old.keywords and "changes" in new.keywords):
+            return new
+        changes = dict(old.keywords["changes"] or {})
+        for k, (oldValue, newValue) in (new.keywords["changes"] or {}).items():
+            if k in changes:
+                oldValue = changes[k][0]
+            changes[k] = (oldValue, newValue)
+        keywords = dict(new.keywords, changes=changes)
+        return partial(new.func, *new.args, **keywords)
+
+    def _dequeue(self):
+        key, task = self._queue.popleft()
+        if key is not None and self._pending.get(key) is not None \
+                and self._pending[key][1] is task:
+            del self._pending[key]
+        return task
+
+
+class EventDispatcher(BaseEventDispatcher):
+    """ runs the event handlers of a Home on a pool of worker threads, so
+    slow handlers don't block the websocket thread """
+
+    def __init__(self, workers=2, max_queue_size=1000, overflow_policy=OVERFLOW_BLOCK):
+        super().__init__(workers, max_queue_size, overflow_policy)
+        self._condition = threading.Condition()
+        self._threads = []
+        self._running = False
+
+    def start(self):
+        with self._condition:
+            if self._running:
+                return
+            self._running = True
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._work,
+                                      name="hmip-event-dispatcher-{}".format(i))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, wait=True):
+        """ stops the workers after the queued tasks are done """
+        with self._condition:
+            self._running = False
+            self._condition.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+        self._threads = []
+
+    def submit(self, task, key=None):
+        """ queues the task
+        :param task a callable without arguments
+        :param key identifies tasks which can replace each other with
+            OVERFLOW_COALESCE if the queue is full e.g. the id of the updated
+            object
+
+        If the queue is full and the dispatcher isn't running, nothing would
+        make space for the task, so it is run by the caller
+        """
+        with self._condition:
+            while not self._enqueue(task, key):
+                if not self._running:
+                    break
+                self._condition.wait()
+            else:
+                self._condition.notify_all()
+                return
+        try:
+            task()
+        except Exception as err:
+            LOGGER.exception(err)
+        with self._condition:
+            self.processed += 1
+
+    def _work(self):
+        while True:
+            with self._condition:
+                while self._running and not self._queue:
+                    self._condition.wait()
+                if not self._queue:
+                    return
+                task = self._dequeue()
+                self._condition.notify_all()
+            try:
+                task()
+            except Exception as err:
+                LOGGER.exception(err)
+            with self._condition:
+                self.processed += 1
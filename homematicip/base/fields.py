@@ -0,0 +1,248 @@
+""" the declarative mapping of the json keys to the attributes of the objects.
+
+A class lists the fields it adds in _fields. When the class is created a
+parser is generated from the fields of the class and all its base classes and
+stored as _parse_fields, so a subclass only declares its own fields and the
+async classes get the parser of their base classes for free.
+
+A key which is missing in the json doesn't raise a KeyError. The attribute is
+set to the default of the field instead. Classes with __slots__ can't have class
+attributes with the name of a slot, so they call _init_fields in __init__, which
+sets the fields and the other public slots to their defaults.
+"""
+from collections import OrderedDict
+from datetime import datetime, timezone
+
+from homematicip.base.helpers import get_functional_channel_index
+
+# the default of a field without an explicit default -> the explicit default of
+# another field of the attribute, the class attribute or None
+CLASS_DEFAULT = object()
+_MISSING = object()
+
+# (source, namespace) -> function. Most subclasses, e.g. all async classes, have
+# the same fields as their base class, so their functions are only compiled once
+_compiled = {}
+
+
+def millis_to_datetime(value):
+    """ converts the epoch milliseconds of the api into a datetime in the
+    local time zone. 0 or less means the time isn't known """
+    if value is None or value <= 0:
+        return None
+    return datetime.fromtimestamp(value / 1000.0, timezone.utc).astimezone()
+
+
+class LazyDatetime:
+    """ a datetime attribute which is stored as the epoch milliseconds of the
+    api in another attribute. The datetime is only created when the attribute
+    is read and cached until the milliseconds change
+
+        lastStatusUpdateMillis = None
+        lastStatusUpdate = LazyDatetime("lastStatusUpdateMillis")
+
+    A class with __slots__ needs the slot "_lastStatusUpdate" for the cache.
+    """
+
+    def __init__(self, millisAttribute):
+        self.millisAttribute = millisAttribute
+        self.cacheAttribute = None
+
+    def __set_name__(self, owner, name):
+        self.cacheAttribute = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        millis = getattr(obj, self.millisAttribute)
+        cache = getattr(obj, self.cacheAttribute, None)
+        if cache is not None and cache[0] == millis:
+            return cache[1]
+        value = millis_to_datetime(millis)
+        setattr(obj, self.cacheAttribute, (millis, value))
+        return value
+
+    def __set__(self, obj, value):
+        millis = None if value is None else int(value.timestamp() * 1000)
+        setattr(obj, self.millisAttribute, millis)
+
+
+class Field:
+    """ maps a json key to an attribute """
+    __slots__ = ("attribute", "key", "converter", "default")
+
+    def __init__(self, attribute, key=None, converter=None, default=CLASS_DEFAULT):
+        """
+        :param attribute the name of the attribute
+        :param key the json key. Defaults to the name of the attribute. A tuple
+            of keys is a path into nested json objects
+        :param converter a function which gets the json value and returns the
+            value of the attribute
+        :param default the value if the key is missing. It is used for all
+            fields of the attribute which don't have their own default.
+            Defaults to the value of the class attribute or None
+        """
+        self.attribute = attribute
+        self.key = attribute if key is None else key
+        self.converter = converter
+        self.default = default
+
+
+class Channel:
+    """ fields which are read from the first functional channel of a type.
+    They are skipped if the device doesn't have such a channel """
+    __slots__ = ("channelType", "fields")
+
+    def __init__(self, channelType, *fields):
+        """
+        :param channelType the functionalChannelType e.g. "DEVICE_BASE"
+        :param fields Field objects or attribute names
+        """
+        self.channelType = channelType
+        self.fields = fields
+
+
+def _as_field(field):
+    return Field(field) if isinstance(field, str) else field
+
+
+def _lookup(js, path, default):
+    for key in path:
+        if not isinstance(js, dict) or key not in js:
+            return default
+        js = js[key]
+    return js
+
+
+def _get_default(cls, attribute):
+    value = getattr(cls, attribute, None)
+    # properties, slots and methods aren't default values
+    if hasattr(value, "__get__"):
+        return None
+    return value
+
+
+def get_fields(cls):
+    """ returns the fields of the class and its base classes
+    :return an OrderedDict channel type (None for the json itself) -> OrderedDict attribute -> Field
+    """
+    sources = OrderedDict()
+    sources[None] = OrderedDict()
+    for c in reversed(cls.__mro__):
+        for field in c.__dict__.get("_fields", ()):
+            if isinstance(field, Channel):
+                target = sources.setdefault(field.channelType, OrderedDict())
+                for f in field.fields:
+                    f = _as_field(f)
+                    target[f.attribute] = f
+            else:
+                field = _as_field(field)
+                sources[None][field.attribute] = field
+    return sources
+
+
+def get_defaults(cls):
+    """ returns the defaults of the fields and the public slots of the class
+    :return an OrderedDict attribute -> default value
+    """
+    defaults = OrderedDict()
+    for c in reversed(cls.__mro__):
+        for name in c.__dict__.get("__slots__", ()):
+            if not name.startswith("_"):
+                defaults[name] = None
+    explicit = set()
+    for fields in get_fields(cls).values():
+        for field in fields.values():
+            if field.default is not CLASS_DEFAULT:
+                if field.attribute not in explicit:
+                    explicit.add(field.attribute)
+                    defaults[field.attribute] = field.default
+            elif field.attribute not in defaults:
+                defaults[field.attribute] = _get_default(cls, field.attribute)
+    return defaults
+
+
+def _compile(cls, name, lines, namespace):
+    source = "\n".join(lines)
+    key = (source, tuple((k, id(v)) for k, v in sorted(namespace.items())))
+    function = _compiled.get(key)
+    if function is None:
+        exec(compile(source, "<fields of {}>".format(cls.__qualname__), "exec"), namespace)
+        function = namespace[name]
+        function.__qualname__ = "{}.{}".format(cls.__qualname__, name)
+        _compiled[key] = function
+    return function
+
+
+def compile_initializer(cls):
+    """ generates the function _init_fields(obj) which sets the attributes of
+    get_defaults. The defaults are shared by all objects, so they must not
+    be changed in place
+    """
+    namespace = {}
+    lines = ["def _init_fields(obj):"]
+    for count, (attribute, default) in enumerate(get_defaults(cls).items()):
+        namespace["default_{}".format(count)] = default
+        lines.append("    obj.{} = default_{}".format(attribute, count))
+    if len(lines) == 1:
+        lines.append("    pass")
+    return _compile(cls, "_init_fields", lines, namespace)
+
+
+def compile_parser(cls):
+    """ generates the function _parse_fields(obj, js, index=None) for the fields of
+    the class. index is the FunctionalChannelIndex of js, it is built by the
+    parser if the caller doesn't have it. If all keys are there the
+    generated code is the same as a hand-written from_json. Otherwise it
+    falls back to a second block which uses the defaults for the missing keys
+    """
+    defaults = get_defaults(cls)
+    namespace = {"get_functional_channel_index": get_functional_channel_index,
+                 "_lookup": _lookup, "_MISSING": _MISSING}
+    lines = ["def _parse_fields(obj, js, index=None):"]
+    count = 0
+    hasChannels = False
+    for channelType, fields in get_fields(cls).items():
+        if not fields:
+            continue
+        indent = "    "
+        source = "js"
+        if channelType is not None:
+            if not hasChannels:
+                hasChannels = True
+                lines.append("    if index is None:")
+                lines.append("        index = get_functional_channel_index(js)")
+            lines.append("    c = index.get_channel({!r})".format(channelType))
+            lines.append("    if c:")
+            indent = "        "
+            source = "c"
+        fast = []
+        slow = []
+        for field in fields.values():
+            default = "default_{}".format(count)
+            convert = "convert_{}".format(count)
+            count += 1
+            namespace[default] = defaults[field.attribute] \
+                if field.default is CLASS_DEFAULT else field.default
+            if field.converter is not None:
+                namespace[convert] = field.converter
+            path = field.key if isinstance(field.key, tuple) else (field.key,)
+            value = source + "".join("[{!r}]".format(k) for k in path)
+            if field.converter is not None:
+                value = "{}({})".format(convert, value)
+            fast.append("obj.{} = {}".format(field.attribute, value))
+            if len(path) == 1:
+                value = "{}.get({!r}, _MISSING)".format(source, path[0])
+            else:
+                value = "_lookup({}, {!r}, _MISSING)".format(source, path)
+            slow.append("value = " + value)
+            slow.append("obj.{} = {} if value is _MISSING else {}".format(
+                field.attribute, default,
+                "value" if field.converter is None else convert + "(value)"))
+        lines.append(indent + "try:")
+        lines.extend(indent + "    " + line for line in fast)
+        lines.append(indent + "except (KeyError, TypeError):")
+        lines.extend(indent + "    " + line for line in slow)
+    if count == 0:
+        lines.append("    pass")
+    return _compile(cls, "_parse_fields", lines, namespace)
@@ -1,8 +1,34 @@
 from datetime import datetime
 
 
+class FunctionalChannelIndex:
+    """ the functional channels of a device json by their type and index.
+    Device.from_json builds it once and passes it to all lookups of the
+    payload """
+
+    def __init__(self, channels):
+        self.byType = {}
+        self.byIndex = {}
+        for key, channel in channels.items():
+            self.byType.setdefault(channel['functionalChannelType'], []).append(channel)
+            self.byIndex[channel.get('index', int(key))] = channel
+
+    def get_channel(self, channel_type):
+        """ returns the first channel of the type or None """
+        channels = self.byType.get(channel_type)
+        return channels[0] if channels else None
+
+    def get_channels(self, channel_type):
+        """ returns all channels of the type ordered like in the payload """
+        return self.byType.get(channel_type, [])
+
+
+def get_functional_channel_index(js):
+    return FunctionalChannelIndex(js.get('functionalChannels', {}))
+
+
 def get_functional_channel(channel_type, js):
-    for channel in js['functionalChannels'].values():
+    for channel in js.get('functionalChannels', {}).values():
         if channel['functionalChannelType'] == channel_type:
             return channel
     return None
@@ -0,0 +1,95 @@
+""" the json encoding and decoding of the library.
+
+Decoding uses the fastest installed backend (orjson, ujson or the standard
+library). Encoding always uses the standard library: the request bodies are
+small and the other backends don't write the separators the cloud and the
+tests are used to.
+
+fingerprint serializes with orjson if it is installed, its output is only
+hashed and never sent.
+"""
+import json
+import logging
+from hashlib import blake2b
+
+try:
+    from orjson import dumps as _orjson_dumps
+except ImportError:
+    _orjson_dumps = None
+
+LOGGER = logging.getLogger(__name__)
+
+JSONDecodeError = json.JSONDecodeError
+
+BACKENDS = ("orjson", "ujson", "json")
+
+
+def _load_backend(name):
+    """ returns the loads function of the backend or None if it isn't installed """
+    if name == "json":
+        return json.loads
+    try:
+        module = __import__(name)
+    except ImportError:
+        return None
+    return module.loads
+
+
+def get_available_backends():
+    return [name for name in BACKENDS if _load_backend(name) is not None]
+
+
+backend = None
+_loads = None
+
+
+def set_backend(name=None):
+    """ selects the backend for decoding
+    :param name "orjson", "ujson", "json" or None for the fastest installed one
+    """
+    global backend, _loads
+    for candidate in BACKENDS if name is None else (name,):
+        loads = _load_backend(candidate)
+        if loads is not None:
+            backend = candidate
+            _loads = loads
+            LOGGER.debug("using %s for decoding json", backend)
+            return
+    raise ValueError("the json backend {} is not installed".format(name))
+
+
+def loads(s):
+    """ decodes a str or bytes
+    :raise JSONDecodeError if s isn't valid json
+    """
+    try:
+        return _loads(s)
+    except JSONDecodeError:
+        raise
+    except ValueError as err:
+        if isinstance(s, bytes):
+            s = s.decode("utf-8", "replace")
+        raise JSONDecodeError(str(err), s, 0) from err
+
+
+def dumps(obj):
+    return json.dumps(obj)
+
+
+def fingerprint(obj):
+    """ returns a 16 byte digest of a decoded json value. Equal values with
+    the keys in the same order have the same fingerprint
+    """
+    data = None
+    if _orjson_dumps is not None:
+        try:
+            data = _orjson_dumps(obj)
+        except TypeError:
+            # e.g. integers with more than 64 bits
+            pass
+    if data is None:
+        data = json.dumps(obj).encode("utf-8")
+    return blake2b(data, digest_size=16).digest()
+
+
+set_backend()
@@ -0,0 +1,50 @@
+import logging
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+LOGGER = logging.getLogger(__name__)
+
+# the sections of a getCurrentState result which map the ids to the objects
+CURRENT_STATE_SECTIONS = ("devices", "groups", "clients")
+
+
+def is_streaming_available():
+    """ the streaming parser needs the optional ijson package """
+    return ijson is not None
+
+
+def iter_current_state(stream):
+    """ parses a home/getCurrentState result while it is read. Only the json
+    of one object is held in memory at a time
+    :param stream a binary file like object e.g. the raw http response
+    :return a generator of (section, json) tuples. section is "home",
+        "devices", "groups", "clients" or "errorCode"
+    """
+    if ijson is None:
+        raise RuntimeError("the streaming parser needs the ijson package")
+    builder = None
+    itemPrefix = None
+    section = None
+    for prefix, event, value in ijson.parse(stream, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == itemPrefix and event == "end_map":
+                yield section, builder.value
+                builder = None
+            continue
+        if event == "start_map":
+            if prefix == "home":
+                section = prefix
+            else:
+                parts = prefix.split(".")
+                if len(parts) != 2 or parts[0] not in CURRENT_STATE_SECTIONS:
+                    continue
+                section = parts[0]
+            builder = ijson.common.ObjectBuilder()
+            builder.event(event, value)
+            itemPrefix = prefix
+        elif prefix == "errorCode":
+            yield "errorCode", value
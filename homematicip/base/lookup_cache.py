@@ -0,0 +1,64 @@
+import json
+import logging
+import os
+import time
+
+LOGGER = logging.getLogger(__name__)
+
+
+class LookupCache:
+    """Stores the result of the access point lookup (urlREST and
+    urlWebSocket) in a json file, so short living processes don't have to
+    ask lookup.homematic.com on every start."""
+
+    def __init__(self, path=None, ttl=24 * 60 * 60):
+        """
+        :param path the cache file. Defaults to ~/.homematicip_lookup.json
+        :param ttl the time in seconds after which an entry expires
+        """
+        if path is None:
+            path = os.path.join(os.path.expanduser("~"), ".homematicip_lookup.json")
+        self.path = path
+        self.ttl = ttl
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as err:
+            LOGGER.warning("Could not read the lookup cache %s: %s", self.path, err)
+            return {}
+
+    def _save(self, entries):
+        tmp = "{}.tmp".format(self.path)
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(tmp, self.path)
+        except OSError as err:
+            LOGGER.warning("Could not write the lookup cache %s: %s", self.path, err)
+
+    def get(self, accesspoint_id):
+        """ returns the cached hosts of the access point
+        :param accesspoint_id the id of the access point
+        :return a dict with urlREST and urlWebSocket or None if there is no
+            valid entry
+        """
+        entry = self._load().get(accesspoint_id)
+        if entry is None or time.time() - entry["timestamp"] > self.ttl:
+            return None
+        return entry
+
+    def set(self, accesspoint_id, urlREST, urlWebSocket):
+        entries = self._load()
+        entries[accesspoint_id] = {"urlREST": urlREST,
+                                   "urlWebSocket": urlWebSocket,
+                                   "timestamp": time.time()}
+        self._save(entries)
+
+    def invalidate(self, accesspoint_id):
+        entries = self._load()
+        if entries.pop(accesspoint_id, None) is not None:
+            self._save(entries)
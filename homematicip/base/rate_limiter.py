@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+
+# calls which make the access point send radio telegrams
+RADIO_CALL_PREFIXES = ("device/control/", "device/configuration/",
+                       "group/switching/", "group/heating/set")
+
+
+class DutyCycleRateLimiter:
+    """A token bucket for the calls which are using the radio of the access
+    point.
+
+    The access point reports the used part of its legal transmission budget
+    as Home.dutyCycle (in percent). If it reaches 100% further commands are
+    dropped. The limiter sends with the full rate as long as the duty cycle
+    is low and throttles linearly down to min_rate while the duty cycle
+    approaches duty_cycle_limit. Calls exceeding the rate are queued."""
+
+    def __init__(self, rate=2.0, capacity=10, min_rate=0.05,
+                 throttle_start=50.0, duty_cycle_limit=90.0):
+        """
+        :param rate the sustained calls per second at a low duty cycle
+        :param capacity the number of calls which can be sent as a burst
+        :param min_rate the calls per second at or above duty_cycle_limit
+        :param throttle_start the duty cycle in percent at which the
+            throttling starts
+        :param duty_cycle_limit the duty cycle in percent at which min_rate
+            is reached
+        """
+        self.max_rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.throttle_start = throttle_start
+        self.duty_cycle_limit = duty_cycle_limit
+        self.duty_cycle = 0.0
+        self._rate = rate
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def rate(self):
+        """the current calls per second"""
+        return self._rate
+
+    def is_limited(self, path):
+        """ returns True if the rest call to the path has to be throttled """
+        return path.startswith(RADIO_CALL_PREFIXES)
+
+    def update_duty_cycle(self, duty_cycle):
+        """ adjusts the rate to the duty cycle reported by the access point """
+        if duty_cycle is None:
+            return
+        with self._lock:
+            self._refill(time.monotonic())
+            self.duty_cycle = duty_cycle
+            if duty_cycle <= self.throttle_start:
+                self._rate = self.max_rate
+            elif duty_cycle >= self.duty_cycle_limit:
+                self._rate = self.min_rate
+            else:
+                factor = (self.duty_cycle_limit - duty_cycle) / \
+                         (self.duty_cycle_limit - self.throttle_start)
+                self._rate = max(self.min_rate, self.max_rate * factor)
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self._rate)
+        self._last = now
+
+    def _reserve(self):
+        """ takes a token and returns how many seconds the caller has to wait
+        until it may use it. Waiting callers are served in order """
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0
+            return -self._tokens / self._rate
+
+    def acquire(self):
+        """ blocks until the next call may be sent """
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        """ waits until the next call may be sent """
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
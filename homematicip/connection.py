@@ -1,45 +1,109 @@
 import hashlib
-import json
 import locale
 import platform
 import logging
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from homematicip.base.base_connection import BaseConnection
+from homematicip.base import json_codec
+from homematicip.base.base_connection import BaseConnection, HmipConnectionError
 
 logger = logging.getLogger(__name__)
 
 
 class Connection(BaseConnection):
+    """Handles the synchronous http traffic.
+
+    All requests are sent through one requests.Session, so the TCP/TLS
+    connections to the cloud are kept alive and reused between calls."""
+
+    def __init__(self, pool_maxsize=10, max_retries=0):
+        """
+        :param pool_maxsize the number of connections which are kept open per host
+        :param max_retries how often a request is repeated if the connection
+            couldn't be established
+        """
+        super().__init__()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=pool_maxsize,
+                              max_retries=Retry(total=max_retries, read=0,
+                                                backoff_factor=0.1))
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    @property
+    def session(self):
+        return self._session
+
+    def close(self):
+        """closes all pooled connections"""
+        self._session.close()
+
     def init(self, accesspoint_id, lookup=True, **kwargs):
         self.set_token_and_characteristics(accesspoint_id)
 
-        if lookup:
-            while True:
+        if lookup and self._load_cached_hosts():
+            logger.debug("using the cached hosts %s %s", self._urlREST,
+                         self._urlWebSocket)
+        elif lookup:
+            for delay in self.lookup_retry_policy.delays():
+                time.sleep(delay)
                 try:
-                    result = requests.post(
+                    result = self._session.post(
                         "https://lookup.homematic.com:48335/getHost",
                         json=self.clientCharacteristics, timeout=3)
-                    js = json.loads(result.text)
+                    js = json_codec.loads(result.text)
                     self._urlREST = js["urlREST"]
                     self._urlWebSocket = js["urlWebSocket"]
+                    self._store_cached_hosts()
                     break
-                except:
-                    pass
+                except (requests.RequestException, ValueError, KeyError) as err:
+                    logger.warning("lookup of the access point failed: %s", err)
+            else:
+                raise HmipConnectionError("Could not look up the access point")
         else:
             self._urlREST = "https://ps1.homematic.com:6969"
             self._urlWebSocket = "wss://ps1.homematic.com:8888"
 
+    def _restCallStream(self, path, body=None):
+        """ like _restCall but returns the response before the body is read,
+        so it can be parsed while it is downloaded. The caller has to close
+        the response
+        :return the requests.Response or None on timeouts
+        """
+        requestPath = '{}/hmip/{}'.format(self._urlREST, path)
+        logger.debug("_restCallStream path({}) body({})".format(requestPath, body))
+        for i in range(0, self._restCallRequestCounter):
+            try:
+                result = self._session.post(requestPath, data=body,
+                                            headers=self.headers,
+                                            timeout=self._restCallTimout,
+                                            stream=True)
+                result.raw.decode_content = True
+                return result
+            except requests.Timeout:
+                logger.error(
+                    "call to '{}' failed due Timeout".format(requestPath))
+            except requests.ConnectionError:
+                self._invalidate_cached_hosts()
+                raise
+        self._invalidate_cached_hosts()
+        return None
+
     def _restCall(self, path, body=None):
         result = None
         requestPath = '{}/hmip/{}'.format(self._urlREST, path)
         logger.debug("_restcall path({}) body({})".format(requestPath, body))
+        if self.rate_limiter is not None and self.rate_limiter.is_limited(path):
+            self.rate_limiter.acquire()
         for i in range(0, self._restCallRequestCounter):
             try:
-                result = requests.post(requestPath, data=body,
+                result = self._session.post(requestPath, data=body,
                                        headers=self.headers,
                                        timeout=self._restCallTimout)
-                ret = (result.json() if len(result.content) != 0 else "")
+                ret = (json_codec.loads(result.content) if len(result.content) != 0 else "")
                 logger.debug(
                     "_restcall result: Errorcode={} content({})".format(
                         result.status_code, ret))
@@ -48,4 +112,8 @@ class Connection(BaseConnection):
                 logger.error(
                     "call to '{}' failed due Timeout".format(requestPath))
                 pass
+            except requests.ConnectionError:
+                self._invalidate_cached_hosts()
+                raise
+        self._invalidate_cached_hosts()
         return {"errorCode": "TIMEOUT"}
@@ -1,61 +1,92 @@
 # coding=utf-8
 from homematicip import HomeMaticIPObject
-import json
-from datetime import datetime
-
-from homematicip.base.helpers import get_functional_channel
+from homematicip.base import json_codec
+from homematicip.base.fields import Field, Channel, LazyDatetime
+from homematicip.base.helpers import get_functional_channel_index
+from homematicip.functionalChannels import FunctionalChannel
 
 
 class Device(HomeMaticIPObject.HomeMaticIPObject):
     """ this class represents a generic homematic ip device """
-    id = None
-    homeId = None
-    label = None
-    lastStatusUpdate = None
-    deviceType = None
-    updateState = None
-    firmwareVersion = None
-    availableFirmwareVersion = None
-    unreach = None
-    lowBat = None
-    routerModuleSupported = False
-    routerModuleEnabled = False
-    modelType = ""
-    modelId = 0
-    oem = ""
-    manufacturerCode = 0
-    serializedGlobalTradeItemNumber = ""
-    rssiDeviceValue = 0
-    rssiPeerValue = 0
+    __slots__ = (
+        "id", "homeId", "label", "lastStatusUpdateMillis", "_lastStatusUpdate", "deviceType",
+        "updateState", "firmwareVersion", "availableFirmwareVersion", "unreach", "lowBat",
+        "routerModuleSupported", "routerModuleEnabled", "modelType", "modelId", "oem",
+        "manufacturerCode", "serializedGlobalTradeItemNumber", "rssiDeviceValue",
+        "rssiPeerValue",
+        # channel index -> FunctionalChannel
+        "functionalChannels",
+        # the attribute of OperationLockableDevice. WallMountedThermostatPro
+        # inherits from OperationLockableDevice and
+        # TemperatureHumiditySensorDisplay, which both would add slots to
+        # Device. Python doesn't allow such a layout conflict, so the slot
+        # is declared here
+        "operationLockActive",
+    )
+
+    lastStatusUpdate = LazyDatetime("lastStatusUpdateMillis")
+
+    _fields = (
+        "id", "homeId", "label",
+        Field("lastStatusUpdateMillis", "lastStatusUpdate"),
+        Field("deviceType", "type"),
+        "updateState", "firmwareVersion", "availableFirmwareVersion",
+        Field("modelType", default=""), Field("modelId", default=0), Field("oem", default=""),
+        Field("manufacturerCode", default=0),
+        Field("serializedGlobalTradeItemNumber", default=""),
+        Channel("DEVICE_BASE", "unreach", "lowBat",
+                Field("routerModuleSupported", default=False),
+                Field("routerModuleEnabled", default=False),
+                Field("rssiDeviceValue", default=0), Field("rssiPeerValue", default=0)),
+    )
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._init_fields()
 
     def from_json(self, js):
-        self.id = js["id"]
-        self.homeId = js["homeId"]
-        self.label = js["label"]
-        time = js["lastStatusUpdate"]
-        if time > 0:
-            self.lastStatusUpdate = datetime.fromtimestamp(time / 1000.0)
-        else:
-            self.lastStatusUpdate = None
-
-        self.deviceType = js["type"]
-        self.updateState = js["updateState"]
-        self.firmwareVersion = js["firmwareVersion"]
-        self.availableFirmwareVersion = js["availableFirmwareVersion"]
-        self.modelType = js['modelType']
-        self.modelId = js['modelId']
-        self.oem = js['oem']
-        self.manufacturerCode = js['manufacturerCode']
-        self.serializedGlobalTradeItemNumber = js['serializedGlobalTradeItemNumber']
-
-        c = get_functional_channel("DEVICE_BASE", js)
-        if c:
-            self.unreach = c["unreach"]
-            self.lowBat = c["lowBat"]
-            self.routerModuleSupported = c["routerModuleSupported"]
-            self.routerModuleEnabled = c["routerModuleEnabled"]
-            self.rssiDeviceValue = c["rssiDeviceValue"]
-            self.rssiPeerValue = c["rssiPeerValue"]
+        index = get_functional_channel_index(js)
+        self._parse_fields(js, index)
+        self._set_functional_channels(index)
+
+    def _set_functional_channels(self, channelIndex):
+        """ updates the existing channel objects and creates the new ones
+        :param channelIndex the FunctionalChannelIndex of the device json
+        """
+        old = self.functionalChannels or {}
+        channels = {}
+        for index, c in channelIndex.byIndex.items():
+            channel = old.get(index)
+            if channel is None or channel.functionalChannelType != c["functionalChannelType"]:
+                channel = FunctionalChannel(self._connection, self)
+            channel.from_json(c)
+            channels[index] = channel
+        self.functionalChannels = channels
+
+    def get_channels(self, channel_type):
+        """ returns the FunctionalChannels of the type sorted by their index """
+        return [c for i, c in sorted(self.functionalChannels.items())
+                if c.functionalChannelType == channel_type]
+
+    def _snapshot_channels(self):
+        """ takes a snapshot of the channels which have update handlers. The
+        changes of the other channels aren't needed """
+        return {index: (channel, channel._snapshot())
+                for index, channel in (self.functionalChannels or {}).items()
+                if channel._on_update}
+
+    def _get_changed_channels(self, state):
+        """ compares the channels with a _snapshot_channels result
+        :return a list of (channel, changes) for the channels which were
+            updated in place and have changed
+        """
+        changed = []
+        for index, (channel, snapshot) in state.items():
+            if self.functionalChannels.get(index) is channel:
+                changes = channel._diff(snapshot)
+                if changes:
+                    changed.append((channel, changes))
+        return changed
 
     def __str__(self):
         return "{} {} lowbat({}) unreach({}) rssiDeviceValue({}) rssiPeerValue({})".format(
@@ -64,11 +95,11 @@ class Device(HomeMaticIPObject.HomeMaticIPObject):
 
     def set_label(self, label):
         data = {"deviceId": self.id, "label": label}
-        return self._restCall("device/setDeviceLabel", json.dumps(data))
+        return self._restCall("device/setDeviceLabel", json_codec.dumps(data))
 
     def is_update_applicable(self):
         data = {"deviceId": self.id}
-        result = self._restCall("device/isUpdateApplicable", json.dumps(data))
+        result = self._restCall("device/isUpdateApplicable", json_codec.dumps(data))
         if result == "":
             return True
         else:
@@ -76,18 +107,18 @@ class Device(HomeMaticIPObject.HomeMaticIPObject):
 
     def authorizeUpdate(self):
         data = {"deviceId": self.id}
-        return self._restCall("device/authorizeUpdate", json.dumps(data))
+        return self._restCall("device/authorizeUpdate", json_codec.dumps(data))
 
     def delete(self):
         data = {"deviceId": self.id}
-        return self._restCall("device/deleteDevice", json.dumps(data))
+        return self._restCall("device/deleteDevice", json_codec.dumps(data))
 
     def set_router_module_enabled(self, enabled=True):
         if not self.routerModuleSupported:
             return False
         data = {"deviceId": self.id, "channelIndex": 0,
                 "routerModuleEnabled": enabled}
-        result = self._restCall("device/configuration/setRouterModuleEnabled", json.dumps(data))
+        result = self._restCall("device/configuration/setRouterModuleEnabled", json_codec.dumps(data))
         if result == "":
             return True
         else:
@@ -95,38 +126,28 @@ class Device(HomeMaticIPObject.HomeMaticIPObject):
 
 
 class SabotageDevice(Device):
-    sabotage = None
+    __slots__ = ("sabotage",)
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("DEVICE_SABOTAGE", js)
-        if c:
-            self.unreach = c["unreach"]
-            self.lowBat = c["lowBat"]
-            self.sabotage = c["sabotage"]
-            self.rssiDeviceValue = c["rssiDeviceValue"]
-            self.rssiPeerValue = c["rssiPeerValue"]
+    _fields = (
+        Channel("DEVICE_SABOTAGE", "unreach", "lowBat", "sabotage", "rssiDeviceValue",
+                "rssiPeerValue"),
+    )
 
     def __str__(self):
         return "{}: sabotage({})".format(super().__str__(), self.sabotage)
 
 
 class OperationLockableDevice(Device):
-    operationLockActive = None
+    __slots__ = ()
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("DEVICE_OPERATIONLOCK", js)
-        if c:
-            self.unreach = c["unreach"]
-            self.lowBat = c["lowBat"]
-            self.operationLockActive = c["operationLockActive"]
-            self.rssiDeviceValue = c["rssiDeviceValue"]
-            self.rssiPeerValue = c["rssiPeerValue"]
+    _fields = (
+        Channel("DEVICE_OPERATIONLOCK", "unreach", "lowBat", "operationLockActive",
+                "rssiDeviceValue", "rssiPeerValue"),
+    )
 
     def set_operation_lock(self, operationLock=True):
         data = {"channelIndex": 0, "deviceId": self.id, "operationLock": operationLock}
-        return self._restCall("device/configuration/setOperationLock", json.dumps(data))
+        return self._restCall("device/configuration/setOperationLock", json_codec.dumps(data))
 
     def __str__(self):
         return "{}: operationLockActive({})".format(super().__str__(),
@@ -136,17 +157,12 @@ class OperationLockableDevice(Device):
 class HeatingThermostat(OperationLockableDevice):
     """ HMIP-eTRV (Radiator Thermostat) """
 
-    temperatureOffset = 0
-    valvePosition = 0.0
-    valveState = ""
+    __slots__ = ("temperatureOffset", "valvePosition", "valveState")
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("HEATING_THERMOSTAT_CHANNEL", js)
-        if c:
-            self.temperatureOffset = c["temperatureOffset"]
-            self.valvePosition = c["valvePosition"]
-            self.valveState = c["valveState"]
+    _fields = (
+        Channel("HEATING_THERMOSTAT_CHANNEL", Field("temperatureOffset", default=0),
+                Field("valvePosition", default=0.0), Field("valveState", default="")),
+    )
 
     def __str__(self):
         return "{} valvePosition({}) valveState({})".format(super().__str__(), self.valvePosition,
@@ -155,15 +171,9 @@ class HeatingThermostat(OperationLockableDevice):
 
 class ShutterContact(SabotageDevice):
     """ HMIP-SWDO (Door / Window Contact - optical) / HMIP-SWDO-I (Door / Window Contact Invisible - optical)"""
-    windowState = None
-    eventDelay = None
+    __slots__ = ("windowState", "eventDelay")
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("SHUTTER_CONTACT_CHANNEL", js)
-        if c:
-            self.windowState = c["windowState"]
-            self.eventDelay = c["eventDelay"]
+    _fields = (Channel("SHUTTER_CONTACT_CHANNEL", "windowState", "eventDelay"),)
 
     def __str__(self):
         return "{} windowState({})".format(super().__str__(), self.windowState)
@@ -172,17 +182,12 @@ class ShutterContact(SabotageDevice):
 class TemperatureHumiditySensorWithoutDisplay(Device):
     """ HMIP-STH (Temperature and Humidity Sensor without display - indoor) """
 
-    temperatureOffset = None
-    actualTemperature = None
-    humidity = None
+    __slots__ = ("temperatureOffset", "actualTemperature", "humidity")
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("WALL_MOUNTED_THERMOSTAT_WITHOUT_DISPLAY_CHANNEL", js)
-        if c:
-            self.temperatureOffset = c["temperatureOffset"]
-            self.actualTemperature = c["actualTemperature"]
-            self.humidity = c["humidity"]
+    _fields = (
+        Channel("WALL_MOUNTED_THERMOSTAT_WITHOUT_DISPLAY_CHANNEL", "temperatureOffset",
+                "actualTemperature", "humidity"),
+    )
 
     def __str__(self):
         return u"{}: actualTemperature({}) humidity({})".format(
@@ -196,23 +201,16 @@ class TemperatureHumiditySensorDisplay(Device):
     DISPLAY_SETPOINT = "SETPOINT"
     DISPLAY_ACTUAL_HUMIDITY = "ACTUAL_HUMIDITY"
 
-    temperatureOffset = None
-    display = None
-    actualTemperature = None
-    humidity = None
+    __slots__ = ("temperatureOffset", "display", "actualTemperature", "humidity")
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("WALL_MOUNTED_THERMOSTAT_PRO_CHANNEL", js)
-        if c:
-            self.temperatureOffset = c["temperatureOffset"]
-            self.display = c["display"]
-            self.actualTemperature = c["actualTemperature"]
-            self.humidity = c["humidity"]
+    _fields = (
+        Channel("WALL_MOUNTED_THERMOSTAT_PRO_CHANNEL", "temperatureOffset", "display",
+                "actualTemperature", "humidity"),
+    )
 
     def set_display(self, display=DISPLAY_ACTUAL):
         data = {"channelIndex": 1, "deviceId": self.id, "display": display}
-        return self._restCall("device/configuration/setClimateControlDisplay", json.dumps(data))
+        return self._restCall("device/configuration/setClimateControlDisplay", json_codec.dumps(data))
 
     def __str__(self):
         return "{}: actualTemperature({}) humidity({})".format(super().__str__(),
@@ -223,27 +221,15 @@ class TemperatureHumiditySensorDisplay(Device):
 class WallMountedThermostatPro(TemperatureHumiditySensorDisplay,
                                OperationLockableDevice):
     """ HMIP-WTH, HMIP-WTH-2 (Wall Thermostat with Humidity Sensor) / HMIP-BWTH (Brand Wall Thermostat with Humidity Sensor)"""
-
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("WALL_MOUNTED_THERMOSTAT_PRO_CHANNEL", js)
-        if c:
-            self.temperatureOffset = c["temperatureOffset"]
-            self.display = c["display"]
-            self.actualTemperature = c["actualTemperature"]
-            self.humidity = c["humidity"]
+    __slots__ = ()
 
 
 class SmokeDetector(Device):
     """ HMIP-SWSD (Smoke Alarm with Q label) """
 
-    smokeDetectorAlarmType = None
+    __slots__ = ("smokeDetectorAlarmType",)
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("SMOKE_DETECTOR_CHANNEL", js)
-        if c:
-            self.smokeDetectorAlarmType = c["smokeDetectorAlarmType"]
+    _fields = (Channel("SMOKE_DETECTOR_CHANNEL", "smokeDetectorAlarmType"),)
 
     def __str__(self):
         return "{}: smokeDetectorAlarmType({})".format(super().__str__(),
@@ -253,16 +239,17 @@ class SmokeDetector(Device):
 class FloorTerminalBlock6(Device):
     """ HMIP-FAL230-C6 (Floor Heating Actuator - 6 channels, 230 V) """
 
-    globalPumpControl = None
-    heatingValveType = None
+    __slots__ = ("globalPumpControl", "heatingValveType",
+                 # the FLOOR_TERMINAL_BLOCK_CHANNELs, one for every valve
+                 "heatingChannels")
+
+    _fields = (
+        Channel("DEVICE_GLOBAL_PUMP_CONTROL", "unreach", "globalPumpControl", "heatingValveType"),
+    )
 
     def from_json(self, js):
         super().from_json(js)
-        c = get_functional_channel("DEVICE_GLOBAL_PUMP_CONTROL", js)
-        if c:
-            self.unreach = c["unreach"]
-            self.globalPumpControl = c["globalPumpControl"]
-            self.heatingValveType = c["heatingValveType"]
+        self.heatingChannels = self.get_channels("FLOOR_TERMINAL_BLOCK_CHANNEL")
 
     def __str__(self):
         return "{}: globalPumpControl({})".format(super().__str__(),
@@ -272,13 +259,9 @@ class FloorTerminalBlock6(Device):
 class PlugableSwitch(Device):
     """ HMIP-PS (Pluggable Switch) """
 
-    on = None
+    __slots__ = ("on",)
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("SWITCH_CHANNEL", js)
-        if c:
-            self.on = c["on"]
+    _fields = (Channel("SWITCH_CHANNEL", "on"),)
 
     def __str__(self):
         return "{}: on({})".format(super().__str__(), self.on)
@@ -286,7 +269,7 @@ class PlugableSwitch(Device):
     def set_switch_state(self, on=True):
         data = {"channelIndex": 1, "deviceId": self.id, "on": on}
         return self._restCall("device/control/setSwitchState",
-                              body=json.dumps(data))
+                              body=json_codec.dumps(data))
 
     def turn_on(self):
         return self.set_switch_state(True)
@@ -297,16 +280,11 @@ class PlugableSwitch(Device):
 
 class PlugableSwitchMeasuring(PlugableSwitch):
     """ HMIP-PSM (Pluggable Switch and Meter) """
-    energyCounter = None
-    currentPowerConsumption = None
+    __slots__ = ("energyCounter", "currentPowerConsumption")
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("SWITCH_MEASURING_CHANNEL", js)
-        if c:
-            self.on = c["on"]
-            self.energyCounter = c["energyCounter"]
-            self.currentPowerConsumption = c["currentPowerConsumption"]
+    _fields = (
+        Channel("SWITCH_MEASURING_CHANNEL", "on", "energyCounter", "currentPowerConsumption"),
+    )
 
     def __str__(self):
         return "{} energyCounter({}) currentPowerConsumption({}W)".format(
@@ -315,24 +293,20 @@ class PlugableSwitchMeasuring(PlugableSwitch):
 
 class PushButton(Device):
     """ HMIP-WRC2 (Wall-mount Remote Control - 2-button) """
+    __slots__ = ()
 
 
 class AlarmSirenIndoor(SabotageDevice):
     """ HMIP-ASIR (Alarm Siren) """
+    __slots__ = ()
 
 
 class MotionDetectorIndoor(SabotageDevice):
     """ HMIP-SMI (Motion Detector with Brightness Sensor - indoor) """
 
-    motionDetected = None
-    illumination = None
+    __slots__ = ("motionDetected", "illumination")
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("MOTION_DETECTION_CHANNEL", js)
-        if c:
-            self.motionDetected = c["motionDetected"]
-            self.illumination = c["illumination"]
+    _fields = (Channel("MOTION_DETECTION_CHANNEL", "motionDetected", "illumination"),)
 
     def __str__(self):
         return "{} motionDetected({}) illumination({})".format(super().__str__(),
@@ -343,15 +317,9 @@ class MotionDetectorIndoor(SabotageDevice):
 class PresenceDetectorIndoor(SabotageDevice):
     """ HMIP-SPI (Presence Sensor - indoor) """
 
-    presenceDetected = None
-    illumination = None
+    __slots__ = ("presenceDetected", "illumination")
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("PRESENCE_DETECTION_CHANNEL", js)
-        if c:
-            self.presenceDetected = c["presenceDetected"]
-            self.illumination = c["illumination"]
+    _fields = (Channel("PRESENCE_DETECTION_CHANNEL", "presenceDetected", "illumination"),)
 
     def __str__(self):
         return "{} motionDetected({}) illumination({})".format(super().__str__(),
@@ -361,13 +329,7 @@ class PresenceDetectorIndoor(SabotageDevice):
 
 class KeyRemoteControlAlarm(Device):
     """ HMIP-KRCA (Key Ring Remote Control - alarm) """
-
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("DEVICE_BASE", js)
-        if c:
-            self.unreach = c["unreach"]
-            self.lowBat = c["lowBat"]
+    __slots__ = ()
 
     def __str__(self):
         return "{}".format(super().__str__())
@@ -376,17 +338,12 @@ class KeyRemoteControlAlarm(Device):
 class FullFlushShutter(Device):
     """HMIP-FROLL (Shutter Actuator - flush-mount) / HMIP-BROLL (Shutter Actuator - Brand-mount)"""
 
-    shutterLevel = None
-    bottomToTopReferenceTime = None
-    topToBottomReferenceTime = None
+    __slots__ = ("shutterLevel", "bottomToTopReferenceTime", "topToBottomReferenceTime")
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("SHUTTER_CHANNEL", js)
-        if c:
-            self.shutterLevel = c["shutterLevel"]
-            self.bottomToTopReferenceTime = c["bottomToTopReferenceTime"]
-            self.topToBottomReferenceTime = c["topToBottomReferenceTime"]
+    _fields = (
+        Channel("SHUTTER_CHANNEL", "shutterLevel", "bottomToTopReferenceTime",
+                "topToBottomReferenceTime"),
+    )
 
     def __str__(self):
         return "{} shutterLevel({}) topToBottom({}) bottomToTop({})".format(
@@ -395,26 +352,21 @@ class FullFlushShutter(Device):
 
     def set_shutter_level(self, level):
         data = {"channelIndex": 1, "deviceId": self.id, "shutterLevel": level}
-        return self._restCall("device/control/setShutterLevel", body=json.dumps(data))
+        return self._restCall("device/control/setShutterLevel", body=json_codec.dumps(data))
 
     def set_shutter_stop(self):
         data = {"channelIndex": 1, "deviceId": self.id}
-        return self._restCall("device/control/stop", body=json.dumps(data))
+        return self._restCall("device/control/stop", body=json_codec.dumps(data))
 
 
 class PluggableDimmer(Device):
     """HmIP-PDT Pluggable Dimmer"""
-    dimLevel = 0.0
-    profileMode = ""
-    userDesiredProfileMode = ""
+    __slots__ = ("dimLevel", "profileMode", "userDesiredProfileMode")
 
-    def from_json(self, js):
-        super().from_json(js)
-        c = get_functional_channel("DIMMER_CHANNEL", js)
-        if c:
-            self.dimLevel = c["dimLevel"]
-            self.profileMode = c["profileMode"]
-            self.userDesiredProfileMode = c["userDesiredProfileMode"]
+    _fields = (
+        Channel("DIMMER_CHANNEL", Field("dimLevel", default=0.0), Field("profileMode", default=""),
+                Field("userDesiredProfileMode", default="")),
+    )
 
     def __str__(self):
         return "{} dimLevel({}) profileMode({}) userDesiredProfileMode({})".format(
@@ -422,4 +374,4 @@ class PluggableDimmer(Device):
 
     def set_dim_level(self, dimLevel=0.0):
         data = {"channelIndex": 1, "deviceId": self.id, "dimLevel": dimLevel}
-        return self._restCall("device/control/setDimLevel", json.dumps(data))
+        return self._restCall("device/control/setDimLevel", json_codec.dumps(data))
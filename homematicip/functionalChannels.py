@@ -0,0 +1,49 @@
+from homematicip import HomeMaticIPObject
+
+
+class FunctionalChannel(HomeMaticIPObject.HomeMaticIPObject):
+    """ a functional channel of a device. All values of the channel json are
+    available as attributes e.g. channel.on for a SWITCH_CHANNEL.
+
+    The channel objects are kept when the device is updated, so on_update
+    handlers of a channel only get called if this channel has changed.
+
+    The keys every channel has are slots, the values of the other keys are
+    kept in the instance dict """
+
+    __slots__ = ("device", "index", "groupIndex", "functionalChannelType", "label", "groups",
+                 "__dict__")
+
+    def __init__(self, connection, device=None):
+        super().__init__(connection)
+        self.device = device
+        self.index = None
+        self.groupIndex = None
+        self.functionalChannelType = None
+        self.label = None
+        self.groups = []
+
+    def from_json(self, js):
+        values = dict(js)
+        self.index = values.pop("index", None)
+        self.groupIndex = values.pop("groupIndex", None)
+        self.functionalChannelType = values.pop("functionalChannelType", None)
+        self.label = values.pop("label", None)
+        self.groups = values.pop("groups", [])
+        # a new dict, so keys which are missing in the new json are dropped.
+        # The copy is compact again after the pops. A key like "device" stays
+        # in the dict, the slot is looked up first
+        self.__dict__ = values.copy()
+
+    def get_values(self):
+        """ returns the values of the channel type specific keys as dict """
+        return dict(self.__dict__)
+
+    def _snapshot(self):
+        snapshot = super()._snapshot()
+        # the device changes with every channel, so it doesn't tell anything
+        snapshot.pop("device", None)
+        return snapshot
+
+    def __str__(self):
+        return "{} {} {}".format(self.functionalChannelType, self.index, self.label)
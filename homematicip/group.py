@@ -1,93 +1,76 @@
 # coding=utf-8
 from homematicip import HomeMaticIPObject
-import json
-from datetime import datetime
+from homematicip.base import json_codec
+from homematicip.base.fields import Field, LazyDatetime
 import calendar
 from operator import attrgetter
 
+from homematicip.heating_schedule import HeatingSchedule, time_to_minutes
+
 
 class Group(HomeMaticIPObject.HomeMaticIPObject):
     """this class represents a group """
-    id = None
-    homeId = None
-    label = None
-    lastStatusUpdate = None
-    groupType = None
-    updateState = None
-    unreach = None
-    lowBat = None
-    metaGroup = None
-    devices = None
+    __slots__ = ("id", "homeId", "label", "lastStatusUpdateMillis", "_lastStatusUpdate",
+                 "groupType", "updateState", "unreach", "lowBat", "metaGroup", "devices")
 
+    lastStatusUpdate = LazyDatetime("lastStatusUpdateMillis")
 
-    def from_json(self, js, devices):
-        self.id = js["id"]
-        self.homeId = js["homeId"]
-        self.label = js["label"]
-        time = js["lastStatusUpdate"]
-        if time > 0:
-            self.lastStatusUpdate = datetime.fromtimestamp(time / 1000.0)
-        else:
-            self.lastStatusUpdate = None
+    _fields = (
+        "id", "homeId", "label",
+        Field("lastStatusUpdateMillis", "lastStatusUpdate"),
+        Field("groupType", "type"),
+    )
 
-        self.groupType = js["type"]
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._init_fields()
+
+    def from_json(self, js, devices):
+        """ parses the group
+        :param js the json representation of the group
+        :param devices a dict which maps the device ids to the Device objects
+        """
+        self._parse_fields(js)
 
         self.devices = []
-        for channel in js["channels"]:
-            for d in devices:
-                if d.id == channel["deviceId"]:
-                    self.devices.append(d)
+        for channel in js.get("channels", ()):
+            d = devices.get(channel.get("deviceId"))
+            if d is not None:
+                self.devices.append(d)
 
     def __str__(self):
         return "{} {}".format(self.groupType, self.label)
 
     def set_label(self, label):
         data = {"groupId": self.id, "label": label}
-        return self._restCall("group/setGroupLabel", json.dumps(data))
+        return self._restCall("group/setGroupLabel", json_codec.dumps(data))
 
 
 class MetaGroup(Group):
     """ a meta group is a "Room" inside the homematic configuration """
 
-    groups = None
+    __slots__ = ("groups",)
 
     def from_json(self, js, devices, groups):
-        self.id = js["id"]
-        self.homeId = js["homeId"]
-        self.label = js["label"]
-        time = js["lastStatusUpdate"]
-        if time > 0:
-            self.lastStatusUpdate = datetime.fromtimestamp(time / 1000.0)
-        else:
-            self.lastStatusUpdate = None
-        self.groupType = js["type"]
-
-        self.devices = []
-        for channel in js["channels"]:
-            for d in devices:
-                if d.id == channel["deviceId"]:
-                    self.devices.append(d)
+        """ parses the meta group
+        :param js the json representation of the group
+        :param devices a dict which maps the device ids to the Device objects
+        :param groups a dict which maps the group ids to the Group objects
+        """
+        super().from_json(js, devices)
 
         self.groups = []
-        for group in js["groups"]:
-            for g in groups:
-                if g.id == group:
-                    g.metaGroup = self
-                    self.groups.append(g)
+        for group in js.get("groups", ()):
+            g = groups.get(group)
+            if g is not None:
+                g.metaGroup = self
+                self.groups.append(g)
 
 
 class SecurityGroup(Group):
-    windowState = None
-    motionDetected = None
-    sabotage = None
-    smokeDetectorAlarmType = None
+    __slots__ = ("windowState", "motionDetected", "sabotage", "smokeDetectorAlarmType")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.windowState = js["windowState"]
-        self.motionDetected = js["motionDetected"]
-        self.sabotage = js["sabotage"]
-        self.smokeDetectorAlarmType = js["smokeDetectorAlarmType"]
+    _fields = ("windowState", "motionDetected", "sabotage", "smokeDetectorAlarmType")
 
     def __str__(self):
         return "{}: windowState({}) motionDetected({}) sabotage({}) smokeDetectorAlarmType({})".format(
@@ -97,26 +80,16 @@ class SecurityGroup(Group):
 
 
 class SwitchingGroup(Group):
-    on = None
-    dimLevel = None
-    processing = None
-    shutterLevel = None
-    slatsLevel = None
+    __slots__ = ("on", "dimLevel", "processing", "shutterLevel", "slatsLevel")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.on = js["on"]
-        self.dimLevel = js["dimLevel"]
-        try:  # TODO: FIX that ugly hack -> maybe linked_switching shouldn't inherit anymore from switchingGroup
-            self.processing = js["processing"]
-            self.shutterLevel = js["shutterLevel"]
-            self.slatsLevel = js["slatsLevel"]
-        except:
-            pass
+    _fields = (
+        # the LINKED_SWITCHING groups don't have processing, shutterLevel and slatsLevel
+        "on", "dimLevel", "processing", "shutterLevel", "slatsLevel",
+    )
 
     def set_switch_state(self, on=True):
         data = {"groupId": self.id, "on": on}
-        return self._restCall("group/switching/setState", body=json.dumps(data))
+        return self._restCall("group/switching/setState", body=json_codec.dumps(data))
 
     def turn_on(self):
         return self.set_switch_state(True)
@@ -126,11 +99,11 @@ class SwitchingGroup(Group):
 
     def set_shutter_level(self, level):
         data = {"groupId": self.id, "shutterLevel": level}
-        return self._restCall("group/switching/setShutterLevel", body=json.dumps(data))
+        return self._restCall("group/switching/setShutterLevel", body=json_codec.dumps(data))
 
     def set_shutter_stop(self):
         data = {"groupId": self.id}
-        return self._restCall("group/switching/stop", body=json.dumps(data))
+        return self._restCall("group/switching/stop", body=json_codec.dumps(data))
 
     def __str__(self):
         return "{}: on({}) dimLevel({}) processing({}) shutterLevel({}) slatsLevel({})".format(
@@ -140,25 +113,21 @@ class SwitchingGroup(Group):
 
 
 class LinkedSwitchingGroup(SwitchingGroup):
+    __slots__ = ()
+
     def set_light_group_switches(self, devices):
         switchChannels = []
         for d in devices:
             channel = {"channelIndex": 1, "deviceId": d.id}
             switchChannels.append(channel)
         data = {"groupId": self.id, "switchChannels": switchChannels}
-        return self._restCall("home/security/setLightGroupSwitches", body=json.dumps(data))
+        return self._restCall("home/security/setLightGroupSwitches", body=json_codec.dumps(data))
 
 
 class ExtendedLinkedSwitchingGroup(SwitchingGroup):
-    onTime = None
-    onLevel = None
-    sensorSpecificParameters = None
+    __slots__ = ("onTime", "onLevel", "sensorSpecificParameters")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.onTime = js["onTime"]
-        self.onLevel = js["onLevel"]
-        self.sensorSpecificParameters = js["sensorSpecificParameters"]
+    _fields = ("onTime", "onLevel", "sensorSpecificParameters")
 
     def __str__(self):
         return "{} onTime({}) onLevel({})".format(
@@ -167,14 +136,12 @@ class ExtendedLinkedSwitchingGroup(SwitchingGroup):
 
     def set_on_time(self, onTimeSeconds):
         data = {"groupId": self.id, "onTime": onTimeSeconds}
-        return self._restCall("group/switching/linked/setOnTime", body=json.dumps(data))
+        return self._restCall("group/switching/linked/setOnTime", body=json_codec.dumps(data))
 
 class ExtendedLinkedShutterGroup(Group):
-    shutterLevel = None
+    __slots__ = ("shutterLevel",)
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.shutterLevel = js["shutterLevel"]
+    _fields = ("shutterLevel",)
 
     def __str__(self):
         return "{} shutterLevel({})".format(
@@ -183,11 +150,11 @@ class ExtendedLinkedShutterGroup(Group):
 
     def set_shutter_level(self, level):
         data = {"groupId": self.id, "shutterLevel": level}
-        return self._restCall("group/switching/setShutterLevel", body=json.dumps(data))
+        return self._restCall("group/switching/setShutterLevel", body=json_codec.dumps(data))
 
     def set_shutter_stop(self):
         data = {"groupId": self.id}
-        return self._restCall("group/switching/stop", body=json.dumps(data))
+        return self._restCall("group/switching/stop", body=json_codec.dumps(data))
 
 
 class AlarmSwitchingGroup(Group):
@@ -200,27 +167,17 @@ class AlarmSwitchingGroup(Group):
     SIGNAL_OPTICAL_CONFIRMATION_SIGNAL_1 = "CONFIRMATION_SIGNAL_1"
     SIGNAL_OPTICAL_CONFIRMATION_SIGNAL_2 = "CONFIRMATION_SIGNAL_2"
 
-    on = None
-    dimLevel = None
-    onTime = None
-    signalAcoustic = None
-    signalOptical = None
-    smokeDetectorAlarmType = None
-    acousticFeedbackEnabled = None
+    __slots__ = ("on", "dimLevel", "onTime", "signalAcoustic", "signalOptical",
+                 "smokeDetectorAlarmType", "acousticFeedbackEnabled")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.onTime = js["onTime"]
-        self.on = js["on"]
-        self.dimLevel = js["dimLevel"]
-        self.signalAcoustic = js["signalAcoustic"]
-        self.signalOptical = js["signalOptical"]
-        self.smokeDetectorAlarmType = js["smokeDetectorAlarmType"]
-        self.acousticFeedbackEnabled = js["acousticFeedbackEnabled"]
+    _fields = (
+        "onTime", "on", "dimLevel", "signalAcoustic", "signalOptical", "smokeDetectorAlarmType",
+        "acousticFeedbackEnabled",
+    )
 
     def set_on_time(self, onTimeSeconds):
         data = {"groupId": self.id, "onTime": onTimeSeconds}
-        return self._restCall("group/switching/alarm/setOnTime", body=json.dumps(data))
+        return self._restCall("group/switching/alarm/setOnTime", body=json_codec.dumps(data))
 
     def __str__(self):
         return "{}: on({}) dimLevel({}) onTime({}) signalAcoustic({}) signalOptical({}) smokeDetectorAlarmType({}) acousticFeedbackEnabled({})".format(
@@ -232,17 +189,19 @@ class AlarmSwitchingGroup(Group):
     def test_signal_optical(self,
                             signalOptical=SIGNAL_OPTICAL_BLINKING_ALTERNATELY_REPEATING):
         data = {"groupId": self.id, "signalOptical": signalOptical}
-        return self._restCall("group/switching/alarm/testSignalOptical", body=json.dumps(data))
+        return self._restCall("group/switching/alarm/testSignalOptical", body=json_codec.dumps(data))
 
     def set_signal_optical(self,
                            signalOptical=SIGNAL_OPTICAL_BLINKING_ALTERNATELY_REPEATING):
         data = {"groupId": self.id, "signalOptical": signalOptical}
-        return self._restCall("group/switching/alarm/setSignalOptical", body=json.dumps(data))
+        return self._restCall("group/switching/alarm/setSignalOptical", body=json_codec.dumps(data))
 
 
 # at the moment it doesn't look like this class has any special properties/functions
 # keep it as a placeholder in the meantime
 class HeatingHumidyLimiterGroup(Group):
+    __slots__ = ()
+
     def __str__(self):
         return super().__str__()
 
@@ -250,17 +209,16 @@ class HeatingHumidyLimiterGroup(Group):
 # at the moment it doesn't look like this class has any special properties/functions
 # keep it as a placeholder in the meantime
 class HeatingTemperatureLimiterGroup(Group):
+    __slots__ = ()
+
     def __str__(self):
         return super().__str__()
 
 
 class HeatingChangeoverGroup(Group):
-    on = None
-    dimLevel = None
+    __slots__ = ("on", "dimLevel")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.on = js["on"]
+    _fields = ("on",)
 
     def __str__(self):
         return "{} on({})".format( super().__str__(), self.on)
@@ -269,30 +227,30 @@ class HeatingChangeoverGroup(Group):
 # at the moment it doesn't look like this class has any special properties/functions
 # keep it as a placeholder in the meantime
 class InboxGroup(Group):
+    __slots__ = ()
+
     def __str__(self):
         return super().__str__()
 
 
 class SecurityZoneGroup(Group):
-    active = False
-    silent = False
-    ignorableDevices = []
-    windowState = ""
-    motionDetected = None
-    sabotage = None
-    presenceDetected = None
+    __slots__ = ("active", "silent", "ignorableDevices", "windowState", "motionDetected",
+                 "sabotage", "presenceDetected")
+
+    _fields = (Field("active", default=False), Field("silent", default=False),
+               Field("windowState", default=""), "motionDetected", "sabotage")
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self.ignorableDevices = []
 
     def from_json(self, js, devices):
         super().from_json(js, devices)
-        self.active = js["active"]
-        self.silent = js["silent"]
-        self.windowState = js["windowState"]
-        self.motionDetected = js["motionDetected"]
-        self.sabotage = js["sabotage"]
         self.ignorableDevices = []
-        for device in js["ignorableDevices"]:
-            self.ignorableDevices.append(
-                [d for d in devices if d.id == device][0])
+        for device in js.get("ignorableDevices", ()):
+            d = devices.get(device)
+            if d is not None:
+                self.ignorableDevices.append(d)
 
     def __str__(self):
         return "{} active({}) silent({}) windowState({}) motionDetected({}) sabotage({}) presenceDetected({}) ignorableDevices(#{})".format(
@@ -302,73 +260,100 @@ class SecurityZoneGroup(Group):
 
 
 class HeatingCoolingPeriod(HomeMaticIPObject.HomeMaticIPObject):
-    starttime = None
-    endtime = None
-    value = None
+    __slots__ = ("starttime", "endtime", "value")
+
+    _fields = ("starttime", "endtime", "value")
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._init_fields()
 
     def from_json(self, js):
         super().from_json(js)
-        self.starttime = js["starttime"]
-        self.endtime = js["endtime"]
-        self.value = js["value"]
+        self._parse_fields(js)
 
 
 class HeatingCoolingProfileDay(HomeMaticIPObject.HomeMaticIPObject):
-    baseValue = None
-    periods = None
+    __slots__ = ("baseValue", "periods")
+
+    _fields = ("baseValue",)
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._init_fields()
 
     def from_json(self, js):
         super().from_json(js)
-        self.baseValue = js["baseValue"]
+        self._parse_fields(js)
         self.periods = []
-        for p in js["periods"]:
+        for p in js.get("periods", ()):
             period = HeatingCoolingPeriod(self._connection)
             period.from_json(p)
             self.periods.append(period)
 
 
 class HeatingCoolingProfile(HomeMaticIPObject.HomeMaticIPObject):
-    id = None
-    homeId = None
-
-    groupId = None
-    index = None
-    visible = None
-    enabled = None
-
-    name = None
-    type = None
-    profileDays = None
-
-    def get_details(self):
+    __slots__ = ("id", "homeId", "groupId", "index", "visible", "enabled",
+                 "name", "type", "profileDays", "_schedule")
+
+    _fields = (Field("id", "profileId"), "groupId", "index", "name", "visible", "enabled")
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._init_fields()
+        self._schedule = None
+
+    def get_details(self, refresh=False):
+        """ downloads the days and periods of the profile. They are cached
+        until the profiles of the group change
+        :param refresh downloads the details even if they are cached
+        """
+        if self.profileDays is not None and not refresh:
+            return
+        self._parse_details(self._request_details())
+
+    def invalidate_details(self):
+        self.profileDays = None
+        self._schedule = None
+
+    def get_schedule(self):
+        """ returns the compiled HeatingSchedule of the profile. The details
+        must have been downloaded with get_details before
+        """
+        if self.profileDays is None:
+            raise ValueError("the details of profile {} are not loaded".format(self.index))
+        if self._schedule is None:
+            self._schedule = HeatingSchedule.from_profile_days(self.profileDays)
+        return self._schedule
+
+    def _request_details(self):
         data = {"groupId": self.groupId, "profileIndex": self.index,
                 "profileName": self.name}
-        js = self._restCall("group/heating/getProfile", body=json.dumps(data))
-        self.homeId = js["homeId"]
-        self.type = js["type"]
+        return self._restCall("group/heating/getProfile", body=json_codec.dumps(data))
+
+    def _parse_details(self, js):
+        self.homeId = js.get("homeId")
+        self.type = js.get("type")
+        self._schedule = None
         self.profileDays = {}
 
+        days = js.get("profileDays", {})
         for i in range(0, 7):
             day = HeatingCoolingProfileDay(self._connection)
-            day.from_json(js["profileDays"][calendar.day_name[i].upper()])
+            day.from_json(days.get(calendar.day_name[i].upper(), {}))
             self.profileDays[i] = day
 
     def from_json(self, js):
         super().from_json(js)
-        self.id = js["profileId"]
-        self.groupId = js["groupId"]
-        self.index = js["index"]
-        self.name = js["name"]
-        self.visible = js["visible"]
-        self.enabled = js["enabled"]
+        self._parse_fields(js)
 
     def _time_to_totalminutes(self, time):
-        s = time.split(":")
-        return int(s[0]) * 60 + int(s[1])
+        return time_to_minutes(time)
 
     def update_profile(self):
+        self._schedule = None
         days = {}
-        for i in xrange(0, 7):
+        for i in range(0, 7):
             periods = []
             day = self.profileDays[i]
             for p in day.periods:
@@ -391,73 +376,88 @@ class HeatingCoolingProfile(HomeMaticIPObject.HomeMaticIPObject):
                     , "index": self.index, "name": self.name,
                             "profileDays": days, "type": self.type},
                 "profileIndex": self.index}
-        return self._restCall("group/heating/updateProfile", body=json.dumps(data))
+        return self._restCall("group/heating/updateProfile", body=json_codec.dumps(data))
 
 
 class HeatingGroup(Group):
-    windowOpenTemperature = None
-    setPointTemperature = None
-    windowState = None
-    maxTemperature = None
-    minTemperature = None
-    cooling = None
-    partyMode = None
-    controlMode = None
-    activeProfile = None
-    boostMode = None
-    boostDuration = None
-    actualTemperature = None
-    humidity = None
-    coolingAllowed = None
-    coolingIgnored = None
-    ecoAllowed = None
-    ecoIgnored = None
-    controllable = None
-    floorHeatingMode = None
-    humidityLimitEnabled = None
-    humidityLimitValue = None
-    externalClockEnabled = None
-    externalClockHeatingTemperature = None
-    externalClockCoolingTemperature = None
-    profiles = None
+    __slots__ = (
+        "windowOpenTemperature", "setPointTemperature", "windowState", "maxTemperature",
+        "minTemperature", "cooling", "partyMode", "controlMode", "boostMode", "boostDuration",
+        "actualTemperature", "humidity", "coolingAllowed", "coolingIgnored", "ecoAllowed",
+        "ecoIgnored", "controllable", "floorHeatingMode", "humidityLimitEnabled",
+        "humidityLimitValue", "externalClockEnabled", "externalClockHeatingTemperature",
+        "externalClockCoolingTemperature",
+        "_profilesJson", "_profiles", "_profileMap", "_activeProfileKey",
+    )
+
+    _profileClass = HeatingCoolingProfile
+
+    _fields = (
+        "windowOpenTemperature", "setPointTemperature", "windowState", "maxTemperature",
+        "minTemperature", "cooling", "partyMode", "controlMode", "boostMode", "boostDuration",
+        "actualTemperature", "humidity", "coolingAllowed", "coolingIgnored", "ecoAllowed",
+        "ecoIgnored", "controllable", "floorHeatingMode", "humidityLimitEnabled",
+        "humidityLimitValue", "externalClockEnabled", "externalClockHeatingTemperature",
+        "externalClockCoolingTemperature",
+    )
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        # the profiles are only created when they are accessed. They are kept
+        # as long as the json of the profiles doesn't change
+        self._profilesJson = None
+        self._profiles = None
+        self._profileMap = None
+        self._activeProfileKey = None
 
     def from_json(self, js, devices):
         super().from_json(js, devices)
-        self.windowOpenTemperature = js["windowOpenTemperature"]
-        self.setPointTemperature = js["setPointTemperature"]
-        self.windowState = js["windowState"]
-        self.maxTemperature = js["maxTemperature"]
-        self.minTemperature = js["minTemperature"]
-        self.cooling = js["cooling"]
-        self.partyMode = js["partyMode"]
-        self.controlMode = js["controlMode"]
-        self.boostMode = js["boostMode"]
-        self.boostDuration = js["boostDuration"]
-        self.actualTemperature = js["actualTemperature"]
-        self.humidity = js["humidity"]
-        self.coolingAllowed = js["coolingAllowed"]
-        self.coolingIgnored = js["coolingIgnored"]
-        self.ecoAllowed = js["ecoAllowed"]
-        self.ecoIgnored = js["ecoIgnored"]
-        self.controllable = js["controllable"]
-        self.floorHeatingMode = js["floorHeatingMode"]
-        self.humidityLimitEnabled = js["humidityLimitEnabled"]
-        self.humidityLimitValue = js["humidityLimitValue"]
-        self.externalClockEnabled = js["externalClockEnabled"]
-        self.externalClockHeatingTemperature = js[
-            "externalClockHeatingTemperature"]
-        self.externalClockCoolingTemperature = js[
-            "externalClockCoolingTemperature"]
-
-        profiles = []
-        activeProfile = js["activeProfile"]  # not self.!!!!
-        for k, v in js["profiles"].items():
-            profile = HeatingCoolingProfile(self._connection)
-            profile.from_json(v)
-            profiles.append(profile)
-            if activeProfile == k:
-                self.activeProfile = profile
-        self.profiles = sorted(profiles, key=attrgetter('index'))
+        profiles = js.get("profiles")
+        if profiles != self._profilesJson:
+            self._profilesJson = profiles
+            self._profiles = None
+            self._profileMap = None
+        self._activeProfileKey = js.get("activeProfile")
+
+    def _build_profiles(self):
+        if self._profiles is None and self._profilesJson is not None:
+            self._profileMap = {}
+            for k, v in self._profilesJson.items():
+                profile = self._profileClass(self._connection)
+                profile.from_json(v)
+                self._profileMap[k] = profile
+            self._profiles = sorted(self._profileMap.values(), key=attrgetter('index'))
+
+    @property
+    def profiles(self):
+        """ the HeatingCoolingProfiles sorted by their index """
+        self._build_profiles()
+        return self._profiles
+
+    @property
+    def activeProfile(self):
+        self._build_profiles()
+        if self._profileMap is None:
+            return None
+        return self._profileMap.get(self._activeProfileKey)
+
+    def get_schedule(self):
+        """ returns the HeatingSchedule of the active profile. The details of
+        the profile must have been downloaded before
+        """
+        return self.activeProfile.get_schedule()
+
+    def invalidate_profile_details(self):
+        """ removes the cached details of the profiles """
+        for profile in self._profiles or ():
+            profile.invalidate_details()
+
+    def _snapshot(self):
+        # the profile objects are compared by their json
+        snapshot = super()._snapshot()
+        snapshot["profiles"] = self._profilesJson
+        snapshot["activeProfile"] = self._activeProfileKey
+        return snapshot
 
     def __str__(self):
         return "{} windowOpenTemperature({}) setPointTemperature({}) windowState({}) motionDetected({}) sabotage({}) cooling({}) partyMode({}) controlMode({}) actualTemperature({})".format(
@@ -469,24 +469,21 @@ class HeatingGroup(Group):
 
     def set_point_temperature(self, temperature):
         data = {"groupId": self.id, "setPointTemperature": temperature}
-        return self._restCall("group/heating/setSetPointTemperature", body=json.dumps(data))
+        return self._restCall("group/heating/setSetPointTemperature", body=json_codec.dumps(data))
 
     def set_boost(self, enable=True):
         data = {"groupId": self.id, "boost": enable}
-        return self._restCall("group/heating/setBoost", body=json.dumps(data))
+        return self._restCall("group/heating/setBoost", body=json_codec.dumps(data))
 
     def set_active_profile(self, index):
         data = {"groupId": self.id, "profileIndex": index}
-        return self._restCall("group/heating/setActiveProfile", body=json.dumps(data))
+        return self._restCall("group/heating/setActiveProfile", body=json_codec.dumps(data))
 
 
 class HeatingDehumidifierGroup(Group):
-    on = None
-    dimLevel = None
+    __slots__ = ("on", "dimLevel")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.on = js["on"]
+    _fields = ("on",)
 
     def __str__(self):
         return "{}: on({})".format(
@@ -494,13 +491,9 @@ class HeatingDehumidifierGroup(Group):
 
 
 class HeatingCoolingDemandGroup(Group):
-    on = None
-    dimLevel = None
+    __slots__ = ("on", "dimLevel")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.on = js["on"]
-        self.dimLevel = js["dimLevel"]
+    _fields = ("on", "dimLevel")
 
     def __str__(self):
         return "{}: on({}) dimLevel({}) ".format(
@@ -511,21 +504,16 @@ class HeatingCoolingDemandGroup(Group):
 # at the moment it doesn't look like this class has any special properties/functions
 # keep it as a placeholder in the meantime
 class HeatingExternalClockGroup(Group):
+    __slots__ = ()
+
     def __str__(self):
         return super().__str__()
 
 
 class HeatingCoolingDemandBoilerGroup(Group):
-    boilerFollowUpTime = None
-    boilerLeadTime = None
-    on = None
-    dimLevel = None
+    __slots__ = ("boilerFollowUpTime", "boilerLeadTime", "on", "dimLevel")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.on = js["on"]
-        self.boilerLeadTime = js["boilerLeadTime"]
-        self.boilerFollowUpTime = js["boilerFollowUpTime"]
+    _fields = ("on", "boilerLeadTime", "boilerFollowUpTime")
 
     def __str__(self):
         return "{}: on({}) boilerFollowUpTime({}) boilerLeadTime({})".format(
@@ -534,21 +522,13 @@ class HeatingCoolingDemandBoilerGroup(Group):
 
 
 class HeatingCoolingDemandPumpGroup(Group):
-    pumpProtectionDuration = None
-    pumpProtectionSwitchingInterval = None
-    pumpFollowUpTime = None
-    pumpLeadTime = None
-    on = None
-    dimLevel = None
+    __slots__ = ("pumpProtectionDuration", "pumpProtectionSwitchingInterval", "pumpFollowUpTime",
+                 "pumpLeadTime", "on", "dimLevel")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.on = js["on"]
-        self.pumpProtectionSwitchingInterval = js[
-            "pumpProtectionSwitchingInterval"]
-        self.pumpProtectionDuration = js["pumpProtectionDuration"]
-        self.pumpFollowUpTime = js["pumpFollowUpTime"]
-        self.pumpLeadTime = js["pumpLeadTime"]
+    _fields = (
+        "on", "pumpProtectionSwitchingInterval", "pumpProtectionDuration", "pumpFollowUpTime",
+        "pumpLeadTime",
+    )
 
     def __str__(self):
         return "{}: on({}) pumpProtectionDuration({}) pumpProtectionSwitchingInterval({}) pumpFollowUpTime({}) " \
@@ -560,59 +540,59 @@ class HeatingCoolingDemandPumpGroup(Group):
 
 
 class TimeProfilePeriod(HomeMaticIPObject.HomeMaticIPObject):
-    weekdays = []
-    hour = 0
-    minute = 0
-    astroOffset = 0
-    astroLimitationType = "NO_LIMITATION"  # NOT_EARLIER_THAN_TIME, NOT_LATER_THAN_TIME
-    switchTimeMode = "REGULAR_SWITCH_TIME"  # ASTRO_SUNRISE_SWITCH_TIME, ASTRO_SUNSET_SWITCH_TIME
-    dimLevel = 1.0
-    rampTime = 0
+    __slots__ = ("weekdays", "hour", "minute", "astroOffset", "astroLimitationType",
+                 "switchTimeMode", "dimLevel", "rampTime")
+
+    _fields = (
+        Field("hour", default=0), Field("minute", default=0), Field("astroOffset", default=0),
+        # NOT_EARLIER_THAN_TIME, NOT_LATER_THAN_TIME
+        Field("astroLimitationType", default="NO_LIMITATION"),
+        # ASTRO_SUNRISE_SWITCH_TIME, ASTRO_SUNSET_SWITCH_TIME
+        Field("switchTimeMode", default="REGULAR_SWITCH_TIME"),
+        Field("dimLevel", default=1.0), Field("rampTime", default=0),
+    )
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self._init_fields()
+        self.weekdays = []
 
     def from_json(self, js):
         super().from_json(js)
-        self.weekdays = js["weekdays"]
-        self.hour = js["hour"]
-        self.minute = js["minute"]
-        self.astroOffset = js["astroOffset"]
-        self.astroLimitationType = js["astroLimitationType"]
-        self.switchTimeMode = js["switchTimeMode"]
-        self.dimLevel = js["dimLevel"]
-        self.rampTime = js["rampTime"]
+        self._parse_fields(js)
+        self.weekdays = js.get("weekdays", [])
 
 
 class TimeProfile(HomeMaticIPObject.HomeMaticIPObject):
-    id = None
-    homeId = None
-    groupId = None
-    type = None
-    periods = []
+    __slots__ = ("id", "homeId", "groupId", "type", "periods")
+
+    def __init__(self, connection):
+        super().__init__(connection)
+        self.id = None
+        self.homeId = None
+        self.groupId = None
+        self.type = None
+        self.periods = []
 
     def get_details(self):
         data = {"groupId": self.groupId}
-        js = self._restCall("group/switching/profile/getProfile", body=json.dumps(data))
-        self.homeId = js["homeId"]
-        self.type = js["type"]
-        self.id = js["id"]
+        js = self._restCall("group/switching/profile/getProfile", body=json_codec.dumps(data))
+        self.homeId = js.get("homeId")
+        self.type = js.get("type")
+        self.id = js.get("id")
         self.periods = []
-        for p in js["periods"]:
+        for p in js.get("periods", ()):
             period = TimeProfilePeriod(self._connection)
             period.from_json(p)
             self.periods.append(period)
 
 
 class SwitchingProfileGroup(Group):
-    on = None
-    dimLevel = None
-    profileId = None  # Not sure why it is there. You can't use it to query something.
-    profileMode = None
+    __slots__ = ("on", "dimLevel",
+                 "profileId",  # Not sure why it is there. You can't use it to query something.
+                 "profileMode")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.on = js["on"]
-        self.dimLevel = js["dimLevel"]
-        self.profileId = js["profileId"]
-        self.profileMode = js["profileMode"]
+    _fields = ("on", "dimLevel", "profileId", "profileMode")
 
     def __str__(self):
         return "{}: on({}) dimLevel({}) profileMode({})".format(
@@ -624,7 +604,7 @@ class SwitchingProfileGroup(Group):
         for d in self.devices:
             channels.append[{"channelIndex": 1, "deviceId": d.id}]
         data = {"groupId": self.id, "channels": channels}
-        return self._restCall("group/switching/profile/setGroupChannels", body=json.dumps(data))
+        return self._restCall("group/switching/profile/setGroupChannels", body=json_codec.dumps(data))
 
     def set_profile_mode(self, devices, automatic=True):
         channels = []
@@ -632,41 +612,27 @@ class SwitchingProfileGroup(Group):
             channels.append[{"channelIndex": 1, "deviceId": d.id}]
         data = {"groupId": self.id, "channels": channels,
                 "profileMode": "AUTOMATIC" if automatic else "MANUAL"}
-        return self._restCall("group/switching/profile/setProfileMode", body=json.dumps(data))
+        return self._restCall("group/switching/profile/setProfileMode", body=json_codec.dumps(data))
 
     def create(self, label):
         data = {"label": label}
         result = self._restCall(
-            "group/switching/profile/createSwitchingProfileGroup", body=json.dumps(data))
+            "group/switching/profile/createSwitchingProfileGroup", body=json_codec.dumps(data))
         if "groupId" in result:
             self.id = result["groupId"]
         return result
 
 
 class OverHeatProtectionRule(Group):
-    temperatureLowerThreshold = None
-    temperatureUpperThreshold = None
-    targetShutterLevel = None
-    targetSlatsLevel = None
-    startHour = None
-    startMinute = None
-    startSunrise = None
-    endHour = None
-    endMinute = None
-    endSunset = None
+    __slots__ = ("temperatureLowerThreshold", "temperatureUpperThreshold", "targetShutterLevel",
+                 "targetSlatsLevel", "startHour", "startMinute", "startSunrise", "endHour",
+                 "endMinute", "endSunset")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.temperatureLowerThreshold = js["temperatureLowerThreshold"]
-        self.temperatureUpperThreshold = js["temperatureUpperThreshold"]
-        self.targetShutterLevel = js["targetShutterLevel"]
-        self.targetSlatsLevel = js["targetSlatsLevel"]
-        self.startHour = js["startHour"]
-        self.startMinute = js["startMinute"]
-        self.startSunrise = js["startSunrise"]
-        self.endHour = js["endHour"]
-        self.endMinute = js["endMinute"]
-        self.endSunset = js["endSunset"]
+    _fields = (
+        "temperatureLowerThreshold", "temperatureUpperThreshold", "targetShutterLevel",
+        "targetSlatsLevel", "startHour", "startMinute", "startSunrise", "endHour", "endMinute",
+        "endSunset",
+    )
 
     def __str__(self):
         return "{}: tempLower({}) tempUpper({}) targetShutterLevel({}) targetSlatsLevel({})".format(
@@ -676,11 +642,9 @@ class OverHeatProtectionRule(Group):
 
 
 class SmokeAlarmDetectionRule(Group):
-    smokeDetectorAlarmType = None
+    __slots__ = ("smokeDetectorAlarmType",)
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.smokeDetectorAlarmType = js["smokeDetectorAlarmType"]
+    _fields = ("smokeDetectorAlarmType",)
 
     def __str__(self):
         return "{}: smokeDetectorAlarmType({})".format(
@@ -689,13 +653,9 @@ class SmokeAlarmDetectionRule(Group):
 
 
 class ShutterWindProtectionRule(Group):
-    windSpeedThreshold = None
-    targetShutterLevel = None
+    __slots__ = ("windSpeedThreshold", "targetShutterLevel")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.windSpeedThreshold = js["windSpeedThreshold"]
-        self.targetShutterLevel = js["targetShutterLevel"]
+    _fields = ("windSpeedThreshold", "targetShutterLevel")
 
     def __str__(self):
         return "{}: windSpeedThreshold({}) targetShutterLevel({})".format(
@@ -704,13 +664,9 @@ class ShutterWindProtectionRule(Group):
 
 
 class LockOutProtectionRule(Group):
-    triggered = None
-    windowState = None
+    __slots__ = ("triggered", "windowState")
 
-    def from_json(self, js, devices):
-        super().from_json(js, devices)
-        self.triggered = js["triggered"]
-        self.windowState = js["windowState"]
+    _fields = ("triggered", "windowState")
 
     def __str__(self):
         return "{}: triggered({}) windowState({})".format(
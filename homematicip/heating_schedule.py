@@ -0,0 +1,75 @@
+from bisect import bisect_right
+from datetime import timedelta
+
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
+
+def time_to_minutes(time):
+    """ converts a "HH:MM" string into the minutes of the day """
+    s = time.split(":")
+    return int(s[0]) * 60 + int(s[1])
+
+
+class HeatingSchedule:
+    """ the set point temperatures of a heating profile compiled into the
+    minutes of the week at which the temperature changes. A lookup is a
+    binary search over these breakpoints """
+
+    def __init__(self, breakpoints, values):
+        """
+        :param breakpoints the sorted minutes of the week (0 is monday 00:00)
+            at which the temperature changes. Must start with 0
+        :param values the temperature which starts at the breakpoint
+        """
+        self.breakpoints = breakpoints
+        self.values = values
+
+    @classmethod
+    def from_profile_days(cls, profileDays):
+        """ compiles the days of a HeatingCoolingProfile
+        :param profileDays a dict weekday (0 = monday) -> HeatingCoolingProfileDay
+        """
+        breakpoints = []
+        values = []
+
+        def add(minute, value):
+            if breakpoints and breakpoints[-1] == minute:
+                breakpoints.pop()
+                values.pop()
+            if values and values[-1] == value:
+                return
+            breakpoints.append(minute)
+            values.append(value)
+
+        for weekday in range(7):
+            day = profileDays[weekday]
+            start = weekday * MINUTES_PER_DAY
+            add(start, day.baseValue)
+            for period in sorted(day.periods, key=lambda p: time_to_minutes(p.starttime)):
+                add(start + time_to_minutes(period.starttime), period.value)
+                end = time_to_minutes(period.endtime)
+                if end < MINUTES_PER_DAY:
+                    add(start + end, day.baseValue)
+        return cls(breakpoints, values)
+
+    def get_temperature(self, time):
+        """ returns the set point temperature at the time
+        :param time a datetime in the time zone of the home
+        """
+        minute = time.weekday() * MINUTES_PER_DAY + time.hour * 60 + time.minute
+        return self.values[bisect_right(self.breakpoints, minute) - 1]
+
+    def evaluate(self, start, end, step=timedelta(minutes=1)):
+        """ returns the set point temperatures of a time range
+        :param start the first datetime
+        :param end the datetime after the last one
+        :param step the time between the results
+        :return a list of (datetime, temperature)
+        """
+        result = []
+        time = start
+        while time < end:
+            result.append((time, self.get_temperature(time)))
+            time += step
+        return result
@@ -1,14 +1,22 @@
 import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
 
+from homematicip.base import json_codec
+from homematicip.base.columnar import convert_columns, get_columns
 from homematicip.base.constants import DEVICE
+from homematicip.base.fields import Field, LazyDatetime
+from homematicip.base.helpers import get_functional_channel_index
+from homematicip.base.json_stream import is_streaming_available, iter_current_state
 from homematicip.class_maps import TYPE_CLASS_MAP, TYPE_GROUP_MAP, \
     TYPE_SECURITY_EVENT_MAP
 from homematicip.connection import Connection
 from homematicip.group import *
 from homematicip.securityEvent import *
 from homematicip.EventHook import *
+from homematicip.subscriptions import Subscription, SubscriptionIndex
 
-from datetime import datetime
 import websocket
 import logging
 
@@ -24,6 +32,9 @@ EVENT_CLIENT_ADDED = "CLIENT_ADDED"
 EVENT_HOME_CHANGED = "HOME_CHANGED"
 EVENT_GROUP_CHANGED = "GROUP_CHANGED"
 
+# returned by an event handler if the event didn't change anything
+UNCHANGED = object()
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -37,15 +48,11 @@ class Weather(HomeMaticIPObject.HomeMaticIPObject):
     windSpeed = 0.0
     windDirection = 0
 
+    _fields = ("temperature", "weatherCondition", "weatherDayTime", "minTemperature",
+               "maxTemperature", "humidity", "windSpeed", "windDirection")
+
     def from_json(self, js):
-        self.temperature = js["temperature"]
-        self.weatherCondition = js["weatherCondition"]
-        self.weatherDayTime = js["weatherDayTime"]
-        self.minTemperature = js["minTemperature"]
-        self.maxTemperature = js["maxTemperature"]
-        self.humidity = js["humidity"]
-        self.windSpeed = js["windSpeed"]
-        self.windDirection = js["windDirection"]
+        self._parse_fields(js)
 
 
 class Location(HomeMaticIPObject.HomeMaticIPObject):
@@ -53,10 +60,10 @@ class Location(HomeMaticIPObject.HomeMaticIPObject):
     latitude = "51.509865"
     longitude = "-0.118092"
 
+    _fields = ("city", "latitude", "longitude")
+
     def from_json(self, js):
-        self.city = js["city"]
-        self.latitude = js["latitude"]
-        self.longitude = js["longitude"]
+        self._parse_fields(js)
 
     def __str__(self):
         return "city({}) latitude({}) longitude({})".format(self.city,
@@ -69,10 +76,10 @@ class Client(HomeMaticIPObject.HomeMaticIPObject):
     label = None
     homeId = None
 
+    _fields = ("id", "label", "homeId")
+
     def from_json(self, js):
-        self.id = js["id"]
-        self.label = js["label"]
-        self.homeId = js["homeId"]
+        self._parse_fields(js)
 
     def __str__(self):
         return "label({})".format(self.label)
@@ -80,21 +87,20 @@ class Client(HomeMaticIPObject.HomeMaticIPObject):
 
 class OAuthOTK(HomeMaticIPObject.HomeMaticIPObject):
     authToken = None
-    expirationTimestamp = None
+    expirationTimestampMillis = None
+    expirationTimestamp = LazyDatetime("expirationTimestampMillis")
+
+    _fields = ("authToken", Field("expirationTimestampMillis", "expirationTimestamp"))
 
     def from_json(self, js):
-        self.authToken = js["authToken"]
-        time = js["expirationTimestamp"]
-        if time > 0:
-            self.expirationTimestamp = datetime.fromtimestamp(time / 1000.0)
-        else:
-            self.expirationTimestamp = None
+        self._parse_fields(js)
 
 
 class Home(HomeMaticIPObject.HomeMaticIPObject):
     """this class represents the 'Home' of the homematic ip"""
     devices = None
     groups = None
+    clients = None
     weather = None
     location = None
     connected = None
@@ -114,16 +120,57 @@ class Home(HomeMaticIPObject.HomeMaticIPObject):
 
     __webSocket = None
     __webSocketThread = None
-    onEvent = EventHook()
+    onEvent = None
+    # if True the handlers are also called for push events which don't
+    # change the object
+    fire_unchanged_events = False
 
     _typeClassMap = TYPE_CLASS_MAP
     _typeGroupMap = TYPE_GROUP_MAP
     _typeSecurityEventMap = TYPE_SECURITY_EVENT_MAP
 
+    _fields = ("connected", "currentAPVersion", "availableAPVersion", "timeZoneId", "pinAssigned",
+               "dutyCycle", "updateState", "powerMeterUnitPrice", "powerMeterCurrency",
+               "deviceUpdateStrategy", "lastReadyForUpdateTimestamp", "apExchangeClientId",
+               "apExchangeState", "id")
+
     def __init__(self, connection=None):
         if connection is None:
             connection = Connection()
         super().__init__(connection)
+        # id -> object maps backing the search_*_by_id methods. They are kept
+        # in sync with the devices/groups/clients lists.
+        self._deviceMap = {}
+        self._groupMap = {}
+        self._clientMap = {}
+
+        self.onEvent = EventHook()
+        self._subscriptions = SubscriptionIndex()
+        # optional EventDispatcher which runs the event handlers
+        self._eventDispatcher = None
+        # optional EventCoalescer which folds successive change events
+        self._eventCoalescer = None
+        # held while the objects are changed. The coalescer delivers its
+        # events and update_current_state runs in other threads than the
+        # websocket
+        self._eventLock = threading.RLock()
+        # the (task, key) tuples passed to _dispatch while the objects are
+        # changed. See _changing_objects
+        self._deferredTasks = None
+        # pushEventType -> f(event) which applies the event to the home
+        self._eventHandlers = {
+            EVENT_GROUP_CHANGED: self._ws_on_group_changed,
+            EVENT_GROUP_ADDED: self._ws_on_group_added,
+            EVENT_GROUP_REMOVED: self._ws_on_group_removed,
+            EVENT_HOME_CHANGED: self._ws_on_home_changed,
+            EVENT_CLIENT_ADDED: self._ws_on_client_added,
+            EVENT_CLIENT_CHANGED: self._ws_on_client_changed,
+            EVENT_CLIENT_REMOVED: self._ws_on_client_removed,
+            EVENT_DEVICE_ADDED: self._ws_on_device_added,
+            EVENT_DEVICE_CHANGED: self._ws_on_device_changed,
+            EVENT_DEVICE_REMOVED: self._ws_on_device_removed,
+            EVENT_SECURITY_JOURNAL_CHANGED: self._ws_on_security_journal_changed
+        }
 
     def init(self, access_point_id, lookup=True):
         self._connection.init(access_point_id, lookup)
@@ -133,49 +180,306 @@ class Home(HomeMaticIPObject.HomeMaticIPObject):
 
     def from_json(self, js_home):
         super().from_json(js_home)
-        self.weather = Weather(self._connection)
+        if self.weather is None:
+            self.weather = Weather(self._connection)
         self.weather.from_json(js_home["weather"])
-        self.location = Location(self._connection)
+        if self.location is None:
+            self.location = Location(self._connection)
         self.location.from_json(js_home["location"])
 
-        self.connected = js_home["connected"]
-        self.currentAPVersion = js_home["currentAPVersion"]
-        self.availableAPVersion = js_home["availableAPVersion"]
-        self.timeZoneId = js_home["timeZoneId"]
-        self.pinAssigned = js_home["pinAssigned"]
-        self.dutyCycle = js_home["dutyCycle"]
-        self.updateState = js_home["updateState"]
-        self.powerMeterUnitPrice = js_home["powerMeterUnitPrice"]
-        self.powerMeterCurrency = js_home["powerMeterCurrency"]
-        self.deviceUpdateStrategy = js_home["deviceUpdateStrategy"]
-        self.lastReadyForUpdateTimestamp = js_home[
-            "lastReadyForUpdateTimestamp"]
-        self.apExchangeClientId = js_home["apExchangeClientId"]
-        self.apExchangeState = js_home["apExchangeState"]
-        self.id = js_home["id"]
+        self._parse_fields(js_home)
+        if self._connection.rate_limiter is not None:
+            self._connection.rate_limiter.update_duty_cycle(self.dutyCycle)
 
     def download_configuration(self):
         return self._restCall('home/getCurrentState',
-                              json.dumps(self._connection.clientCharacteristics))
+                              json_codec.dumps(self._connection.clientCharacteristics))
 
     def get_current_state(self):
         json_state = self.download_configuration()
+        return self._update_home(json_state)
 
+    def _update_home(self, json_state):
+        """ rebuilds the home, its devices, clients and groups from a
+        home/getCurrentState result
+        :param json_state the result of home/getCurrentState
+        :return True if the state could be applied otherwise False
+        """
         if "errorCode" in json_state:
             LOGGER.error("Could not get the current configuration. Error: %s",
                          json_state["errorCode"])
             return False
 
-        js_home = json_state["home"]
+        with self._changing_objects():
+            self.from_json(json_state["home"])
+            self._fingerprint = None
 
-        self.from_json(js_home)
+            self._set_devices(self._get_devices(json_state))
+            self._set_clients(self._get_clients(json_state))
+            self._set_groups(self._get_groups(json_state))
 
-        self.devices = self._get_devices(json_state)
-        self.clients = self._get_clients(json_state)
-        self.groups = self._get_groups(json_state)
+        return True
 
+    def get_current_state_streaming(self):
+        """ like get_current_state but the objects are created while the
+        response is downloaded and the json of every object is released
+        right after it was parsed. This lowers the peak memory for large
+        homes. Falls back to get_current_state if ijson isn't installed
+        :return True if the state could be applied otherwise False
+        """
+        if not is_streaming_available():
+            LOGGER.debug("ijson is not installed, falling back to get_current_state")
+            return self.get_current_state()
+        response = self._connection._restCallStream(
+            'home/getCurrentState', json_codec.dumps(self._connection.clientCharacteristics))
+        if response is None:
+            LOGGER.error("Could not get the current configuration. Error: TIMEOUT")
+            return False
+        try:
+            return self._update_home_streaming(iter_current_state(response.raw))
+        finally:
+            response.close()
+
+    def _update_home_streaming(self, items):
+        """ rebuilds the home from the parts of a home/getCurrentState result.
+        The new objects are created while the items are read, the home is
+        only changed after the last item
+        :param items an iterable of (section, json) tuples, see
+            homematicip.base.json_stream.iter_current_state
+        :return True if the state could be applied otherwise False
+        """
+        js_home = None
+        devices = []
+        deviceMap = {}
+        clients = []
+        groups = []
+        # groups need their devices. They are kept until all devices
+        # are parsed if the devices come after them
+        pendingGroups = []
+        metaGroups = []
+        devicesParsed = False
+        lastSection = None
+        for section, js in items:
+            if lastSection == "devices" and section != "devices":
+                devicesParsed = True
+            lastSection = section
+            if section == "errorCode":
+                LOGGER.error("Could not get the current configuration. Error: %s", js)
+                return False
+            elif section == "home":
+                js_home = js
+            elif section == "devices":
+                d = self._parse_device(js)
+                devices.append(d)
+                deviceMap[d.id] = d
+            elif section == "clients":
+                clients.append(self._parse_client(js))
+            elif js["type"] == "META":
+                metaGroups.append(js)
+            elif devicesParsed:
+                groups.append(self._parse_group(js, devices=deviceMap))
+            else:
+                pendingGroups.append(js)
+
+        for js in pendingGroups:
+            groups.append(self._parse_group(js, devices=deviceMap))
+        groupMap = {g.id: g for g in groups}
+        for js in metaGroups:
+            g = self._parse_group(js, groupMap, deviceMap)
+            groups.append(g)
+            groupMap[g.id] = g
+
+        with self._changing_objects():
+            if js_home is not None:
+                self.from_json(js_home)
+                self._fingerprint = None
+            self._set_devices(devices)
+            self._set_clients(clients)
+            self._set_groups(groups)
         return True
 
+    def update_current_state(self):
+        """ downloads the current state and applies it to the existing
+        objects. In contrast to get_current_state the devices, groups and
+        clients which are still there are updated in place, so their
+        on_update handlers are kept. The update event is only fired for
+        objects which have really changed.
+        :return a changeset dict or None if the state couldn't be downloaded.
+            see _update_home_incremental for the layout
+        """
+        json_state = self.download_configuration()
+        return self._update_home_incremental(json_state)
+
+    def _update_home_incremental(self, json_state):
+        """ applies a home/getCurrentState result to the existing objects
+        :param json_state the result of home/getCurrentState
+        :return None on errors otherwise a dict like
+            {"home": bool, "devices": {"added": [...], "updated": [...],
+            "removed": [...]}, "groups": {...}, "clients": {...}}
+            a device or group which changed its type is reported as removed
+            and added
+        """
+        if "errorCode" in json_state:
+            LOGGER.error("Could not get the current configuration. Error: %s",
+                         json_state["errorCode"])
+            return None
+
+        with self._changing_objects():
+            if self.devices is None:
+                # nothing to diff against
+                self._set_devices([])
+                self._set_groups([])
+                self._set_clients([])
+
+            js_home = json_state["home"]
+            state = self._snapshot_home()
+            self.from_json(js_home)
+            self._fingerprint = None
+            homeChanges = self._diff_home(state)
+            changes = {"home": bool(homeChanges)}
+            if homeChanges:
+                self._dispatch(partial(self.fire_update_event, js_home, changes=homeChanges),
+                               ("update", self.id))
+
+            changes["devices"] = self._merge_objects(
+                json_state["devices"].values(), self._deviceMap,
+                lambda d, js: d.deviceType != js["type"],
+                self._parse_device, self._update_device,
+                self._add_device, self._remove_device)
+
+            changes["clients"] = self._merge_objects(
+                json_state["clients"].values(), self._clientMap,
+                lambda c, js: False,
+                self._parse_client, lambda c, js: c.from_json(js),
+                self._add_client, self._remove_client)
+
+            groups = []
+            metaGroups = []
+            for group in json_state["groups"].values():
+                if group["type"] == "META":
+                    metaGroups.append(group)
+                else:
+                    groups.append(group)
+
+            changes["groups"] = self._merge_objects(
+                groups, self._groupMap,
+                lambda g, js: g.groupType != js["type"] or type(g) is MetaGroup,
+                self._parse_group, self._update_group,
+                self._add_group, self._remove_group,
+                keep=lambda g: type(g) is MetaGroup)
+
+            metaChanges = self._merge_objects(
+                metaGroups, self._groupMap,
+                lambda g, js: type(g) is not MetaGroup,
+                self._parse_group, self._update_group,
+                self._add_group, self._remove_group,
+                keep=lambda g: type(g) is not MetaGroup)
+            for k, v in metaChanges.items():
+                changes["groups"][k].extend(v)
+
+        return changes
+
+    def _snapshot_home(self):
+        return (self._snapshot(),
+                self.weather._snapshot() if self.weather else None,
+                self.location._snapshot() if self.location else None)
+
+    def _diff_home(self, state):
+        """ returns the changes since _snapshot_home. Changes of the weather
+        and the location are reported as e.g. "weather.temperature"
+        """
+        home, weather, location = state
+        changes = self._diff(home)
+        for name, snapshot in (("weather", weather), ("location", location)):
+            obj = getattr(self, name)
+            if obj is None or snapshot is None:
+                continue
+            for k, v in obj._diff(snapshot).items():
+                changes["{}.{}".format(name, k)] = v
+        return changes
+
+    def _merge_objects(self, items, objMap, is_replaced, create, update, add,
+                       remove, keep=None):
+        """ merges json objects into the objects of an id map. Existing
+        objects are always updated (e.g. groups have to resolve exchanged
+        devices) but only reported and notified if their attributes changed
+        :param items the json objects
+        :param objMap the id -> object map of the existing objects
+        :param is_replaced f(obj, js) returns True if the existing object
+            can't be updated from the json and must be replaced
+        :param create f(js) creates a new object from the json
+        :param update f(obj, js) updates an existing object
+        :param add f(obj) registers a new object
+        :param remove f(obj) unregisters an object
+        :param keep f(obj) returns True for existing objects which are not
+            part of items and therefore must not be removed
+        :return a dict with the added, updated and removed objects
+        """
+        changes = {"added": [], "updated": [], "removed": []}
+        seen = set()
+        for js in items:
+            seen.add(js["id"])
+            obj = objMap.get(js["id"])
+            if obj is not None and is_replaced(obj, js):
+                remove(obj)
+                changes["removed"].append(obj)
+                obj = None
+            if obj is None:
+                obj = create(js)
+                add(obj)
+                changes["added"].append(obj)
+            else:
+                state = obj._snapshot()
+                update(obj, js)
+                obj._fingerprint = None
+                objChanges = obj._diff(state)
+                if objChanges:
+                    self._dispatch(partial(obj.fire_update_event, js, changes=objChanges),
+                                   ("update", obj.id))
+                    changes["updated"].append(obj)
+
+        for id, obj in list(objMap.items()):
+            if id not in seen and not (keep and keep(obj)):
+                remove(obj)
+                changes["removed"].append(obj)
+        return changes
+
+    def _set_devices(self, devices):
+        self.devices = devices
+        self._deviceMap = {d.id: d for d in devices}
+
+    def _add_device(self, device):
+        self.devices.append(device)
+        self._deviceMap[device.id] = device
+
+    def _remove_device(self, device):
+        self.devices.remove(device)
+        del self._deviceMap[device.id]
+
+    def _set_groups(self, groups):
+        self.groups = groups
+        self._groupMap = {g.id: g for g in groups}
+
+    def _add_group(self, group):
+        self.groups.append(group)
+        self._groupMap[group.id] = group
+
+    def _remove_group(self, group):
+        self.groups.remove(group)
+        del self._groupMap[group.id]
+
+    def _set_clients(self, clients):
+        self.clients = clients
+        self._clientMap = {c.id: c for c in clients}
+
+    def _add_client(self, client):
+        self.clients.append(client)
+        self._clientMap[client.id] = client
+
+    def _remove_client(self, client):
+        self.clients.remove(client)
+        del self._clientMap[client.id]
+
     def _parse_device(self, json_state):
         deviceType = json_state["type"]
         if deviceType in self._typeClassMap:
@@ -191,40 +495,56 @@ class Home(HomeMaticIPObject.HomeMaticIPObject):
     def _get_devices(self, json_state):
         return [self._parse_device(device) for device in json_state["devices"].values()]
 
-    def _get_clients(self, json_state):
-        ret = []
-        for client in json_state["clients"].values():
-            c = Client(self._connection)
-            c.from_json(client)
-            ret.append(c)
-        return ret
+    def _parse_client(self, json_state):
+        c = Client(self._connection)
+        c.from_json(json_state)
+        return c
 
-    def _parse_group(self, json_state, groups=None):
+    def _get_clients(self, json_state):
+        return [self._parse_client(client) for client in json_state["clients"].values()]
+
+    def _parse_group(self, json_state, groups=None, devices=None):
+        """ creates the group object for the given json
+        :param json_state the json representation of the group
+        :param groups a dict which maps the group ids to the groups which can
+            be referenced by a meta group. Defaults to the groups of the home
+        :param devices a dict which maps the device ids to the devices.
+            Defaults to the devices of the home
+        :return the group object
+        """
+        if devices is None:
+            devices = self._deviceMap
         groupType = json_state["type"]
         if groupType in self._typeGroupMap:
             g = self._typeGroupMap[groupType](self._connection)
-            g.from_json(json_state, self.devices)
+            g.from_json(json_state, devices)
         elif groupType == "META":
             g = MetaGroup(self._connection)
-            g.from_json(json_state, self.devices, groups if groups else self.groups)
+            g.from_json(json_state, devices,
+                        groups if groups is not None else self._groupMap)
         else:
             g = Group(self._connection)
-            g.from_json(json_state, self.devices)
+            g.from_json(json_state, devices)
             LOGGER.warning("There is no class for %s yet", groupType)
         return g
 
     def _get_groups(self, json_state):
         ret = []
+        groupMap = {}
         metaGroups = []
         for group in json_state["groups"].values():
             groupType = group["type"]
             if groupType == "META":
                 metaGroups.append(group)
             else:
-                ret.append(self._parse_group(group))
+                g = self._parse_group(group)
+                ret.append(g)
+                groupMap[g.id] = g
 
         for mg in metaGroups:
-            ret.append(self._parse_group(mg, ret))
+            g = self._parse_group(mg, groupMap)
+            ret.append(g)
+            groupMap[g.id] = g
         return ret
 
     def search_device_by_id(self, deviceID):
@@ -232,51 +552,65 @@ class Home(HomeMaticIPObject.HomeMaticIPObject):
         :param deviceID the device to search for
         :return the Device object or None if it couldn't find a device
         """
-        for d in self.devices:
-            if d.id == deviceID:
-                return d
-        return None
+        return self._deviceMap.get(deviceID)
 
     def search_group_by_id(self, groupID):
         """ searches a group by given id
         :param groupID the device to search for
         :return the group object or None if it couldn't find a group
         """
-        for g in self.groups:
-            if g.id == groupID:
-                return g
-        return None
+        return self._groupMap.get(groupID)
 
     def search_client_by_id(self, clientID):
         """ searches a client by given id
         :param clientID the device to search for
         :return the client object or None if it couldn't find a client
         """
-        for c in self.clients:
-            if c.id == clientID:
-                return c
-        return None
+        return self._clientMap.get(clientID)
+
+    def export_columns(self, attributes=None, format=None, devices=True, groups=True):
+        """ exports the values of the devices and groups as columns, e.g.
+        {"HeatingThermostat": {"id": [...], "valvePosition": [...]}}. The
+        push events are held back while the values are read, so all columns
+        have the same state
+        :param attributes the attributes to export. Defaults to the
+            measurements in homematicip.base.columnar.MEASUREMENT_ATTRIBUTES.
+            The id, label and lastStatusUpdateMillis are always exported
+        :param format None for lists, "numpy" for numpy arrays or "arrow"
+            for a pyarrow Table per class
+        :param devices export the devices
+        :param groups export the groups
+        :return an OrderedDict class name -> columns
+        """
+        objects = []
+        with self._eventLock:
+            if devices:
+                objects.extend(self.devices or ())
+            if groups:
+                objects.extend(self.groups or ())
+            columns = get_columns(objects, attributes)
+        return convert_columns(columns, format)
 
     def set_security_zones_activation(self, internal=True, external=True):
         data = {"zonesActivation": {"EXTERNAL": external, "INTERNAL": internal}}
-        return self._restCall("home/security/setZonesActivation", json.dumps(data))
+        return self._restCall("home/security/setZonesActivation", json_codec.dumps(data))
 
     def set_location(self, city, latitude, longitude):
         data = {"city": city, "latitude": latitude, "longitude": longitude}
-        return self._restCall("home/setLocation", json.dumps(data))
+        return self._restCall("home/setLocation", json_codec.dumps(data))
 
     def set_intrusion_alert_through_smoke_detectors(self, activate=True):
         data = {"intrusionAlertThroughSmokeDetectors": activate}
         return self._restCall("home/security/setIntrusionAlertThroughSmokeDetectors",
-                              json.dumps(data))
+                              json_codec.dumps(data))
 
     def activate_absence_with_period(self, endtime):
         data = {"endTime": endtime.strftime("%Y_%m_%d %H:%M")}
-        return self._restCall("home/heating/activateAbsenceWithPeriod", json.dumps(data))
+        return self._restCall("home/heating/activateAbsenceWithPeriod", json_codec.dumps(data))
 
     def activate_absence_with_duration(self, duration):
         data = {"duration": duration}
-        return self._restCall("home/heating/activateAbsenceWithDuration", json.dumps(data))
+        return self._restCall("home/heating/activateAbsenceWithDuration", json_codec.dumps(data))
 
     def deactivate_absence(self):
         return self._restCall("home/heating/deactivateAbsence")
@@ -285,7 +619,7 @@ class Home(HomeMaticIPObject.HomeMaticIPObject):
         data = {"endtime": endtime.strftime("%Y_%m_%d %H:%M"),
                 "temperature": temperature}
         return self._restCall("home/heating/activateVacation",
-                              json.dumps(data))
+                              json_codec.dumps(data))
 
     def deactivate_vacation(self):
         return self._restCall("home/heating/deactivateVacation")
@@ -296,7 +630,7 @@ class Home(HomeMaticIPObject.HomeMaticIPObject):
         data = {"pin": newPin}
         if oldPin:
             self._connection.headers["PIN"] = oldPin
-        result = self._restCall('home/setPin', body=json.dumps(data))
+        result = self._restCall('home/setPin', body=json_codec.dumps(data))
         if oldPin:
             del self._connection.headers["PIN"]
         return result
@@ -304,7 +638,7 @@ class Home(HomeMaticIPObject.HomeMaticIPObject):
     def set_zone_activation_delay(self, delay):
         data = {"zoneActivationDelay": delay}
         return self._restCall("home/security/setZoneActivationDelay",
-                              body=json.dumps(data))
+                              body=json_codec.dumps(data))
 
     def get_security_journal(self):
         journal = self._restCall("home/security/getSecurityJournal")
@@ -328,7 +662,7 @@ class Home(HomeMaticIPObject.HomeMaticIPObject):
 
     def delete_group(self, group):
         data = {"groupId": group.id}
-        return self._restCall("home/group/deleteGroup", body=json.dumps(data))
+        return self._restCall("home/group/deleteGroup", body=json_codec.dumps(data))
 
     def get_OAuth_OTK(self):
         token = OAuthOTK(self._connection)
@@ -338,12 +672,12 @@ class Home(HomeMaticIPObject.HomeMaticIPObject):
     def set_timezone(self, timezone):
         """ sets the timezone for the AP. e.g. "Europe/Berlin" """
         data = {"timezoneId": timezone}
-        return self._restCall("home/setTimezone", body=json.dumps(data))
+        return self._restCall("home/setTimezone", body=json_codec.dumps(data))
 
     def set_powermeter_unit_price(self, price):
         data = {"powerMeterUnitPrice": price}
         return self._restCall("home/setPowerMeterUnitPrice",
-                              body=json.dumps(data))
+                              body=json_codec.dumps(data))
 
     def set_zones_device_assignment(self, internal_devices, external_devices):
         """ sets the devices for the security zones
@@ -356,7 +690,47 @@ class Home(HomeMaticIPObject.HomeMaticIPObject):
         data = {"zonesDeviceAssignment": {"INTERNAL": internal,
                                           "EXTERNAL": external}}
         return self._restCall("home/security/setZonesDeviceAssignment",
-                              body=json.dumps(data))
+                              body=json_codec.dumps(data))
+
+    def execute_batch(self, operations, max_workers=8):
+        """ executes many control calls concurrently
+        :param operations a list of callables without arguments e.g.
+            functools.partial(switch.set_switch_state, True)
+        :param max_workers the maximum number of concurrent calls. Should not
+            exceed the pool size of the connection
+        :return a list with a dict {"operation", "result", "error"} for every
+            operation in the same order. error is the raised exception or None
+        """
+        def run(operation):
+            try:
+                return {"operation": operation, "result": operation(), "error": None}
+            except Exception as err:
+                LOGGER.exception(err)
+                return {"operation": operation, "result": None, "error": err}
+
+        if not operations:
+            return []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(run, operations))
+
+    def prefetch_profile_details(self, refresh=False, max_workers=8):
+        """ downloads the details of the heating profiles of all groups
+        concurrently
+        :param refresh also downloads the details which are already cached
+        :param max_workers the maximum number of concurrent calls
+        :return the result list of execute_batch
+        """
+        return self.execute_batch(self._get_profile_detail_operations(refresh), max_workers)
+
+    def _get_profile_detail_operations(self, refresh):
+        operations = []
+        for group in self.groups or ():
+            if not isinstance(group, HeatingGroup):
+                continue
+            for profile in group.profiles or ():
+                if refresh or profile.profileDays is None:
+                    operations.append(partial(profile.get_details, refresh=refresh))
+        return operations
 
     def enable_events(self):
         websocket.enableTrace(True)
@@ -378,70 +752,288 @@ class Home(HomeMaticIPObject.HomeMaticIPObject):
     def _ws_on_error(self, ws, message):
         LOGGER.error("Websocket error: %s", message)
 
+    def register_event_handler(self, pushEventType, handler):
+        """ registers the handler which processes a push event type. An
+        existing handler for the type gets replaced
+        :param pushEventType the type e.g. "INCLUSION_REQUESTED"
+        :param handler f(event) gets the event json and returns the object
+            which was affected by the event (or None). Returning UNCHANGED
+            skips the subscriptions and onEvent
+        """
+        self._eventHandlers[pushEventType] = handler
+
+    def subscribe(self, handler, event_type=None, object_id=None,
+                  device_class=None, group_type=None):
+        """ adds a handler which gets called for every push event matching
+        all of the given filters. The handlers are indexed by their filters,
+        so the costs of an event only depend on the matching subscriptions
+        :param handler f(pushEventType, obj) obj is the affected device,
+            group, client or home
+        :param event_type only events of this type e.g. EVENT_DEVICE_CHANGED
+        :param object_id only events of the device/group/client with this id
+        :param device_class only events of objects which are instances of
+            this class e.g. HeatingThermostat
+        :param group_type only events of groups of this type e.g. "HEATING"
+        :return the Subscription which can be passed to unsubscribe
+        """
+        return self._subscriptions.add(Subscription(
+            handler, event_type, object_id, device_class, group_type))
+
+    def unsubscribe(self, subscription):
+        self._subscriptions.remove(subscription)
+
+    def subscribe_event_type(self, pushEventType, handler):
+        """ adds a handler which gets called for every event of the type
+        :param pushEventType the type e.g. EVENT_DEVICE_CHANGED
+        :param handler f(pushEventType, obj)
+        """
+        self.subscribe(handler, event_type=pushEventType)
+
+    def unsubscribe_event_type(self, pushEventType, handler):
+        subscription = self._subscriptions.find(handler, pushEventType)
+        if subscription is None:
+            raise ValueError("handler is not subscribed to {}".format(pushEventType))
+        self.unsubscribe(subscription)
+
+    def set_event_dispatcher(self, dispatcher):
+        """ lets the dispatcher run the handlers of the push events (onEvent,
+        subscriptions and on_update of the objects) instead of the websocket
+        thread. The objects itself are still updated in the websocket thread
+        :param dispatcher an EventDispatcher (AsyncEventDispatcher for the
+            AsyncHome) or None to call the handlers directly again
+        """
+        if self._eventDispatcher is not None:
+            self._eventDispatcher.stop()
+        self._eventDispatcher = dispatcher
+        if dispatcher is not None:
+            dispatcher.start()
+
+    @contextmanager
+    def _changing_objects(self):
+        """ holds the event lock while the objects are changed. The tasks
+        passed to _dispatch in the meantime are run after the lock is
+        released: a dispatcher with OVERFLOW_BLOCK waits for its workers and
+        a handler on a worker can wait for the lock, e.g. in export_columns
+        """
+        with self._eventLock:
+            outer = self._deferredTasks is None
+            if outer:
+                self._deferredTasks = []
+            try:
+                yield
+            finally:
+                if outer:
+                    tasks = self._deferredTasks
+                    self._deferredTasks = None
+        if outer:
+            for task, key in tasks:
+                self._run_task(task, key)
+
+    def _dispatch(self, task, key=None):
+        """ runs the task directly or passes it to the event dispatcher. The
+        errors of a task are logged, so a failing handler neither hides the
+        already applied event from the other handlers nor stops the events
+        which follow. Inside _changing_objects the task is only queued
+        :param key identifies tasks which can be coalesced by the dispatcher
+        """
+        if self._deferredTasks is not None:
+            self._deferredTasks.append((task, key))
+        else:
+            self._run_task(task, key)
+
+    def _run_task(self, task, key):
+        if self._eventDispatcher is None:
+            try:
+                task()
+            except Exception as err:
+                LOGGER.exception(err)
+        else:
+            self._eventDispatcher.submit(task, key)
+
+    def set_event_coalescer(self, coalescer):
+        """ lets the coalescer fold successive change events of the same
+        object. Only the latest state gets applied and passed to the handlers,
+        the number of folded events is in the "coalesced" value of the
+        onEvent entries
+        :param coalescer an EventCoalescer (AsyncEventCoalescer for the
+            AsyncHome) or None to process every event directly again
+        """
+        if self._eventCoalescer is not None:
+            self._eventCoalescer.stop()
+        self._eventCoalescer = coalescer
+        if coalescer is not None:
+            coalescer.start(self._process_events)
+
     def _ws_on_message(self, ws, message):
-        js = json.loads(message)
+        js = json_codec.loads(message)
         LOGGER.debug(js)
-        eventList = []
-        try:
-            for event in js["events"].values():
+        events = js["events"].values()
+        coalescer = self._eventCoalescer
+        if coalescer is not None:
+            events = [event for event in events if not coalescer.add(event)]
+            for event in events:
+                if event["pushEventType"] in (EVENT_DEVICE_REMOVED, EVENT_GROUP_REMOVED):
+                    coalescer.discard(event["id"])
+        self._process_events(events)
+
+    def _process_events(self, events):
+        with self._changing_objects():
+            eventList = []
+            for event in events:
                 pushEventType = event["pushEventType"]
                 LOGGER.debug(pushEventType)
-                obj = None
-                if pushEventType == EVENT_GROUP_CHANGED:
-                    data = event["group"]
-                    obj = self.search_group_by_id(data["id"])
-                    if type(obj) is MetaGroup:
-                        obj.from_json(data, self.devices, self.groups)
-                    else:
-                        obj.from_json(data, self.devices)
-                    obj.fire_update_event(data)
-                elif pushEventType == EVENT_HOME_CHANGED:
-                    data = event["home"]
-                    obj = self
-                    obj.from_json(data)
-                    obj.fire_update_event(data)
-                elif pushEventType == EVENT_CLIENT_ADDED:
-                    data = event["client"]
-                    obj = Client(self._connection)
-                    obj.from_json(data)
-                    self.clients.append(obj)
-                elif pushEventType == EVENT_CLIENT_CHANGED:
-                    data = event["client"]
-                    obj = self.search_client_by_id(data["id"])
-                    obj.from_json(data)
-                elif pushEventType == EVENT_CLIENT_REMOVED:
-                    obj = self.search_client_by_id(event["id"])
-                    self.clients.remove(obj)
-                elif pushEventType == EVENT_DEVICE_ADDED:
-                    data = event["device"]
-                    obj = self._parse_device(data)
-                    self.devices.append(obj)
-                elif pushEventType == EVENT_DEVICE_CHANGED:
-                    data = event["device"]
-                    obj = self.search_device_by_id(data["id"])
-                    if obj is None:  # no DEVICE_ADDED Event?
-                        obj = self._parse_device(data)
-                        self.devices.append(obj)
-                    else:
-                        obj.from_json(data)
-                    obj.fire_update_event(data)
-                elif pushEventType == EVENT_DEVICE_REMOVED:
-                    obj = self.search_device_by_id(event["id"])
-                    self.devices.remove(obj)
-                elif pushEventType == EVENT_GROUP_REMOVED:
-                    obj = self.search_group_by_id(event["id"])
-                    self.groups.remove(obj)
-                elif pushEventType == EVENT_GROUP_ADDED:
-                    group = event["group"]
-                    obj = self._parse_group(group, self.groups)
-                    self.groups.append(obj)
-                elif pushEventType == EVENT_SECURITY_JOURNAL_CHANGED:
-                    pass  # data is just none so nothing to do here
-
-                # TODO: implement INCLUSION_REQUESTED, NONE
-                else:
+                handler = self._eventHandlers.get(pushEventType)
+                if handler is None:
                     LOGGER.warning("Uknown EventType '%s' Data: %s", pushEventType, event)
-                eventList.append({"eventType": pushEventType, "data": obj})
-        except Exception as err:
-            LOGGER.exception(err)
-        self.onEvent.fire(eventList)
+                    obj = None
+                else:
+                    try:
+                        obj = handler(event)
+                    except Exception as err:
+                        LOGGER.exception(err)
+                        continue
+                    if obj is UNCHANGED:
+                        LOGGER.debug("skipping unchanged %s", pushEventType)
+                        continue
+
+                if self._subscriptions:
+                    self._dispatch(partial(self._subscriptions.fire, pushEventType, obj),
+                                   (pushEventType, getattr(obj, "id", None)))
+                if self.onEvent:
+                    entry = {"eventType": pushEventType, "data": obj}
+                    if "coalesced" in event:
+                        entry["coalesced"] = event["coalesced"]
+                    eventList.append(entry)
+            if eventList:
+                self._dispatch(partial(self.onEvent.fire, eventList))
+
+    def _get_fingerprint(self, data):
+        """ returns the fingerprint of the json of a push event. Only the
+        fingerprint is stored with the object, keeping the json would hold a
+        second copy of every changed device and group. None if
+        fire_unchanged_events is set
+        """
+        if self.fire_unchanged_events:
+            return None
+        return json_codec.fingerprint(data)
+
+    def _is_unchanged(self, obj, fingerprint):
+        """ checks if the push event has the same json as the last applied one """
+        return fingerprint is not None and obj._fingerprint == fingerprint
+
+    def _ws_on_group_changed(self, event):
+        data = event["group"]
+        obj = self.search_group_by_id(data["id"])
+        fingerprint = self._get_fingerprint(data)
+        if self._is_unchanged(obj, fingerprint):
+            return UNCHANGED
+        state = obj._snapshot()
+        self._update_group(obj, data)
+        obj._fingerprint = fingerprint
+        self._dispatch(partial(obj.fire_update_event, data, changes=obj._diff(state)),
+                       ("update", obj.id))
+        return obj
+
+    def _update_group(self, group, js):
+        """ updates the group. The cached profile details of a heating group
+        are dropped if the json of its profiles has changed """
+        if isinstance(group, HeatingGroup) and js.get("profiles") != group._profilesJson:
+            group.invalidate_profile_details()
+        if type(group) is MetaGroup:
+            group.from_json(js, self._deviceMap, self._groupMap)
+        else:
+            group.from_json(js, self._deviceMap)
+
+    def _ws_on_group_added(self, event):
+        obj = self._parse_group(event["group"])
+        self._add_group(obj)
+        return obj
+
+    def _ws_on_group_removed(self, event):
+        obj = self.search_group_by_id(event["id"])
+        self._remove_group(obj)
+        return obj
+
+    def _ws_on_home_changed(self, event):
+        data = event["home"]
+        fingerprint = self._get_fingerprint(data)
+        if self._is_unchanged(self, fingerprint):
+            return UNCHANGED
+        state = self._snapshot_home()
+        self.from_json(data)
+        self._fingerprint = fingerprint
+        self._dispatch(partial(self.fire_update_event, data, changes=self._diff_home(state)),
+                       ("update", self.id))
+        return self
+
+    def _ws_on_client_added(self, event):
+        obj = self._parse_client(event["client"])
+        self._add_client(obj)
+        return obj
+
+    def _ws_on_client_changed(self, event):
+        data = event["client"]
+        obj = self.search_client_by_id(data["id"])
+        fingerprint = self._get_fingerprint(data)
+        if self._is_unchanged(obj, fingerprint):
+            return UNCHANGED
+        obj.from_json(data)
+        obj._fingerprint = fingerprint
+        return obj
+
+    def _ws_on_client_removed(self, event):
+        obj = self.search_client_by_id(event["id"])
+        self._remove_client(obj)
+        return obj
+
+    def _ws_on_device_added(self, event):
+        obj = self._parse_device(event["device"])
+        self._add_device(obj)
+        return obj
+
+    def _ws_on_device_changed(self, event):
+        data = event["device"]
+        obj = self.search_device_by_id(data["id"])
+        fingerprint = self._get_fingerprint(data)
+        if obj is None:  # no DEVICE_ADDED Event?
+            obj = self._parse_device(data)
+            self._add_device(obj)
+            changes = {}
+        elif self._is_unchanged(obj, fingerprint):
+            return UNCHANGED
+        elif not obj._on_update:
+            # nobody gets the changes, so the device isn't compared
+            self._update_device(obj, data)
+            changes = None
+        else:
+            state = obj._snapshot()
+            self._update_device(obj, data)
+            changes = obj._diff(state)
+        obj._fingerprint = fingerprint
+        self._dispatch(partial(obj.fire_update_event, data, changes=changes),
+                       ("update", obj.id))
+        return obj
+
+    def _update_device(self, device, js):
+        """ updates the device and fires the update event of every channel
+        which has changed """
+        state = device._snapshot_channels()
+        device.from_json(js)
+        if not state:
+            return
+        index = None
+        for channel, changes in device._get_changed_channels(state):
+            if index is None:
+                index = get_functional_channel_index(js)
+            self._dispatch(partial(channel.fire_update_event,
+                                   index.byIndex.get(channel.index),
+                                   changes=changes),
+                           ("update", device.id, channel.index))
+
+    def _ws_on_device_removed(self, event):
+        obj = self.search_device_by_id(event["id"])
+        self._remove_device(obj)
+        return obj
+
+    def _ws_on_security_journal_changed(self, event):
+        return None  # data is just none so nothing to do here
@@ -1,23 +1,19 @@
 # coding=utf-8
 from homematicip import HomeMaticIPObject
-import json
-from datetime import datetime
+from homematicip.base.fields import Field, LazyDatetime
 
 
 class SecurityEvent(HomeMaticIPObject.HomeMaticIPObject):
     """this class represents a security event """
-    eventTimestamp = None
+    eventTimestampMillis = None
+    eventTimestamp = LazyDatetime("eventTimestampMillis")
     eventType = None
     label = None
-    def from_json(self, js):
-        self.label = js["label"]
-        time = js["eventTimestamp"]
-        if time > 0:
-            self.eventTimestamp = datetime.fromtimestamp(time / 1000.0)
-        else:
-            self.eventTimestamp = None
-        self.eventType = js["eventType"]
 
+    _fields = ("label", Field("eventTimestampMillis", "eventTimestamp"), "eventType")
+
+    def from_json(self, js):
+        self._parse_fields(js)
 
     def __str__(self):
         return "{} {} {}".format(self.eventType, self.label, self.eventTimestamp.strftime("%Y.%m.%d %H:%M:%S"))
@@ -27,10 +23,10 @@ class SecurityZoneEvent(SecurityEvent):
     external_zone = None
     internal_zone = None
 
-    def from_json(self, js):
-        super().from_json(js)
-        self.external_zone = js["securityZoneValues"]["EXTERNAL"]
-        self.internal_zone = js["securityZoneValues"]["INTERNAL"]
+    _fields = (
+        Field("external_zone", ("securityZoneValues", "EXTERNAL")),
+        Field("internal_zone", ("securityZoneValues", "INTERNAL")),
+    )
 
     def __str__(self):
         return "{}: external_zone({}) internal_zone({}) ".format(super().__str__(),
@@ -0,0 +1,121 @@
+import logging
+from inspect import isawaitable
+
+LOGGER = logging.getLogger(__name__)
+
+
+class Subscription:
+    """ a handler which is only interested in some of the push events.
+    Every filter which is not None must match """
+
+    def __init__(self, handler, event_type=None, object_id=None,
+                 device_class=None, group_type=None):
+        self.handler = handler
+        self.event_type = event_type
+        self.object_id = object_id
+        self.device_class = device_class
+        self.group_type = group_type
+
+    def matches(self, event_type, obj):
+        if self.event_type is not None and self.event_type != event_type:
+            return False
+        if self.object_id is not None and self.object_id != getattr(obj, "id", None):
+            return False
+        if self.device_class is not None and not isinstance(obj, self.device_class):
+            return False
+        if self.group_type is not None and self.group_type != getattr(obj, "groupType", None):
+            return False
+        return True
+
+
+class SubscriptionIndex:
+    """ holds the subscriptions indexed by their most selective filter
+    (object id, device class, group type, event type), so firing an event
+    only has to look at the subscriptions which can match it instead of
+    all of them """
+
+    def __init__(self):
+        self._byObjectId = {}
+        self._byDeviceClass = {}
+        self._byGroupType = {}
+        self._byEventType = {}
+        self._unfiltered = []
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def _bucket(self, subscription, create=False):
+        if subscription.object_id is not None:
+            index, key = self._byObjectId, subscription.object_id
+        elif subscription.device_class is not None:
+            index, key = self._byDeviceClass, subscription.device_class
+        elif subscription.group_type is not None:
+            index, key = self._byGroupType, subscription.group_type
+        elif subscription.event_type is not None:
+            index, key = self._byEventType, subscription.event_type
+        else:
+            return self._unfiltered, None, None
+        if create:
+            return index.setdefault(key, []), index, key
+        return index.get(key, []), index, key
+
+    def add(self, subscription):
+        bucket, _, _ = self._bucket(subscription, create=True)
+        bucket.append(subscription)
+        self._count += 1
+        return subscription
+
+    def remove(self, subscription):
+        bucket, index, key = self._bucket(subscription)
+        bucket.remove(subscription)
+        self._count -= 1
+        if index is not None and not bucket:
+            del index[key]
+
+    def find(self, handler, event_type):
+        """ returns the first subscription of the handler which only filters
+        by the event type or None """
+        for subscription in self._byEventType.get(event_type, []):
+            if subscription.handler == handler:
+                return subscription
+        return None
+
+    def fire(self, event_type, obj):
+        """ calls the handlers of all subscriptions matching the event. Errors
+        of the handlers are logged
+        :param event_type the pushEventType
+        :param obj the object which was affected by the event
+        :return a list with the awaitables returned by handlers which are
+            coroutine functions
+        """
+        pending = []
+        if not self._count:
+            return pending
+        candidates = []
+        if obj is not None:
+            objectId = getattr(obj, "id", None)
+            if objectId is not None and objectId in self._byObjectId:
+                candidates.extend(self._byObjectId[objectId])
+            if self._byDeviceClass:
+                for cls in type(obj).__mro__:
+                    if cls in self._byDeviceClass:
+                        candidates.extend(self._byDeviceClass[cls])
+            groupType = getattr(obj, "groupType", None)
+            if groupType is not None and groupType in self._byGroupType:
+                candidates.extend(self._byGroupType[groupType])
+        if event_type in self._byEventType:
+            candidates.extend(self._byEventType[event_type])
+        candidates.extend(self._unfiltered)
+
+        for subscription in candidates:
+            if subscription.matches(event_type, obj):
+                # a failing handler must not keep the others from the event
+                try:
+                    result = subscription.handler(event_type, obj)
+                except Exception as err:
+                    LOGGER.exception(err)
+                    continue
+                if isawaitable(result):
+                    pending.append(result)
+        return pending
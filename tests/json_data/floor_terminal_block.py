@@ -0,0 +1,47 @@
+from tests.json_data.plugable_switch_measuring import fake_home_id
+fake_floor_terminal_block_id = '3014F711A0000000000000C6'
+
+
+def _heating_channel(index):
+    return {
+        'label': 'Valve {}'.format(index),
+        'deviceId': fake_floor_terminal_block_id,
+        'index': index,
+        'groupIndex': index,
+        'functionalChannelType': 'FLOOR_TERMINAL_BLOCK_CHANNEL',
+        'groups': []
+    }
+
+
+floor_terminal_block = {
+    'id': fake_floor_terminal_block_id,
+    'homeId': fake_home_id,
+    'label': 'Floor heating',
+    'lastStatusUpdate': 1510829714852,
+    'type': 'FLOOR_TERMINAL_BLOCK_6',
+    'functionalChannels': dict(
+        [('0', {
+            'label': '',
+            'deviceId': fake_floor_terminal_block_id,
+            'index': 0,
+            'groupIndex': 0,
+            'functionalChannelType': 'DEVICE_GLOBAL_PUMP_CONTROL',
+            'groups': [],
+            'unreach': False,
+            'lowBat': None,
+            'routerModuleEnabled': False,
+            'routerModuleSupported': False,
+            'rssiDeviceValue': -70,
+            'rssiPeerValue': -68,
+            'globalPumpControl': True,
+            'heatingValveType': 'NORMALLY_CLOSE'
+        })] + [(str(i), _heating_channel(i)) for i in range(1, 7)]),
+    'oem': 'eQ-3',
+    'manufacturerCode': 1,
+    'firmwareVersion': '1.0.12',
+    'updateState': 'UP_TO_DATE',
+    'availableFirmwareVersion': '0.0.0',
+    'serializedGlobalTradeItemNumber': fake_floor_terminal_block_id,
+    'modelType': 'HMIP-FAL230-C6',
+    'modelId': 277
+}
@@ -0,0 +1,91 @@
+from copy import deepcopy
+
+from tests.json_data.plugable_switch_measuring import fake_home_id
+
+fake_heating_group_id = '00000000-0000-0000-0000-0000000000c1'
+
+heating_group = {
+    'id': fake_heating_group_id,
+    'homeId': fake_home_id,
+    'metaGroupId': None,
+    'label': 'Living room',
+    'lastStatusUpdate': 1510829714852,
+    'unreach': False,
+    'lowBat': False,
+    'type': 'HEATING',
+    'channels': [],
+    'windowOpenTemperature': 5.0,
+    'setPointTemperature': 21.0,
+    'windowState': 'CLOSED',
+    'maxTemperature': 30.0,
+    'minTemperature': 5.0,
+    'cooling': False,
+    'partyMode': False,
+    'controlMode': 'AUTOMATIC',
+    'activeProfile': 'PROFILE_1',
+    'boostMode': False,
+    'boostDuration': 15,
+    'actualTemperature': 20.5,
+    'humidity': 45,
+    'coolingAllowed': False,
+    'coolingIgnored': False,
+    'ecoAllowed': True,
+    'ecoIgnored': False,
+    'controllable': True,
+    'floorHeatingMode': 'FLOOR_HEATING_STANDARD',
+    'humidityLimitEnabled': True,
+    'humidityLimitValue': 60,
+    'externalClockEnabled': False,
+    'externalClockHeatingTemperature': 19.0,
+    'externalClockCoolingTemperature': 23.0,
+    'profiles': {
+        'PROFILE_2': {
+            'profileId': '00000000-0000-0000-0000-0000000000d2',
+            'groupId': fake_heating_group_id,
+            'index': 'PROFILE_2',
+            'name': 'Holiday',
+            'visible': True,
+            'enabled': True
+        },
+        'PROFILE_1': {
+            'profileId': '00000000-0000-0000-0000-0000000000d1',
+            'groupId': fake_heating_group_id,
+            'index': 'PROFILE_1',
+            'name': '',
+            'visible': True,
+            'enabled': True
+        }
+    }
+}
+
+# the answer of group/heating/getProfile for PROFILE_1
+_workday = {
+    'baseValue': 17.0,
+    'periods': [{'starttime': '06:00', 'endtime': '08:00', 'value': 21.0},
+                {'starttime': '17:00', 'endtime': '22:00', 'value': 21.0}]
+}
+_weekend = {
+    'baseValue': 17.0,
+    'periods': [{'starttime': '08:00', 'endtime': '23:00', 'value': 22.0}]
+}
+profile_details = {
+    'homeId': fake_home_id,
+    'type': 'MANUAL',
+    'profileDays': {
+        'MONDAY': _workday,
+        'TUESDAY': _workday,
+        'WEDNESDAY': _workday,
+        'THURSDAY': _workday,
+        'FRIDAY': _workday,
+        'SATURDAY': _weekend,
+        'SUNDAY': _weekend
+    }
+}
+
+
+def get_heating_group():
+    return deepcopy(heating_group)
+
+
+def get_profile_details():
+    return deepcopy(profile_details)
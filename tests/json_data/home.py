@@ -0,0 +1,149 @@
+from copy import deepcopy
+
+from tests.json_data.plugable_switch_measuring import plugable_switch_measuring, \
+    fake_device_id, fake_home_id
+
+fake_push_button_id = '3014F711A0000000000000AB'
+fake_client_id = '00000000-0000-0000-0000-000000000001'
+fake_switching_group_id = '00000000-0000-0000-0000-0000000000a1'
+fake_meta_group_id = '00000000-0000-0000-0000-0000000000b1'
+
+push_button = {
+    'id': fake_push_button_id,
+    'homeId': fake_home_id,
+    'label': 'Wall-mount Remote Control',
+    'lastStatusUpdate': 1510829714852,
+    'type': 'PUSH_BUTTON',
+    'functionalChannels': {
+        '0': {
+            'label': '',
+            'deviceId': fake_push_button_id,
+            'index': 0,
+            'groupIndex': 0,
+            'functionalChannelType': 'DEVICE_BASE',
+            'groups': [fake_meta_group_id],
+            'unreach': False,
+            'lowBat': False,
+            'routerModuleEnabled': False,
+            'routerModuleSupported': False,
+            'rssiDeviceValue': -63,
+            'rssiPeerValue': None
+        },
+        '1': {
+            'label': '',
+            'deviceId': fake_push_button_id,
+            'index': 1,
+            'groupIndex': 1,
+            'functionalChannelType': 'SINGLE_KEY_CHANNEL',
+            'groups': [fake_switching_group_id]
+        }
+    },
+    'oem': 'eQ-3',
+    'manufacturerCode': 1,
+    'firmwareVersion': '1.4.2',
+    'updateState': 'UP_TO_DATE',
+    'availableFirmwareVersion': '0.0.0',
+    'serializedGlobalTradeItemNumber': fake_push_button_id,
+    'modelType': 'HMIP-WRC2',
+    'modelId': 261
+}
+
+switching_group = {
+    'id': fake_switching_group_id,
+    'homeId': fake_home_id,
+    'metaGroupId': fake_meta_group_id,
+    'label': 'Living room',
+    'lastStatusUpdate': 1510829714852,
+    'unreach': False,
+    'lowBat': False,
+    'type': 'SWITCHING',
+    'channels': [{
+        'deviceId': fake_device_id,
+        'channelIndex': 1
+    }, {
+        'deviceId': fake_push_button_id,
+        'channelIndex': 1
+    }],
+    'on': False,
+    'processing': None,
+    'dimLevel': None,
+    'shutterLevel': None,
+    'slatsLevel': None
+}
+
+meta_group = {
+    'id': fake_meta_group_id,
+    'homeId': fake_home_id,
+    'metaGroupId': None,
+    'label': 'Living room',
+    'lastStatusUpdate': 1510829714852,
+    'unreach': False,
+    'lowBat': False,
+    'type': 'META',
+    'channels': [{
+        'deviceId': fake_device_id,
+        'channelIndex': 0
+    }, {
+        'deviceId': fake_push_button_id,
+        'channelIndex': 0
+    }],
+    'groups': [fake_switching_group_id]
+}
+
+client = {
+    'id': fake_client_id,
+    'label': 'homematicip-python',
+    'homeId': fake_home_id
+}
+
+home = {
+    'id': fake_home_id,
+    'weather': {
+        'temperature': 8.0,
+        'weatherCondition': 'CLOUDY',
+        'weatherDayTime': 'DAY',
+        'minTemperature': 6.0,
+        'maxTemperature': 10.0,
+        'humidity': 80,
+        'windSpeed': 12.0,
+        'windDirection': 270
+    },
+    'location': {
+        'city': 'Berlin',
+        'latitude': '52.520008',
+        'longitude': '13.404954'
+    },
+    'connected': True,
+    'currentAPVersion': '1.2.4',
+    'availableAPVersion': None,
+    'timeZoneId': 'Europe/Berlin',
+    'pinAssigned': False,
+    'dutyCycle': 8.0,
+    'updateState': 'UP_TO_DATE',
+    'powerMeterUnitPrice': 0.0,
+    'powerMeterCurrency': 'EUR',
+    'deviceUpdateStrategy': 'AUTOMATICALLY_IF_POSSIBLE',
+    'lastReadyForUpdateTimestamp': 1510829714852,
+    'apExchangeClientId': None,
+    'apExchangeState': 'NONE'
+}
+
+current_state = {
+    'home': home,
+    'devices': {
+        fake_device_id: plugable_switch_measuring,
+        fake_push_button_id: push_button
+    },
+    'groups': {
+        fake_meta_group_id: meta_group,
+        fake_switching_group_id: switching_group
+    },
+    'clients': {
+        fake_client_id: client
+    }
+}
+
+
+def get_current_state():
+    """ returns an independent copy of the current state so tests can modify it """
+    return deepcopy(current_state)
@@ -0,0 +1,69 @@
+import asyncio
+from functools import partial
+
+import pytest
+
+from homematicip.EventHook import EventHook
+from homematicip.async.event_dispatcher import AsyncEventDispatcher
+from homematicip.device import Device
+from homematicip.subscriptions import Subscription, SubscriptionIndex
+
+
+async def _wait_until_processed(dispatcher, count):
+    for i in range(100):
+        if dispatcher.processed >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("the dispatcher has processed {} tasks".format(dispatcher.processed))
+
+
+@pytest.mark.asyncio
+async def test_coroutine_handlers(event_loop):
+    calls = []
+
+    async def handler(*args, **kwargs):
+        await asyncio.sleep(0)
+        calls.append((args, kwargs))
+
+    hook = EventHook()
+    hook += handler
+    subscriptions = SubscriptionIndex()
+    subscriptions.add(Subscription(handler, event_type="DEVICE_CHANGED"))
+    device = Device(None)
+    device.on_update(handler, changes=True)
+
+    dispatcher = AsyncEventDispatcher(event_loop, workers=1)
+    dispatcher.start()
+    dispatcher.submit(partial(hook.fire, ["event"]))
+    dispatcher.submit(partial(subscriptions.fire, "DEVICE_CHANGED", device))
+    dispatcher.submit(partial(device.fire_update_event, {"id": "1"}, changes={}))
+    await _wait_until_processed(dispatcher, 3)
+    dispatcher.stop()
+
+    assert calls == [((["event"],), {}),
+                     (("DEVICE_CHANGED", device), {}),
+                     (({"id": "1"},), {"changes": {}})]
+
+
+@pytest.mark.asyncio
+async def test_failing_coroutine_handler(event_loop):
+    calls = []
+
+    async def failing(*args):
+        raise ValueError("failed")
+
+    async def handler(*args):
+        calls.append(args)
+
+    hook = EventHook()
+    hook += failing
+    hook += handler
+
+    dispatcher = AsyncEventDispatcher(event_loop, workers=1)
+    dispatcher.start()
+    dispatcher.submit(partial(hook.fire, 1))
+    dispatcher.submit(partial(hook.fire, 2))
+    await _wait_until_processed(dispatcher, 2)
+    dispatcher.stop()
+
+    assert calls == [(1,), (2,)]
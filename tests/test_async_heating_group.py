@@ -1,6 +1,8 @@
 import pytest
 
-from homematicip.async.group import AsyncHeatingGroup
+from homematicip.async.group import AsyncHeatingGroup, AsyncHeatingCoolingProfile
+from tests.conftest import AsyncMock
+from tests.json_data.heating_group import get_heating_group, get_profile_details
 
 
 @pytest.mark.asyncio
@@ -12,6 +14,29 @@ async def test_set_point_temperature(fake_connection):
         "group/heating/setSetPointTemperature", '{"groupId": null, "setPointTemperature": 10}')
 
 
+@pytest.mark.asyncio
+async def test_profile_details_are_cached(fake_connection):
+    fake_connection.api_call = AsyncMock(return_value=get_profile_details())
+    heating_group = AsyncHeatingGroup(fake_connection)
+    heating_group.from_json(get_heating_group(), {})
+    profile = heating_group.activeProfile
+    assert isinstance(profile, AsyncHeatingCoolingProfile)
+
+    await profile.get_details()
+    await profile.get_details()
+    assert fake_connection.api_call.mock.call_count == 1
+    assert fake_connection.api_call.mock.call_args[0][0] == "group/heating/getProfile"
+    assert profile.profileDays[5].periods[0].value == 22.0
+
+    await profile.get_details(refresh=True)
+    assert fake_connection.api_call.mock.call_count == 2
+
+    profile.invalidate_details()
+    assert profile.profileDays is None
+    await profile.get_details()
+    assert fake_connection.api_call.mock.call_count == 3
+
+
 # @pytest.mark.asyncio
 # async def test_set_boost(self, enable=True):
 #     return await self._connection.api_call(*super().set_boost(enable=enable))
@@ -1,7 +1,18 @@
+import json
+from unittest.mock import Mock
+
 import pytest
 import asyncio
+from functools import partial
+
+from homematicip.async.event_coalescer import AsyncEventCoalescer
 from homematicip.async.home import AsyncHome
 from homematicip.base.base_connection import HmipConnectionError
+from tests.conftest import AsyncMock
+from tests.json_data.heating_group import get_heating_group, get_profile_details, \
+    fake_heating_group_id
+from tests.json_data.home import get_current_state, push_button, fake_push_button_id, \
+    fake_client_id
 
 
 @pytest.fixture
@@ -10,6 +21,30 @@ async def fake_async_home(event_loop):
     return _home
 
 
+@pytest.fixture
+async def async_home(event_loop):
+    _home = AsyncHome(event_loop)
+    _home._connection.api_call = AsyncMock(return_value=get_current_state())
+    await _home.get_current_state()
+    return _home
+
+
+@pytest.fixture
+async def async_heating_home(event_loop):
+    state = get_current_state()
+    state["groups"][fake_heating_group_id] = get_heating_group()
+
+    def api_call(path, body=None, full_url=False):
+        if path == 'home/getCurrentState':
+            return state
+        return get_profile_details()
+
+    _home = AsyncHome(event_loop)
+    _home._connection.api_call = AsyncMock(side_effect=api_call)
+    await _home.get_current_state()
+    return _home
+
+
 async def raise_timeout(*args, **kwargs):
     raise asyncio.TimeoutError
 
@@ -32,3 +67,113 @@ async def test_on_connection_lost(fake_async_home, monkeypatch):
 
 
     await asyncio.sleep(1)
+
+
+@pytest.mark.asyncio
+async def test_execute_batch(fake_async_home):
+    running = []
+    max_running = []
+
+    async def operation(result, delay):
+        running.append(result)
+        max_running.append(len(running))
+        await asyncio.sleep(delay)
+        running.remove(result)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    error = ValueError("failed")
+    # the first operations take the longest, so they finish last
+    operations = [partial(operation, i, 0.05 - i * 0.01) for i in range(5)]
+    operations[2] = partial(operation, error, 0.01)
+    results = await fake_async_home.execute_batch(operations, max_concurrency=2)
+
+    assert [r["operation"] for r in results] == operations
+    assert [r["result"] for r in results] == [0, 1, None, 3, 4]
+    assert [r["error"] for r in results] == [None, None, error, None, None]
+    assert max(max_running) == 2
+
+
+@pytest.mark.asyncio
+async def test_execute_batch_empty(fake_async_home):
+    assert await fake_async_home.execute_batch([]) == []
+
+
+@pytest.mark.asyncio
+async def test_prefetch_profile_details(async_heating_home):
+    api_call = async_heating_home._connection.api_call.mock
+    results = await async_heating_home.prefetch_profile_details()
+    assert len(results) == 2
+    assert all(r["error"] is None for r in results)
+    group = async_heating_home.search_group_by_id(fake_heating_group_id)
+    assert all(p.profileDays is not None for p in group.profiles)
+    assert api_call.call_count == 3
+
+    # the cached details aren't downloaded again
+    assert await async_heating_home.prefetch_profile_details() == []
+    assert api_call.call_count == 3
+
+    results = await async_heating_home.prefetch_profile_details(refresh=True)
+    assert len(results) == 2
+    assert api_call.call_count == 5
+
+
+def _push_event(event):
+    return json.dumps({"events": {"0": event}})
+
+
+@pytest.mark.asyncio
+async def test_event_coalescer(async_home, event_loop):
+    handler = Mock()
+    async_home.onEvent += handler.method
+    async_home.set_event_coalescer(AsyncEventCoalescer(event_loop, window=0.05))
+    for label in ("first", "second", "third"):
+        device = dict(push_button, label=label)
+        async_home._ws_on_message(None, _push_event(
+            {"pushEventType": "DEVICE_CHANGED", "device": device}))
+    async_home._ws_on_message(None, _push_event(
+        {"pushEventType": "CLIENT_REMOVED", "id": fake_client_id}))
+    # other events are processed directly
+    assert handler.method.call_count == 1
+    assert async_home.search_device_by_id(fake_push_button_id).label == \
+        "Wall-mount Remote Control"
+
+    # the pending events are delivered in the event loop after the window
+    await asyncio.sleep(0.1)
+    assert handler.method.call_count == 2
+    eventList = handler.method.call_args[0][0]
+    assert len(eventList) == 1
+    assert eventList[0]["eventType"] == "DEVICE_CHANGED"
+    assert eventList[0]["coalesced"] == 2
+    assert async_home.search_device_by_id(fake_push_button_id).label == "third"
+    async_home.set_event_coalescer(None)
+
+
+@pytest.mark.asyncio
+async def test_event_coalescer_stop(async_home, event_loop):
+    handler = Mock()
+    async_home.onEvent += handler.method
+    coalescer = AsyncEventCoalescer(event_loop, window=60)
+    async_home.set_event_coalescer(coalescer)
+    async_home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_CHANGED", "device": dict(push_button, label="new")}))
+    assert coalescer._handle is not None
+
+    # stopping the coalescer delivers the pending events and cancels the timer
+    async_home.set_event_coalescer(None)
+    assert coalescer._handle is None
+    assert handler.method.call_count == 1
+    assert async_home.search_device_by_id(fake_push_button_id).label == "new"
+
+
+@pytest.mark.asyncio
+async def test_event_coalescer_removed_device(async_home, event_loop):
+    async_home.set_event_coalescer(AsyncEventCoalescer(event_loop, window=0.05))
+    async_home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_CHANGED", "device": push_button}))
+    async_home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_REMOVED", "id": fake_push_button_id}))
+    await asyncio.sleep(0.1)
+    assert async_home.search_device_by_id(fake_push_button_id) is None
+    async_home.set_event_coalescer(None)
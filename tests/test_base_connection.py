@@ -1,6 +1,7 @@
 import pytest
 
-from homematicip.base.base_connection import BaseConnection, ATTR_AUTH_TOKEN, ATTR_CLIENT_AUTH
+from homematicip.base.base_connection import BaseConnection, ATTR_AUTH_TOKEN, ATTR_CLIENT_AUTH, \
+    RetryPolicy
 
 
 @pytest.fixture
@@ -42,3 +43,21 @@ def test_set_token_and_characteristics(get_base_connection, get_tokens):
     get_base_connection.set_token_and_characteristics(get_tokens[1])
     assert get_base_connection.headers[ATTR_CLIENT_AUTH] is not None
     assert get_base_connection.clientauth_token == AUTH_TOKEN_RESULT
+
+
+def test_retry_policy_delays():
+    policy = RetryPolicy(max_attempts=5, base_delay=1, max_delay=3, deadline=100, jitter=0)
+    assert list(policy.delays()) == [0, 1, 2, 3, 3]
+
+
+def test_retry_policy_jitter():
+    policy = RetryPolicy(max_attempts=4, base_delay=1, max_delay=10, deadline=100, jitter=0.5)
+    delays = list(policy.delays())
+    assert len(delays) == 4
+    for delay, upper in zip(delays[1:], [1, 2, 4]):
+        assert upper / 2 <= delay <= upper
+
+
+def test_retry_policy_deadline():
+    policy = RetryPolicy(max_attempts=10, base_delay=1, max_delay=10, deadline=4, jitter=0)
+    assert list(policy.delays()) == [0, 1, 2]
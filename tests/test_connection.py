@@ -0,0 +1,78 @@
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from homematicip.base.base_connection import HmipConnectionError, RetryPolicy
+from homematicip.connection import Connection
+
+
+@pytest.fixture
+def connection():
+    _connection = Connection()
+    _connection._urlREST = 'https://test.homematic.com'
+    yield _connection
+    _connection.close()
+
+
+def fake_response(body=b'{"result": 1}'):
+    response = MagicMock()
+    response.content = body
+    response.status_code = 200
+    response.json.return_value = {"result": 1}
+    return response
+
+
+def test_rest_call_uses_session(connection, monkeypatch):
+    post = MagicMock(return_value=fake_response())
+    monkeypatch.setattr(connection.session, 'post', post)
+    assert connection._restCall('home/getCurrentState') == {"result": 1}
+    assert connection._restCall('home/getCurrentState') == {"result": 1}
+    assert post.call_count == 2
+    assert post.call_args[0][0] == 'https://test.homematic.com/hmip/home/getCurrentState'
+
+
+def test_rest_call_timeout(connection, monkeypatch):
+    monkeypatch.setattr(connection.session, 'post',
+                        MagicMock(side_effect=requests.Timeout))
+    assert connection._restCall('home/getCurrentState') == {"errorCode": "TIMEOUT"}
+
+
+def test_session_pool_configuration():
+    connection = Connection(pool_maxsize=5, max_retries=2)
+    adapter = connection.session.get_adapter('https://test.homematic.com')
+    assert adapter._pool_maxsize == 5
+    assert adapter.max_retries.total == 2
+    connection.close()
+
+
+def test_auth_uses_session(connection):
+    from homematicip.auth import Auth
+    from homematicip.home import Home
+    home = Home()
+    home._connection = connection
+    assert Auth(home).session is connection.session
+
+    # the AsyncConnection has no requests session
+    home._connection = MagicMock(spec=["clientauth_token", "urlREST"])
+    assert Auth(home).session is requests
+
+
+def test_lookup_gives_up(connection, monkeypatch):
+    post = MagicMock(side_effect=requests.ConnectionError)
+    monkeypatch.setattr(connection.session, 'post', post)
+    connection.lookup_retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+    with pytest.raises(HmipConnectionError):
+        connection.init('3014F711A000000000000000')
+    assert post.call_count == 3
+
+
+def test_lookup(connection, monkeypatch):
+    response = MagicMock()
+    response.text = '{"urlREST": "https://rest", "urlWebSocket": "wss://ws"}'
+    post = MagicMock(side_effect=[requests.ConnectionError, response])
+    monkeypatch.setattr(connection.session, 'post', post)
+    connection.lookup_retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+    connection.init('3014F711A000000000000000')
+    assert connection.urlREST == "https://rest"
+    assert connection.urlWebSocket == "wss://ws"
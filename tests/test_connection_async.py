@@ -6,10 +6,15 @@ import pytest
 from homematicip.async.connection import AsyncConnection
 from homematicip.base.base_connection import HmipWrongHttpStatusError, \
     HmipConnectionError, \
-    ATTR_AUTH_TOKEN, ATTR_CLIENT_AUTH
+    ATTR_AUTH_TOKEN, ATTR_CLIENT_AUTH, RetryPolicy
+from homematicip.base.lookup_cache import LookupCache
+from tests.conftest import AsyncMock
 from tests.fake_hmip_server import FakeLookupHmip, FakeConnectionHmip
 from tests.helpers import mockreturn
 
+ACCESS_POINT = '3014F711A000000000000000'
+HOSTS = {"urlREST": "https://rest", "urlWebSocket": "wss://ws"}
+
 
 @pytest.fixture
 async def fake_lookup_server(event_loop):
@@ -96,3 +101,54 @@ async def test_websocket_exhaustive_timeout(monkeypatch, async_connection):
     async_connection._restCallTimout = 0.01
     with pytest.raises(HmipConnectionError):
         await async_connection._listen_for_incoming_websocket_data(None)
+
+
+@pytest.mark.asyncio
+async def test_lookup_gives_up(fake_connection):
+    fake_connection.api_call = AsyncMock(side_effect=HmipConnectionError)
+    fake_connection.lookup_retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+    with pytest.raises(HmipConnectionError):
+        await fake_connection.init(ACCESS_POINT)
+    assert fake_connection.api_call.mock.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_lookup_retries(fake_connection):
+    # a failed connection and an incomplete answer are retried
+    fake_connection.api_call = AsyncMock(
+        side_effect=[HmipConnectionError, {"urlREST": "https://rest"}, HOSTS])
+    fake_connection.lookup_retry_policy = RetryPolicy(max_attempts=3, base_delay=0)
+    await fake_connection.init(ACCESS_POINT)
+    assert fake_connection.api_call.mock.call_count == 3
+    assert fake_connection.urlREST == "https://rest"
+    assert fake_connection.urlWebSocket == "wss://ws"
+
+
+@pytest.mark.asyncio
+async def test_lookup_uses_cache(fake_connection, tmp_path):
+    cache = LookupCache(str(tmp_path / 'lookup.json'), ttl=60)
+    fake_connection.lookup_cache = cache
+    fake_connection.api_call = AsyncMock(return_value=HOSTS)
+
+    await fake_connection.init(ACCESS_POINT)
+    await fake_connection.init(ACCESS_POINT)
+    assert fake_connection.api_call.mock.call_count == 1
+    assert fake_connection.urlREST == "https://rest"
+    assert fake_connection.urlWebSocket == "wss://ws"
+    assert cache.get(ACCESS_POINT)["urlREST"] == "https://rest"
+
+
+@pytest.mark.asyncio
+async def test_failed_call_invalidates_cache(monkeypatch, async_connection, tmp_path):
+    cache = LookupCache(str(tmp_path / 'lookup.json'), ttl=60)
+    cache.set(ACCESS_POINT, "https://rest", "wss://ws")
+    async_connection.lookup_cache = cache
+    await async_connection.init(ACCESS_POINT)
+    assert async_connection.urlREST == "https://rest"
+
+    monkeypatch.setattr(
+        async_connection._websession, 'post',
+        mockreturn(exception=asyncio.TimeoutError))
+    with pytest.raises(HmipConnectionError):
+        await async_connection.api_call('home/getCurrentState')
+    assert cache.get(ACCESS_POINT) is None
@@ -0,0 +1,75 @@
+from copy import deepcopy
+
+from homematicip.device import FloorTerminalBlock6, PlugableSwitchMeasuring
+from tests.json_data.floor_terminal_block import floor_terminal_block
+from tests.json_data.plugable_switch_measuring import plugable_switch_measuring
+
+
+def test_floor_terminal_block():
+    device = FloorTerminalBlock6(None)
+    device.from_json(deepcopy(floor_terminal_block))
+    assert device.globalPumpControl is True
+    assert device.heatingValveType == "NORMALLY_CLOSE"
+    assert [c.label for c in device.heatingChannels] == \
+        ["Valve {}".format(i) for i in range(1, 7)]
+    assert all(c.device is device for c in device.heatingChannels)
+
+
+def test_functional_channels():
+    device = PlugableSwitchMeasuring(None)
+    js = deepcopy(plugable_switch_measuring)
+    device.from_json(js)
+    assert sorted(device.functionalChannels) == [0, 1]
+    channel = device.functionalChannels[1]
+    assert channel.functionalChannelType == "SWITCH_MEASURING_CHANNEL"
+    assert channel.on is False
+    assert device.get_channels("DEVICE_BASE") == [device.functionalChannels[0]]
+
+    # the channels are updated in place. Only the channels with update
+    # handlers are compared
+    assert device._snapshot_channels() == {}
+    channel.on_update(lambda *args, **kwargs: None)
+    state = device._snapshot_channels()
+    js["functionalChannels"]["1"]["on"] = True
+    device.from_json(js)
+    assert device.functionalChannels[1] is channel
+    assert channel.on is True
+    assert device._get_changed_channels(state) == [(channel, {"on": (False, True)})]
+
+    # a channel which changed its type is replaced
+    js["functionalChannels"]["1"]["functionalChannelType"] = "SWITCH_CHANNEL"
+    device.from_json(js)
+    assert device.functionalChannels[1] is not channel
+
+
+def test_replaced_channel_json():
+    device = PlugableSwitchMeasuring(None)
+    js = deepcopy(plugable_switch_measuring)
+    device.from_json(js)
+    channel = deepcopy(js["functionalChannels"]["1"])
+    channel["on"] = True
+    channel["currentPowerConsumption"] = 12.5
+    js["functionalChannels"]["1"] = channel
+    device.from_json(js)
+    assert device.on is True
+    assert device.currentPowerConsumption == 12.5
+    assert device.functionalChannels[1].currentPowerConsumption == 12.5
+
+
+def test_channel_json_keys():
+    device = PlugableSwitchMeasuring(None)
+    js = deepcopy(plugable_switch_measuring)
+    device.from_json(js)
+    channel = device.functionalChannels[1]
+    assert channel.currentPowerConsumption == js["functionalChannels"]["1"]["currentPowerConsumption"]
+    channel.on = False
+    assert channel.on is False
+
+    js["functionalChannels"]["1"] = deepcopy(js["functionalChannels"]["1"])
+    del js["functionalChannels"]["1"]["currentPowerConsumption"]
+    js["functionalChannels"]["1"]["device"] = "some value"
+    device.from_json(js)
+    assert device.functionalChannels[1] is channel
+    assert not hasattr(channel, "currentPowerConsumption")
+    assert channel.device is device
+    assert channel.get_values()["device"] == "some value"
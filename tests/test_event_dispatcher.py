@@ -0,0 +1,116 @@
+import threading
+import time
+from functools import partial
+from unittest.mock import Mock
+
+import pytest
+
+from homematicip.base.event_dispatcher import EventDispatcher, OVERFLOW_DROP_OLDEST, \
+    OVERFLOW_COALESCE, OVERFLOW_BLOCK
+
+
+def test_drop_oldest():
+    calls = []
+    dispatcher = EventDispatcher(workers=1, max_queue_size=2,
+                                 overflow_policy=OVERFLOW_DROP_OLDEST)
+    for i in range(4):
+        dispatcher.submit(lambda i=i: calls.append(i))
+    assert dispatcher.queue_depth == 2
+    dispatcher.start()
+    dispatcher.stop()
+    assert calls == [2, 3]
+    assert dispatcher.get_metrics() == {"queue_depth": 0, "max_queue_depth": 2,
+                                        "dropped": 2, "coalesced": 0, "processed": 2}
+
+
+def test_coalesce():
+    calls = []
+    dispatcher = EventDispatcher(workers=1, max_queue_size=2, overflow_policy=OVERFLOW_COALESCE)
+    dispatcher.submit(lambda: calls.append("a1"), key="a")
+    dispatcher.submit(lambda: calls.append("b1"), key="b")
+    # the queue is full
+    dispatcher.submit(lambda: calls.append("a2"), key="a")
+    dispatcher.start()
+    dispatcher.stop()
+    assert calls == ["a2", "b1"]
+    assert dispatcher.coalesced == 1
+
+
+def test_coalesce_only_on_overflow():
+    calls = []
+    dispatcher = EventDispatcher(workers=1, max_queue_size=3, overflow_policy=OVERFLOW_COALESCE)
+    dispatcher.submit(lambda: calls.append("a1"), key="a")
+    dispatcher.submit(lambda: calls.append("a2"), key="a")
+    dispatcher.start()
+    dispatcher.stop()
+    assert calls == ["a1", "a2"]
+    assert dispatcher.coalesced == 0
+
+
+def test_coalesce_merges_changes():
+    handler = Mock()
+    dispatcher = EventDispatcher(workers=1, max_queue_size=1, overflow_policy=OVERFLOW_COALESCE)
+    dispatcher.submit(partial(handler.method, "js1", changes={"label": ("a", "b")}), key="a")
+    dispatcher.submit(partial(handler.method, "js2", changes={
+        "label": ("b", "c"), "firmwareVersion": ("1.0", "1.1")}), key="a")
+    dispatcher.start()
+    dispatcher.stop()
+    handler.method.assert_called_once_with("js2", changes={
+        "label": ("a", "c"), "firmwareVersion": ("1.0", "1.1")})
+
+
+def test_block():
+    dispatcher = EventDispatcher(workers=1, max_queue_size=1,
+                                 overflow_policy=OVERFLOW_BLOCK)
+    dispatcher.start()
+    release = threading.Event()
+    # keeps the worker busy, the next task fills the queue
+    dispatcher.submit(release.wait)
+    while dispatcher.queue_depth:
+        time.sleep(0.01)
+    dispatcher.submit(lambda: None)
+    submitted = threading.Event()
+
+    def producer():
+        dispatcher.submit(lambda: None)
+        submitted.set()
+
+    thread = threading.Thread(target=producer)
+    thread.start()
+    assert not submitted.wait(0.1)
+    release.set()
+    assert submitted.wait(1)
+    thread.join()
+    dispatcher.stop()
+    assert dispatcher.processed == 3
+
+
+def test_block_without_workers():
+    calls = []
+    dispatcher = EventDispatcher(workers=1, max_queue_size=1,
+                                 overflow_policy=OVERFLOW_BLOCK)
+    dispatcher.submit(lambda: calls.append(1))
+    # nothing would empty the queue, the task runs in the caller
+    dispatcher.submit(lambda: calls.append(2))
+    assert calls == [2]
+    dispatcher.start()
+    dispatcher.stop()
+    assert calls == [2, 1]
+    dispatcher.submit(lambda: calls.append(3))
+    dispatcher.submit(lambda: calls.append(4))
+    assert calls == [2, 1, 4]
+
+
+def test_failing_task():
+    dispatcher = EventDispatcher(workers=1)
+    done = Mock()
+    dispatcher.submit(Mock(side_effect=Exception("failed")))
+    dispatcher.submit(done)
+    dispatcher.start()
+    dispatcher.stop()
+    done.assert_called_once()
+
+
+def test_unknown_policy():
+    with pytest.raises(ValueError):
+        EventDispatcher(overflow_policy="UNKNOWN")
@@ -0,0 +1,125 @@
+from copy import deepcopy
+from datetime import datetime, timedelta, timezone
+
+from homematicip.base.fields import millis_to_datetime
+from homematicip.device import HeatingThermostat, PlugableSwitchMeasuring, ShutterContact
+from homematicip.group import SecurityZoneGroup, HeatingGroup, MetaGroup, \
+    HeatingCoolingProfile, TimeProfilePeriod
+from homematicip.securityEvent import ActivationChangedEvent
+from tests.json_data.plugable_switch_measuring import plugable_switch_measuring
+
+
+def test_millis_to_datetime():
+    value = millis_to_datetime(1510564962120)
+    assert value == datetime(2017, 11, 13, 9, 22, 42, 120000, timezone.utc)
+    assert value.tzinfo is not None
+    assert millis_to_datetime(0) is None
+    assert millis_to_datetime(None) is None
+
+
+def test_device_fields():
+    d = PlugableSwitchMeasuring(None)
+    d.from_json(deepcopy(plugable_switch_measuring))
+    assert d.deviceType == "PLUGABLE_SWITCH_MEASURING"
+    assert d.lastStatusUpdateMillis == 1510564962120
+    assert d.lastStatusUpdate == datetime(2017, 11, 13, 9, 22, 42, 120000, timezone.utc)
+    # DEVICE_BASE
+    assert d.routerModuleSupported is True
+    assert d.rssiDeviceValue == -52
+    # SWITCH_MEASURING_CHANNEL
+    assert d.energyCounter == 0.0002
+
+
+def test_missing_keys_use_the_defaults():
+    js = deepcopy(plugable_switch_measuring)
+    del js["oem"]
+    del js["functionalChannels"]["0"]["routerModuleSupported"]
+    del js["functionalChannels"]["1"]
+    d = PlugableSwitchMeasuring(None)
+    d.oem = "eQ-3"
+    d.energyCounter = 1.0
+    d.from_json(js)
+    assert d.oem == ""
+    assert d.routerModuleSupported is False
+    assert d.rssiDeviceValue == -52
+    # a missing channel doesn't change the attributes
+    assert d.energyCounter == 1.0
+
+
+def test_slots_get_the_defaults():
+    d = HeatingThermostat(None)
+    assert not hasattr(d, "__dict__")
+    assert d.modelType == ""
+    assert d.rssiDeviceValue == 0
+    assert d.valvePosition == 0.0
+    assert d.operationLockActive is None
+    assert d.functionalChannels is None
+    assert not hasattr(d, "sabotage")
+    assert ShutterContact(None).sabotage is None
+
+    g = SecurityZoneGroup(None)
+    assert not hasattr(g, "__dict__")
+    assert g.active is False
+    assert g.windowState == ""
+    assert g.ignorableDevices == []
+    assert g.metaGroup is None
+
+
+def test_groups_with_missing_keys():
+    js = {"id": "g1", "type": "HEATING"}
+    heating_group = HeatingGroup(None)
+    heating_group.from_json(js, {})
+    assert heating_group.devices == []
+    assert heating_group.profiles is None
+    assert heating_group.activeProfile is None
+
+    zone = SecurityZoneGroup(None)
+    zone.from_json(dict(js, ignorableDevices=["unknown"]), {})
+    assert zone.ignorableDevices == []
+
+    meta_group = MetaGroup(None)
+    meta_group.from_json(js, {}, {})
+    assert meta_group.groups == []
+
+    profile = HeatingCoolingProfile(None)
+    profile.from_json({"index": "PROFILE_1"})
+    assert profile.index == "PROFILE_1"
+    assert profile.id is None
+    profile._parse_details({})
+    assert profile.profileDays[0].periods == []
+
+    period = TimeProfilePeriod(None)
+    period.from_json({"hour": 6})
+    assert period.hour == 6
+    assert period.switchTimeMode == "REGULAR_SWITCH_TIME"
+    assert period.weekdays == []
+
+
+def test_nested_keys():
+    e = ActivationChangedEvent(None)
+    e.from_json({"label": "", "eventTimestamp": 1510568562120, "eventType": "ACTIVATION_CHANGED",
+                 "securityZoneValues": {"EXTERNAL": True, "INTERNAL": False}})
+    assert e.external_zone is True
+    assert e.internal_zone is False
+
+    e.from_json({"label": "", "eventTimestamp": 0, "eventType": "ACTIVATION_CHANGED"})
+    assert e.eventTimestamp is None
+    assert e.external_zone is None
+
+
+def test_lazy_datetime():
+    d = PlugableSwitchMeasuring(None)
+    d.from_json(deepcopy(plugable_switch_measuring))
+    assert getattr(d, "_lastStatusUpdate", None) is None
+    value = d.lastStatusUpdate
+    assert d.lastStatusUpdate is value
+
+    js = deepcopy(plugable_switch_measuring)
+    js["lastStatusUpdate"] = 1510564963120
+    d.from_json(js)
+    assert d.lastStatusUpdate - value == timedelta(seconds=1)
+
+    d.lastStatusUpdate = value
+    assert d.lastStatusUpdateMillis == 1510564962120
+    d.lastStatusUpdate = None
+    assert d.lastStatusUpdateMillis is None
@@ -0,0 +1,109 @@
+from unittest.mock import Mock
+
+import pytest
+
+from homematicip.group import HeatingGroup, HeatingCoolingPeriod
+from tests.json_data.heating_group import get_heating_group, get_profile_details
+
+
+@pytest.fixture
+def connection():
+    connection = Mock()
+    connection._restCall.return_value = get_profile_details()
+    return connection
+
+
+@pytest.fixture
+def heating_group(connection):
+    group = HeatingGroup(connection)
+    group.from_json(get_heating_group(), {})
+    return group
+
+
+def test_profiles(heating_group):
+    assert [p.index for p in heating_group.profiles] == ["PROFILE_1", "PROFILE_2"]
+    assert heating_group.activeProfile is heating_group.profiles[0]
+
+
+def test_profile_details_are_slotted(heating_group):
+    profile = heating_group.activeProfile
+    profile.get_details()
+    period = profile.profileDays[0].periods[0]
+    assert isinstance(period, HeatingCoolingPeriod)
+    assert not hasattr(period, "__dict__")
+    assert period._snapshot() == {"starttime": "06:00", "endtime": "08:00", "value": 21.0}
+    with pytest.raises(AttributeError):
+        period.unknown = 1
+
+
+def test_update_handlers_are_created_lazily(heating_group):
+    assert heating_group._on_update is None
+    heating_group.fire_update_event()
+    handler = Mock()
+    heating_group.on_update(handler.method)
+    heating_group.fire_update_event("js")
+    handler.method.assert_called_once_with("js")
+
+
+def test_profiles_are_created_lazily(heating_group):
+    assert heating_group._profiles is None
+    profiles = heating_group.profiles
+    assert heating_group._profiles is profiles
+
+    # unchanged profiles are kept
+    js = get_heating_group()
+    js["activeProfile"] = "PROFILE_2"
+    heating_group.from_json(js, {})
+    assert heating_group.profiles is profiles
+    assert heating_group.activeProfile is profiles[1]
+
+    js["profiles"]["PROFILE_2"]["name"] = "Vacation"
+    heating_group.from_json(js, {})
+    assert heating_group._profiles is None
+    assert heating_group.activeProfile.name == "Vacation"
+
+
+def test_profile_changes(heating_group):
+    state = heating_group._snapshot()
+    js = get_heating_group()
+    js["activeProfile"] = "PROFILE_2"
+    heating_group.from_json(js, {})
+    assert heating_group._diff(state) == {"activeProfile": ("PROFILE_1", "PROFILE_2")}
+
+
+def test_profile_details_are_cached(heating_group, connection):
+    profile = heating_group.activeProfile
+    profile.get_details()
+    profile.get_details()
+    assert connection._restCall.call_count == 1
+    assert profile.profileDays[5].periods[0].value == 22.0
+
+    profile.get_details(refresh=True)
+    assert connection._restCall.call_count == 2
+
+    heating_group.invalidate_profile_details()
+    assert profile.profileDays is None
+    profile.get_details()
+    assert connection._restCall.call_count == 3
+
+
+def test_schedule(heating_group):
+    from datetime import datetime, timedelta
+    heating_group.activeProfile.get_details()
+    schedule = heating_group.get_schedule()
+    assert schedule is heating_group.get_schedule()
+    # 2018-01-01 is a monday
+    assert schedule.get_temperature(datetime(2018, 1, 1, 5, 59)) == 17.0
+    assert schedule.get_temperature(datetime(2018, 1, 1, 6, 0)) == 21.0
+    assert schedule.get_temperature(datetime(2018, 1, 1, 8, 0)) == 17.0
+    assert schedule.get_temperature(datetime(2018, 1, 1, 21, 59)) == 21.0
+    assert schedule.get_temperature(datetime(2018, 1, 6, 12, 0)) == 22.0
+    assert schedule.get_temperature(datetime(2018, 1, 7, 23, 59)) == 17.0
+
+    result = schedule.evaluate(datetime(2018, 1, 1, 7, 0), datetime(2018, 1, 1, 9, 0),
+                               timedelta(hours=1))
+    assert result == [(datetime(2018, 1, 1, 7, 0), 21.0), (datetime(2018, 1, 1, 8, 0), 17.0)]
+
+    heating_group.invalidate_profile_details()
+    with pytest.raises(ValueError):
+        heating_group.get_schedule()
@@ -0,0 +1,23 @@
+from copy import deepcopy
+
+from homematicip.base.helpers import get_functional_channel, get_functional_channel_index
+from tests.json_data.floor_terminal_block import floor_terminal_block
+
+
+def test_functional_channel_lookup():
+    js = deepcopy(floor_terminal_block)
+    assert get_functional_channel("DEVICE_GLOBAL_PUMP_CONTROL", js)["index"] == 0
+    assert get_functional_channel("DEVICE_BASE", js) is None
+    assert get_functional_channel("FLOOR_TERMINAL_BLOCK_CHANNEL", js)["index"] == 1
+
+
+def test_functional_channel_index():
+    js = deepcopy(floor_terminal_block)
+    index = get_functional_channel_index(js)
+    assert index.get_channel("DEVICE_GLOBAL_PUMP_CONTROL")["index"] == 0
+    assert index.get_channel("DEVICE_BASE") is None
+    assert len(index.get_channels("FLOOR_TERMINAL_BLOCK_CHANNEL")) == 6
+    assert index.byIndex[3]["label"] == "Valve 3"
+    # every call scans the payload again, nothing is cached
+    assert get_functional_channel_index(js) is not index
+    assert get_functional_channel_index({}).get_channels("DEVICE_BASE") == []
@@ -1,8 +1,14 @@
+import json
+import threading
 from unittest.mock import MagicMock, Mock
 
 import pytest
 
 from homematicip.home import Home
+from tests.json_data.home import get_current_state, fake_push_button_id, \
+    fake_client_id, fake_switching_group_id, push_button, client, \
+    switching_group, fake_meta_group_id
+from tests.json_data.plugable_switch_measuring import fake_device_id
 
 
 @pytest.fixture
@@ -12,6 +18,18 @@ def fake_home():
     return home
 
 
+@pytest.fixture
+def home():
+    home = Home()
+    home.download_configuration = MagicMock(return_value=get_current_state())
+    home.get_current_state()
+    return home
+
+
+def _push_event(event):
+    return json.dumps({"events": {"0": event}})
+
+
 def test_update_event(fake_home: Home):
     fake_handler = Mock()
     fake_home.on_update(fake_handler.method)
@@ -37,3 +55,490 @@ def test__parse_group(fake_home):
 
 def test__get_groups(fake_home):
     assert False
+
+
+def test_search_by_id(home):
+    assert home.search_device_by_id(fake_device_id).id == fake_device_id
+    assert home.search_group_by_id(fake_switching_group_id).id == fake_switching_group_id
+    assert home.search_client_by_id(fake_client_id).id == fake_client_id
+    assert home.search_device_by_id("unknown") is None
+
+
+def test_registry_follows_events(home):
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_REMOVED", "id": fake_push_button_id}))
+    assert home.search_device_by_id(fake_push_button_id) is None
+    assert fake_push_button_id not in [d.id for d in home.devices]
+
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_ADDED", "device": push_button}))
+    device = home.search_device_by_id(fake_push_button_id)
+    assert device in home.devices
+
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "GROUP_REMOVED", "id": fake_switching_group_id}))
+    assert home.search_group_by_id(fake_switching_group_id) is None
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "GROUP_ADDED", "group": switching_group}))
+    assert home.search_group_by_id(fake_switching_group_id) in home.groups
+
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "CLIENT_REMOVED", "id": fake_client_id}))
+    assert home.search_client_by_id(fake_client_id) is None
+    assert home.clients == []
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "CLIENT_ADDED", "client": client}))
+    assert home.search_client_by_id(fake_client_id) in home.clients
+
+
+def test_get_current_state_resets_registry(home):
+    old_device = home.search_device_by_id(fake_device_id)
+    assert home.get_current_state()
+    new_device = home.search_device_by_id(fake_device_id)
+    assert new_device is not old_device
+    assert new_device in home.devices
+
+
+def test_groups_resolve_devices_and_groups(home):
+    switch = home.search_device_by_id(fake_device_id)
+    button = home.search_device_by_id(fake_push_button_id)
+    group = home.search_group_by_id(fake_switching_group_id)
+    meta_group = home.search_group_by_id(fake_meta_group_id)
+    assert group.devices == [switch, button]
+    assert meta_group.devices == [switch, button]
+    assert meta_group.groups == [group]
+    assert group.metaGroup is meta_group
+
+
+def test_update_current_state_keeps_objects(home):
+    switch = home.search_device_by_id(fake_device_id)
+    group = home.search_group_by_id(fake_switching_group_id)
+    handler = Mock()
+    switch.on_update(handler.method)
+
+    state = get_current_state()
+    state["devices"][fake_device_id]["label"] = "new label"
+    state["devices"][fake_device_id]["functionalChannels"]["1"]["on"] = True
+    del state["devices"][fake_push_button_id]
+    home.download_configuration = MagicMock(return_value=state)
+
+    changes = home.update_current_state()
+
+    assert home.search_device_by_id(fake_device_id) is switch
+    assert switch.label == "new label"
+    assert switch.on is True
+    handler.method.assert_called_once_with(state["devices"][fake_device_id])
+    assert changes["devices"]["updated"] == [switch]
+    assert [d.id for d in changes["devices"]["removed"]] == [fake_push_button_id]
+    assert changes["devices"]["added"] == []
+    assert home.search_device_by_id(fake_push_button_id) is None
+    # the group has lost a device but is still the same object
+    assert home.search_group_by_id(fake_switching_group_id) is group
+    assert group.devices == [switch]
+    assert changes["groups"]["updated"] == [group, home.search_group_by_id(fake_meta_group_id)]
+    assert changes["clients"] == {"added": [], "updated": [], "removed": []}
+    assert changes["home"] is False
+
+
+def test_update_current_state_unchanged(home):
+    changes = home.update_current_state()
+    for kind in ("devices", "groups", "clients"):
+        assert changes[kind] == {"added": [], "updated": [], "removed": []}
+
+
+def test_update_current_state_holds_the_event_lock(home):
+    state = get_current_state()
+    state["devices"][fake_device_id]["label"] = "new"
+    home.download_configuration = MagicMock(return_value=state)
+    done = threading.Event()
+
+    def update():
+        home.update_current_state()
+        done.set()
+
+    with home._eventLock:
+        thread = threading.Thread(target=update)
+        thread.start()
+        assert not done.wait(0.1)
+        assert home.search_device_by_id(fake_device_id).label != "new"
+    thread.join(1)
+    assert done.is_set()
+    assert home.search_device_by_id(fake_device_id).label == "new"
+
+
+def test_update_current_state_replaces_changed_type(home):
+    state = get_current_state()
+    state["devices"][fake_device_id]["type"] = "PLUGABLE_SWITCH"
+    home.download_configuration = MagicMock(return_value=state)
+    old = home.search_device_by_id(fake_device_id)
+
+    changes = home.update_current_state()
+
+    new = home.search_device_by_id(fake_device_id)
+    assert changes["devices"]["removed"] == [old]
+    assert changes["devices"]["added"] == [new]
+    assert type(new).__name__ == "PlugableSwitch"
+    assert new in home.search_group_by_id(fake_switching_group_id).devices
+
+
+def test_execute_batch(home):
+    switch = home.search_device_by_id(fake_device_id)
+    group = home.search_group_by_id(fake_switching_group_id)
+    home._connection._restCall = MagicMock(side_effect=["", {"errorCode": "INVALID"}, Exception("failed")])
+    results = home.execute_batch([switch.turn_on,
+                                  lambda: group.set_switch_state(False),
+                                  switch.turn_off], max_workers=1)
+    assert [r["result"] for r in results] == ["", {"errorCode": "INVALID"}, None]
+    assert results[0]["operation"] == switch.turn_on
+    assert results[0]["error"] is None
+    assert str(results[2]["error"]) == "failed"
+    assert home.execute_batch([]) == []
+
+
+def test_event_errors_are_isolated(home):
+    handler = Mock()
+    home.onEvent += handler.method
+    message = json.dumps({"events": {
+        "0": {"pushEventType": "GROUP_CHANGED", "group": {"id": "unknown"}},
+        "1": {"pushEventType": "CLIENT_REMOVED", "id": fake_client_id}}})
+    home._ws_on_message(None, message)
+    assert home.clients == []
+    handler.method.assert_called_once()
+    eventList = handler.method.call_args[0][0]
+    assert [e["eventType"] for e in eventList] == ["CLIENT_REMOVED"]
+    assert eventList[0]["data"].id == fake_client_id
+
+
+def test_failing_subscriber(home):
+    failing = Mock(side_effect=ValueError("failing subscriber"))
+    subscriber = Mock()
+    handler = Mock()
+    home.subscribe(failing, event_type="CLIENT_REMOVED")
+    home.subscribe(subscriber.method, event_type="DEVICE_REMOVED")
+    home.onEvent += handler.method
+    message = json.dumps({"events": {
+        "0": {"pushEventType": "CLIENT_REMOVED", "id": fake_client_id},
+        "1": {"pushEventType": "DEVICE_REMOVED", "id": fake_push_button_id}}})
+    home._ws_on_message(None, message)
+    failing.assert_called_once()
+    assert home.search_device_by_id(fake_push_button_id) is None
+    subscriber.method.assert_called_once()
+    eventList = handler.method.call_args[0][0]
+    assert [e["eventType"] for e in eventList] == ["CLIENT_REMOVED", "DEVICE_REMOVED"]
+
+
+def test_failing_update_handler(home):
+    device = home.search_device_by_id(fake_device_id)
+    device.on_update(Mock(side_effect=ValueError("failing handler")))
+    subscriber = Mock()
+    handler = Mock()
+    home.subscribe(subscriber.method, object_id=fake_device_id)
+    home.onEvent += handler.method
+    js = get_current_state()["devices"][fake_device_id]
+    js["label"] = "new label"
+    home._ws_on_message(None, _push_event({"pushEventType": "DEVICE_CHANGED", "device": js}))
+    assert device.label == "new label"
+    subscriber.method.assert_called_once_with("DEVICE_CHANGED", device)
+    assert handler.method.call_args[0][0][0]["data"] is device
+
+
+def test_subscribe_event_type(home):
+    handler = Mock()
+    home.subscribe_event_type("DEVICE_REMOVED", handler.method)
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "CLIENT_REMOVED", "id": fake_client_id}))
+    handler.method.assert_not_called()
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_REMOVED", "id": fake_push_button_id}))
+    handler.method.assert_called_once()
+    assert handler.method.call_args[0][0] == "DEVICE_REMOVED"
+    assert handler.method.call_args[0][1].id == fake_push_button_id
+    home.unsubscribe_event_type("DEVICE_REMOVED", handler.method)
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_REMOVED", "id": fake_device_id}))
+    handler.method.assert_called_once()
+
+
+def test_register_event_handler(home):
+    inclusion = Mock(return_value="included")
+    subscriber = Mock()
+    home.register_event_handler("INCLUSION_REQUESTED", inclusion)
+    home.subscribe_event_type("INCLUSION_REQUESTED", subscriber.method)
+    event = {"pushEventType": "INCLUSION_REQUESTED", "deviceId": "abc"}
+    home._ws_on_message(None, _push_event(event))
+    inclusion.assert_called_once_with(event)
+    subscriber.method.assert_called_once_with("INCLUSION_REQUESTED", "included")
+
+
+def test_subscribe_object(home):
+    handler = Mock()
+    subscription = home.subscribe(handler.method, object_id=fake_device_id)
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_REMOVED", "id": fake_push_button_id}))
+    handler.method.assert_not_called()
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_REMOVED", "id": fake_device_id}))
+    handler.method.assert_called_once()
+    home.unsubscribe(subscription)
+
+
+def test_event_dispatcher(home):
+    from homematicip.base.event_dispatcher import EventDispatcher
+    threads = []
+    home.onEvent += lambda eventList: threads.append(threading.current_thread())
+    home.set_event_dispatcher(EventDispatcher(workers=1))
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "CLIENT_REMOVED", "id": fake_client_id}))
+    # the model is updated immediately
+    assert home.clients == []
+    home.set_event_dispatcher(None)
+    assert threads and threads[0] is not threading.current_thread()
+
+
+def test_event_coalescer(home):
+    from homematicip.base.event_coalescer import EventCoalescer
+    handler = Mock()
+    home.onEvent += handler.method
+    home.set_event_coalescer(EventCoalescer(window=60))
+    for label in ("first", "second", "third"):
+        device = dict(push_button, label=label)
+        home._ws_on_message(None, _push_event(
+            {"pushEventType": "DEVICE_CHANGED", "device": device}))
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "CLIENT_REMOVED", "id": fake_client_id}))
+    # other events are processed directly
+    assert handler.method.call_count == 1
+    assert home.search_device_by_id(fake_push_button_id).label == "Wall-mount Remote Control"
+
+    # stopping the coalescer delivers the pending events
+    home.set_event_coalescer(None)
+    assert handler.method.call_count == 2
+    eventList = handler.method.call_args[0][0]
+    assert len(eventList) == 1
+    assert eventList[0]["eventType"] == "DEVICE_CHANGED"
+    assert eventList[0]["coalesced"] == 2
+    assert home.search_device_by_id(fake_push_button_id).label == "third"
+
+
+def test_event_coalescer_removed_device(home):
+    from homematicip.base.event_coalescer import EventCoalescer
+    home.set_event_coalescer(EventCoalescer(window=60))
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_CHANGED", "device": push_button}))
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_REMOVED", "id": fake_push_button_id}))
+    home.set_event_coalescer(None)
+    assert home.search_device_by_id(fake_push_button_id) is None
+
+
+def test_unchanged_push_event_is_skipped(home):
+    handler = Mock()
+    update = Mock()
+    home.onEvent += handler.method
+    home.search_device_by_id(fake_push_button_id).on_update(update.method)
+    message = _push_event({"pushEventType": "DEVICE_CHANGED", "device": push_button})
+    home._ws_on_message(None, message)
+    home._ws_on_message(None, message)
+    assert handler.method.call_count == 1
+    assert update.method.call_count == 1
+
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_CHANGED", "device": dict(push_button, label="new")}))
+    assert handler.method.call_count == 2
+    assert home.search_device_by_id(fake_push_button_id).label == "new"
+
+    home.fire_unchanged_events = True
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_CHANGED", "device": dict(push_button, label="new")}))
+    assert handler.method.call_count == 3
+
+
+def test_update_event_changes(home):
+    switch = home.search_device_by_id(fake_device_id)
+    handler = Mock()
+    switch.on_update(handler.method, changes=True)
+
+    state = get_current_state()
+    state["devices"][fake_device_id]["label"] = "new label"
+    home.download_configuration = MagicMock(return_value=state)
+    home.update_current_state()
+    handler.method.assert_called_once_with(
+        state["devices"][fake_device_id],
+        changes={"label": ("Pluggable Switch and Meter", "new label")})
+
+    button = home.search_device_by_id(fake_push_button_id)
+    button.on_update(handler.method, changes=True)
+    home._ws_on_message(None, _push_event(
+        {"pushEventType": "DEVICE_CHANGED", "device": dict(push_button, label="new")}))
+    assert handler.method.call_args[1] == {
+        "changes": {"label": ("Wall-mount Remote Control", "new")}}
+
+    homeHandler = Mock()
+    home.on_update(homeHandler.method, changes=True)
+    state["home"]["weather"]["temperature"] = 9.0
+    home.update_current_state()
+    assert homeHandler.method.call_args[1] == {
+        "changes": {"weather.temperature": (8.0, 9.0)}}
+
+
+@pytest.fixture
+def heating_home():
+    from tests.json_data.heating_group import get_heating_group, \
+        get_profile_details, fake_heating_group_id
+    state = get_current_state()
+    state["groups"][fake_heating_group_id] = get_heating_group()
+    home = Home()
+    home.download_configuration = MagicMock(return_value=state)
+    home._connection._restCall = Mock(side_effect=lambda path, body: get_profile_details())
+    home.get_current_state()
+    return home
+
+
+def test_prefetch_profile_details(heating_home):
+    from tests.json_data.heating_group import fake_heating_group_id, get_heating_group
+    results = heating_home.prefetch_profile_details()
+    assert len(results) == 2
+    assert all(r["error"] is None for r in results)
+    group = heating_home.search_group_by_id(fake_heating_group_id)
+    assert all(p.profileDays is not None for p in group.profiles)
+    assert heating_home.prefetch_profile_details() == []
+
+    # other changes of the group keep the cached details
+    heating_home._ws_on_message(None, _push_event({
+        "pushEventType": "GROUP_CHANGED",
+        "group": dict(get_heating_group(), setPointTemperature=18.0)}))
+    assert all(p.profileDays is not None for p in group.profiles)
+
+    # a change of the profiles invalidates them
+    profiles = group.profiles
+    js = get_heating_group()
+    js["profiles"]["PROFILE_2"]["name"] = "Vacation"
+    heating_home._ws_on_message(None, _push_event({"pushEventType": "GROUP_CHANGED", "group": js}))
+    assert all(p.profileDays is None for p in profiles)
+    assert len(heating_home.prefetch_profile_details()) == 2
+
+
+def test_update_current_state_keeps_profile_details(heating_home):
+    from tests.json_data.heating_group import fake_heating_group_id
+    heating_home.prefetch_profile_details()
+    group = heating_home.search_group_by_id(fake_heating_group_id)
+    assert all(p.profileDays is not None for p in group.profiles)
+
+    heating_home.update_current_state()
+    assert heating_home.search_group_by_id(fake_heating_group_id) is group
+    assert all(p.profileDays is not None for p in group.profiles)
+
+
+@pytest.mark.parametrize("order", [("home", "devices", "groups", "clients"),
+                                   ("groups", "clients", "home", "devices")])
+def test_get_current_state_streaming(order):
+    import io
+    pytest.importorskip("ijson")
+    state = get_current_state()
+    body = json.dumps({k: state[k] for k in order}).encode()
+    home = Home()
+    home._connection._restCallStream = Mock(return_value=Mock(raw=io.BytesIO(body)))
+    assert home.get_current_state_streaming()
+
+    assert home.id == state["home"]["id"]
+    assert home.weather.temperature == 8.0
+    assert {d.id for d in home.devices} == {fake_device_id, fake_push_button_id}
+    assert [c.id for c in home.clients] == [fake_client_id]
+    switch = home.search_device_by_id(fake_device_id)
+    button = home.search_device_by_id(fake_push_button_id)
+    group = home.search_group_by_id(fake_switching_group_id)
+    meta_group = home.search_group_by_id(fake_meta_group_id)
+    assert group.devices == [switch, button]
+    assert meta_group.groups == [group]
+    home._connection._restCallStream.return_value.close.assert_called_once()
+
+
+def test_get_current_state_streaming_error():
+    import io
+    pytest.importorskip("ijson")
+    home = Home()
+    home._connection._restCallStream = Mock(
+        return_value=Mock(raw=io.BytesIO(b'{"errorCode": "INVALID_AUTHORIZATION"}')))
+    assert not home.get_current_state_streaming()
+
+
+def test_channel_update_event(home):
+    device = home.search_device_by_id(fake_device_id)
+    base_handler = Mock()
+    switch_handler = Mock()
+    device.functionalChannels[0].on_update(base_handler.method)
+    device.functionalChannels[1].on_update(switch_handler.method, changes=True)
+
+    js = get_current_state()["devices"][fake_device_id]
+    js["functionalChannels"]["1"]["on"] = True
+    home._ws_on_message(None, _push_event({"pushEventType": "DEVICE_CHANGED", "device": js}))
+    base_handler.method.assert_not_called()
+    switch_handler.method.assert_called_once_with(js["functionalChannels"]["1"],
+                                                  changes={"on": (False, True)})
+
+
+def test_device_without_handlers_is_not_compared(home, monkeypatch):
+    from homematicip.HomeMaticIPObject import HomeMaticIPObject
+    snapshot = Mock(side_effect=HomeMaticIPObject._snapshot)
+    monkeypatch.setattr(HomeMaticIPObject, "_snapshot", lambda obj: snapshot(obj))
+    js = get_current_state()["devices"][fake_device_id]
+    js["functionalChannels"]["1"]["on"] = True
+    home._ws_on_message(None, _push_event({"pushEventType": "DEVICE_CHANGED", "device": js}))
+    assert home.search_device_by_id(fake_device_id).functionalChannels[1].on is True
+    snapshot.assert_not_called()
+
+
+def test_export_columns(home):
+    columns = home.export_columns()
+    switch = columns["PlugableSwitchMeasuring"]
+    assert list(switch)[:3] == ["id", "label", "lastStatusUpdateMillis"]
+    assert switch["id"] == [fake_device_id]
+    assert switch["energyCounter"] == [0.0002]
+    assert switch["rssiDeviceValue"] == [-52]
+    # the push button doesn't measure anything
+    assert "energyCounter" not in columns["PushButton"]
+    assert columns["SwitchingGroup"]["on"] == [False]
+
+    columns = home.export_columns(["label", "on"], groups=False)
+    assert list(columns) == ["PlugableSwitchMeasuring", "PushButton"]
+    assert list(columns["PlugableSwitchMeasuring"]) == ["id", "label", "lastStatusUpdateMillis", "on"]
+
+    with pytest.raises(ValueError):
+        home.export_columns(format="csv")
+
+
+def test_export_columns_numpy(home):
+    numpy = pytest.importorskip("numpy")
+    switch = home.export_columns(format="numpy")["PlugableSwitchMeasuring"]
+    assert switch["energyCounter"].dtype == numpy.float64
+    assert switch["rssiDeviceValue"].dtype == numpy.int64
+    assert switch["on"].dtype == bool
+
+
+def test_export_columns_arrow(home):
+    pyarrow = pytest.importorskip("pyarrow")
+    switch = home.export_columns(format="arrow")["PlugableSwitchMeasuring"]
+    assert isinstance(switch, pyarrow.Table)
+    assert switch.num_rows == 1
+    assert switch.column("energyCounter").to_pylist() == [0.0002]
+    assert switch.column("id").to_pylist() == [fake_device_id]
+
+
+def test_export_columns_in_a_dispatched_handler(home):
+    from homematicip.base.event_dispatcher import EventDispatcher, OVERFLOW_BLOCK
+    dispatcher = EventDispatcher(workers=1, max_queue_size=1, overflow_policy=OVERFLOW_BLOCK)
+    home.set_event_dispatcher(dispatcher)
+    exported = []
+    button = home.search_device_by_id(fake_push_button_id)
+    button.on_update(lambda *args: exported.append(home.export_columns(["label"])))
+    home.subscribe(Mock())
+    home.onEvent += Mock()
+
+    thread = threading.Thread(target=home._ws_on_message, args=(None, _push_event(
+        {"pushEventType": "DEVICE_CHANGED", "device": dict(push_button, label="new")})))
+    thread.daemon = True
+    thread.start()
+    thread.join(2)
+    assert not thread.is_alive()
+    dispatcher.stop()
+    assert exported[0]["PushButton"]["label"] == ["new"]
@@ -0,0 +1,38 @@
+import pytest
+
+from homematicip.base import json_codec
+
+
+@pytest.fixture(params=json_codec.get_available_backends())
+def backend(request):
+    json_codec.set_backend(request.param)
+    yield request.param
+    json_codec.set_backend()
+
+
+def test_loads(backend):
+    assert json_codec.loads('{"a": [1, 2.5, null, true]}') == {"a": [1, 2.5, None, True]}
+    assert json_codec.loads(b'{"label": "K\\u00fcche"}') == {"label": "Küche"}
+
+
+def test_loads_error(backend):
+    with pytest.raises(json_codec.JSONDecodeError):
+        json_codec.loads(b'{"a": ')
+
+
+def test_dumps_keeps_the_standard_format():
+    assert json_codec.dumps({"groupId": None, "on": True}) == '{"groupId": null, "on": true}'
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        json_codec.set_backend("unknown")
+
+
+def test_fingerprint():
+    value = {"id": "3014F711", "label": "Küche", "channels": [{"on": True, "level": 0.5}]}
+    fingerprint = json_codec.fingerprint(value)
+    assert len(fingerprint) == 16
+    assert json_codec.fingerprint(json_codec.loads(json_codec.dumps(value))) == fingerprint
+    assert json_codec.fingerprint(dict(value, label="Bad")) != fingerprint
+    assert json_codec.fingerprint({"big": 2 ** 70}) != json_codec.fingerprint({"big": 2 ** 71})
@@ -0,0 +1,58 @@
+import time
+from unittest.mock import MagicMock
+
+import pytest
+import requests
+
+from homematicip.base.lookup_cache import LookupCache
+from homematicip.connection import Connection
+
+ACCESS_POINT = '3014F711A000000000000000'
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return LookupCache(str(tmp_path / 'lookup.json'), ttl=60)
+
+
+def test_set_get_invalidate(cache):
+    assert cache.get(ACCESS_POINT) is None
+    cache.set(ACCESS_POINT, 'https://rest', 'wss://ws')
+    entry = cache.get(ACCESS_POINT)
+    assert entry['urlREST'] == 'https://rest'
+    assert entry['urlWebSocket'] == 'wss://ws'
+    cache.invalidate(ACCESS_POINT)
+    assert cache.get(ACCESS_POINT) is None
+
+
+def test_expired_entry(cache, monkeypatch):
+    cache.set(ACCESS_POINT, 'https://rest', 'wss://ws')
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert cache.get(ACCESS_POINT) is None
+
+
+def test_broken_file(cache):
+    with open(cache.path, 'w') as f:
+        f.write('{broken')
+    assert cache.get(ACCESS_POINT) is None
+
+
+def test_connection_uses_cache(cache, monkeypatch):
+    connection = Connection()
+    connection.lookup_cache = cache
+    response = MagicMock()
+    response.text = '{"urlREST": "https://rest", "urlWebSocket": "wss://ws"}'
+    post = MagicMock(return_value=response)
+    monkeypatch.setattr(connection.session, 'post', post)
+
+    connection.init(ACCESS_POINT)
+    connection.init(ACCESS_POINT)
+    assert post.call_count == 1
+    assert connection.urlREST == 'https://rest'
+
+    post.side_effect = requests.ConnectionError
+    with pytest.raises(requests.ConnectionError):
+        connection._restCall('home/getCurrentState')
+    assert cache.get(ACCESS_POINT) is None
+    connection.close()
@@ -0,0 +1,43 @@
+import time
+
+import pytest
+
+from homematicip.base.rate_limiter import DutyCycleRateLimiter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_burst_and_queue(clock):
+    limiter = DutyCycleRateLimiter(rate=2.0, capacity=2)
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == 0
+    assert limiter._reserve() == pytest.approx(0.5)
+    assert limiter._reserve() == pytest.approx(1.0)
+    clock[0] += 1.0
+    assert limiter._reserve() == pytest.approx(0.5)
+
+
+def test_duty_cycle_throttles(clock):
+    limiter = DutyCycleRateLimiter(rate=2.0, min_rate=0.1, throttle_start=50,
+                                   duty_cycle_limit=90)
+    limiter.update_duty_cycle(10.0)
+    assert limiter.rate == 2.0
+    limiter.update_duty_cycle(70.0)
+    assert limiter.rate == pytest.approx(1.0)
+    limiter.update_duty_cycle(95.0)
+    assert limiter.rate == 0.1
+    limiter.update_duty_cycle(None)
+    assert limiter.rate == 0.1
+
+
+def test_is_limited():
+    limiter = DutyCycleRateLimiter()
+    assert limiter.is_limited('device/control/setSwitchState')
+    assert limiter.is_limited('group/heating/setSetPointTemperature')
+    assert not limiter.is_limited('home/getCurrentState')
+    assert not limiter.is_limited('group/heating/getProfile')
@@ -0,0 +1,71 @@
+from unittest.mock import Mock
+
+from homematicip.device import Device, PlugableSwitch, PlugableSwitchMeasuring
+from homematicip.group import HeatingGroup
+from homematicip.subscriptions import Subscription, SubscriptionIndex
+
+
+def _device(cls, id):
+    device = cls(None)
+    device.id = id
+    return device
+
+
+def test_filters():
+    switch = _device(PlugableSwitchMeasuring, "switch")
+    group = HeatingGroup(None)
+    group.id = "group"
+    group.groupType = "HEATING"
+
+    index = SubscriptionIndex()
+    calls = {}
+
+    def subscribe(name, **kwargs):
+        index.add(Subscription(lambda t, o: calls.setdefault(name, []).append((t, o)), **kwargs))
+
+    subscribe("all")
+    subscribe("by_type", event_type="DEVICE_CHANGED")
+    subscribe("by_id", object_id="switch")
+    subscribe("by_id_and_type", object_id="switch", event_type="DEVICE_REMOVED")
+    subscribe("by_class", device_class=PlugableSwitch)
+    subscribe("by_other_class", device_class=HeatingGroup, event_type="DEVICE_CHANGED")
+    subscribe("by_group_type", group_type="HEATING")
+    assert len(index) == 7
+
+    index.fire("DEVICE_CHANGED", switch)
+    assert sorted(calls) == ["all", "by_class", "by_id", "by_type"]
+
+    calls.clear()
+    index.fire("GROUP_CHANGED", group)
+    assert sorted(calls) == ["all", "by_group_type"]
+
+    calls.clear()
+    index.fire("SECURITY_JOURNAL_CHANGED", None)
+    assert sorted(calls) == ["all"]
+
+
+def test_only_candidates_are_checked():
+    index = SubscriptionIndex()
+    others = [index.add(Subscription(Mock(), object_id=str(i))) for i in range(100)]
+    for subscription in others:
+        subscription.matches = Mock(return_value=False)
+    handler = Mock()
+    index.add(Subscription(handler, object_id="switch"))
+
+    index.fire("DEVICE_CHANGED", _device(Device, "switch"))
+
+    handler.assert_called_once()
+    for subscription in others:
+        subscription.matches.assert_not_called()
+
+
+def test_remove():
+    index = SubscriptionIndex()
+    handler = Mock()
+    subscription = index.add(Subscription(handler, event_type="DEVICE_CHANGED"))
+    assert index.find(handler, "DEVICE_CHANGED") is subscription
+    index.remove(subscription)
+    assert len(index) == 0
+    assert index.find(handler, "DEVICE_CHANGED") is None
+    index.fire("DEVICE_CHANGED", _device(Device, "switch"))
+    handler.assert_not_called()